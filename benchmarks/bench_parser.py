@@ -0,0 +1,238 @@
+"""
+解析器性能基准测试。
+
+生成不同规模的合成风格预设，测量冷加载、字符串标签查找、占位符替换与预设名
+称解析的吞吐量（ops/sec）与内存占用。基准测试仅初始化 NoneBot 而不连接任何
+机器人，可离线运行：
+
+````bash
+python benchmarks/bench_parser.py          # 完整测试
+python benchmarks/bench_parser.py --quick  # 仅测试较小规模
+python benchmarks/bench_parser.py --json   # 以 JSON 格式输出结果
+````
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import nonebot
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+
+def generate_preset(tokens: int,
+                    depth: int,
+                    placeholders: int = 0,
+                    list_size: int = 0) -> Dict[str, Any]:
+    """
+    生成合成风格预设。
+
+    参数：
+    - `tokens: int`：字符串标签数量。
+    - `depth: int`：字符串标签层级数，不大于 10。
+
+    可选参数：
+    - `placeholders: int`：每个字符串中的占位符数量。默认为 `0`。
+    - `list_size: int`：额外生成的列表字符串标签 `bench.list` 的长度。默认为
+      `0`，即不生成。
+
+    返回：
+    - `Dict[str, Any]`：风格预设内容。
+    """
+    text = ' '.join(['lorem ipsum dolor sit amet'] +
+                    [f'$p{i}$ consectetur' for i in range(placeholders)])
+    contents: Dict[str, Any] = {}
+
+    for i in range(tokens):
+        node = contents
+        for layer in range(depth - 1):
+            node = node.setdefault(f'n{(i >> (3 * layer)) & 7}', {})
+        node[f't{i}'] = text
+
+    if list_size:
+        contents['bench'] = {
+            'list': [f'{text} variant {i}' for i in range(list_size)]
+        }
+    return contents
+
+
+def token_of(index: int, depth: int) -> str:
+    """获取 `generate_preset()` 生成的第 `index` 个字符串标签。"""
+    layers = [f'n{(index >> (3 * layer)) & 7}' for layer in range(depth - 1)]
+    return '.'.join(layers + [f't{index}'])
+
+
+def measure(func: Callable[[], Any],
+            min_time: float = 0.2,
+            max_runs: int = 1_000_000) -> Dict[str, float]:
+    """
+    重复调用函数并测量吞吐量与内存占用峰值。
+
+    参数：
+    - `func: Callable[[], Any]`：被测函数。
+
+    可选参数：
+    - `min_time: float`：最短测量时间（秒）。默认为 `0.2`。
+    - `max_runs: int`：最大调用次数。默认为 `1000000`。
+
+    返回：
+    - `Dict[str, float]`：吞吐量（`ops`）、单次平均耗时（`mean_us`）与内存
+      占用峰值（`peak_kib`）。
+    """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    runs = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time and runs < max_runs:
+        func()
+        runs += 1
+        elapsed = time.perf_counter() - start
+
+    return {
+        'ops': runs / elapsed,
+        'mean_us': elapsed / runs * 1e6,
+        'peak_kib': peak / 1024
+    }
+
+
+def bench_load(parser, workdir: Path, sizes: List[int]) -> List[Dict]:
+    """测量不同规模风格预设的冷加载性能。"""
+    results = []
+    for size in sizes:
+        for depth in (1, 5, 10):
+            path = workdir / f'load_{size}_{depth}.yaml'
+            path.write_text(
+                yaml.safe_dump(generate_preset(size, depth, placeholders=2)))
+            token = token_of(0, depth)
+
+            def load():
+                parser.clear_cache()
+                parser.parse(token, preset=path)
+
+            results.append({
+                'case': f'cold load: {size} tokens, depth {depth}',
+                **measure(load, max_runs=max(3, 10_000 // size))
+            })
+    return results
+
+
+def bench_lookup(parser, workdir: Path, sizes: List[int]) -> List[Dict]:
+    """测量已缓存风格预设的字符串标签查找性能。"""
+    results = []
+    for size in sizes:
+        path = workdir / f'lookup_{size}.yaml'
+        path.write_text(
+            yaml.safe_dump(generate_preset(size, 10, list_size=5000)))
+        token = token_of(size - 1, 10)
+        parser.parse(token, preset=path)
+
+        results.append({
+            'case': f'warm lookup: {size} tokens, depth 10',
+            **measure(lambda: parser.parse(token, preset=path))
+        })
+        results.append({
+            'case': f'warm lookup: {size} tokens, 5000-entry list',
+            **measure(lambda: parser.parse('bench.list', preset=path))
+        })
+    return results
+
+
+def bench_render(parser, workdir: Path) -> List[Dict]:
+    """测量不同占位符数量的替换性能。"""
+    results = []
+    for count in (0, 1, 5, 10, 20):
+        path = workdir / f'render_{count}.yaml'
+        path.write_text(
+            yaml.safe_dump(generate_preset(1, 1, placeholders=count)))
+        values = {f'p{i}': f'value {i}' for i in range(count)}
+        parser.parse('t0', preset=path)
+
+        results.append({
+            'case': f'render: {count} placeholders',
+            **measure(lambda: parser.parse('t0', preset=path, **values))
+        })
+    return results
+
+
+def bench_resolve(parser_factory, workdir: Path,
+                  counts: List[int]) -> List[Dict]:
+    """测量不同预设数量的资源目录中的预设名称解析性能。"""
+    results = []
+    for count in counts:
+        respath = workdir / f'resolve_{count}'
+        respath.mkdir()
+        for i in range(count):
+            (respath / f'preset{i}.yaml').write_text('test: resolved\n')
+
+        parser = parser_factory(respath)
+        name = f'preset{count - 1}'
+        parser.parse('test', preset=name)
+
+        results.append({
+            'case': f'resolve name: {count} presets',
+            **measure(lambda: parser.parse('test', preset=name))
+        })
+    return results
+
+
+def report(results: List[Dict]) -> None:
+    """以表格形式输出测试结果。"""
+    width = max(len(result['case']) for result in results)
+    print(f'{"case":<{width}}  {"ops/sec":>12}  {"mean (us)":>10}  '
+          f'{"peak (KiB)":>10}')
+    for result in results:
+        print(f'{result["case"]:<{width}}  {result["ops"]:>12,.0f}  '
+              f'{result["mean_us"]:>10.2f}  {result["peak_kib"]:>10.1f}')
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    arg_parser.add_argument('--quick',
+                            action='store_true',
+                            help='only run small sized cases')
+    arg_parser.add_argument('--json',
+                            action='store_true',
+                            help='print results as JSON')
+    args = arg_parser.parse_args()
+
+    sizes = [10, 100, 1000, 10_000]
+    counts = [1, 10, 100, 1000]
+    if args.quick:
+        sizes, counts = sizes[:3], counts[:3]
+    else:
+        sizes.append(100_000)
+
+    nonebot.init(log_level='WARNING')
+    nonebot.load_plugin('nonebot_plugin_styledstr')
+    init = nonebot.require('nonebot_plugin_styledstr').init
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        parser = init({'styledstr_respath': workdir})
+
+        def parser_factory(respath: Path):
+            return init({'styledstr_respath': respath})
+
+        results = (bench_load(parser, workdir, sizes) +
+                   bench_lookup(parser, workdir, sizes) +
+                   bench_render(parser, workdir) +
+                   bench_resolve(parser_factory, workdir, counts))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        report(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+插件启动性能基准测试。
+
+在独立的子进程中测量导入插件的耗时，并测量创建解析器对象的耗时。任一结果超
+出预算或导入插件时加载了应按需导入的模块时以非零状态码退出，可用于持续集成：
+
+````bash
+python benchmarks/bench_startup.py                      # 使用默认预算
+python benchmarks/bench_startup.py --import-budget 30   # 导入预算（毫秒）
+python benchmarks/bench_startup.py --json               # 以 JSON 格式输出结果
+````
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import nonebot
+
+ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(ROOT))
+
+# 仅在读取预设文件时才应导入的模块
+LAZY_MODULES = ('yaml', 'toml', 'sqlite3')
+
+# 在子进程中执行的导入测量脚本，NoneBot 自身的导入与初始化不计入耗时
+PROBE = f'''
+import json, sys, time
+sys.path.insert(0, {str(ROOT)!r})
+import nonebot
+nonebot.init(log_level='WARNING')
+start = time.perf_counter()
+nonebot.load_plugin('nonebot_plugin_styledstr')
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'elapsed': elapsed,
+    'loaded': [name for name in {LAZY_MODULES!r} if name in sys.modules]
+}}))
+'''
+
+
+def bench_import(runs: int) -> Dict[str, Any]:
+    """在子进程中重复测量导入插件的耗时，取中位数。"""
+    samples: List[float] = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE],
+                                check=True,
+                                capture_output=True,
+                                text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result['elapsed'])
+        loaded = result['loaded']
+
+    return {
+        'case': 'plugin import',
+        'median_ms': statistics.median(samples) * 1e3,
+        'min_ms': min(samples) * 1e3,
+        'lazy_modules_loaded': loaded
+    }
+
+
+def bench_parser(runs: int) -> Dict[str, Any]:
+    """测量以覆盖配置创建解析器对象的平均耗时。"""
+    nonebot.init(log_level='WARNING')
+    nonebot.load_plugin('nonebot_plugin_styledstr')
+    init = nonebot.require('nonebot_plugin_styledstr').init
+
+    config = {'styledstr_respath': ROOT, 'styledstr_preset': 'bench'}
+    # 首次创建时校验 NoneBot 全局配置并创建共享存储，不计入耗时
+    keep = init(config)
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        init(config)
+    elapsed = time.perf_counter() - start
+
+    del keep
+    return {'case': 'parser construction', 'mean_us': elapsed / runs * 1e6}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    arg_parser.add_argument('--import-budget',
+                            type=float,
+                            default=35.0,
+                            help='budget of plugin import in milliseconds')
+    arg_parser.add_argument('--parser-budget',
+                            type=float,
+                            default=100.0,
+                            help='budget of parser construction in '
+                            'microseconds')
+    arg_parser.add_argument('--runs',
+                            type=int,
+                            default=5,
+                            help='number of import measurements')
+    arg_parser.add_argument('--json',
+                            action='store_true',
+                            help='print results as JSON')
+    args = arg_parser.parse_args()
+
+    imported = bench_import(args.runs)
+    constructed = bench_parser(1000)
+
+    failures = []
+    if imported['median_ms'] > args.import_budget:
+        failures.append(f'plugin import took {imported["median_ms"]:.1f} ms, '
+                        f'budget is {args.import_budget:.1f} ms')
+    if imported['lazy_modules_loaded']:
+        failures.append('modules expected to be imported lazily were '
+                        'imported: ' +
+                        ', '.join(imported['lazy_modules_loaded']))
+    if constructed['mean_us'] > args.parser_budget:
+        failures.append(f'parser construction took '
+                        f'{constructed["mean_us"]:.1f} us, budget is '
+                        f'{args.parser_budget:.1f} us')
+
+    if args.json:
+        results = {'results': [imported, constructed], 'failures': failures}
+        print(json.dumps(results, indent=2))
+    else:
+        print(f'plugin import:       {imported["median_ms"]:>8.2f} ms '
+              f'(min {imported["min_ms"]:.2f} ms)')
+        print(f'parser construction: {constructed["mean_us"]:>8.2f} us')
+        for failure in failures:
+            print(f'FAILED: {failure}')
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
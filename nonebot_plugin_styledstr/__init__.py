@@ -1,27 +1,25 @@
 """风格化字符串管理"""
-from importlib.metadata import PackageNotFoundError, version
-from pathlib import Path
 from typing import Any, Dict, Union
 
-import toml
 from nonebot import config as nb_conf
 from nonebot.log import logger
 from nonebot.plugin.export import export
 
 from .styledstr import Parser
 
-# 日志输出版本信息
-try:
-    __version__ = version('nonebot_plugin_styledstr')
-except PackageNotFoundError:
-    with (Path(__file__).parents[1] / 'pyproject.toml').open() as file:
-        __version__ = toml.load(file)['tool']['poetry']['version']
 
-logger.info(f'Plugin loaded: nonebot_plugin_styledstr v{__version__}')
+def __getattr__(name: str) -> Any:
+    # 版本信息仅在被访问时读取，避免导入时查找包元数据
+    if name == '__version__':
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            return version('nonebot_plugin_styledstr')
+        except PackageNotFoundError:
+            return 'unknown'
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
-# 导出创建解析器对象方法
-@export()
 def init(config: Union[nb_conf.Config, Dict[str, Any], None] = None) -> Parser:
     """
     创建解析器对象。
@@ -40,3 +38,13 @@ def init(config: Union[nb_conf.Config, Dict[str, Any], None] = None) -> Parser:
         parser = Parser(**config.dict())
 
     return parser
+
+
+# 导出创建解析器对象方法。以 `python -m nonebot_plugin_styledstr` 运行离线分析
+# 时没有插件加载上下文，不导出
+try:
+    export()(init)
+except LookupError:
+    pass
+else:
+    logger.info('Plugin loaded: nonebot_plugin_styledstr')
@@ -0,0 +1,65 @@
+"""
+离线分析资源目录下的风格预设，以 JSON 格式输出分析结果：
+
+````bash
+python -m nonebot_plugin_styledstr resources            # 分析资源目录
+python -m nonebot_plugin_styledstr resources --strict   # 存在问题时返回非零
+````
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .analyze import analyze
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口。
+
+    可选参数：
+    - `argv: Optional[List[str]]`：命令行参数。默认为 `None`，即使用
+      `sys.argv`。
+
+    返回：
+    - `int`：退出状态码。资源目录不存在，或指定了 `--strict` 且发现问题时为
+      `1`，否则为 `0`。
+    """
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m nonebot_plugin_styledstr',
+        description='Analyze the presets in a resource directory and print '
+        'the report as JSON.')
+    arg_parser.add_argument('respath',
+                            type=Path,
+                            nargs='?',
+                            default=Path('.'),
+                            help='resource directory, defaults to the current '
+                            'working directory')
+    arg_parser.add_argument('--top',
+                            type=int,
+                            default=5,
+                            help='number of the largest lists to report per '
+                            'preset')
+    arg_parser.add_argument('--strict',
+                            action='store_true',
+                            help='exit with a non-zero status if any problem '
+                            'is found')
+    arg_parser.add_argument('--indent',
+                            type=int,
+                            default=2,
+                            help='indentation of the JSON output')
+    args = arg_parser.parse_args(argv)
+
+    if not args.respath.is_dir():
+        print(f'{args.respath} is not a directory.', file=sys.stderr)
+        return 1
+
+    report = analyze(args.respath, args.top)
+    print(json.dumps(report, ensure_ascii=False, indent=args.indent or None))
+    return 1 if args.strict and report['problems'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+风格预设离线分析。
+
+以与解析器相同的方式（包括 .json > .yaml > .yml 的优先级）扫描资源目录，逐个
+读取并编译风格预设，统计其解析耗时、内存占用、字符串标签数量、最大嵌套深度、
+最大的列表与占位符使用情况，并检查其中的问题。分析结果可以转换为 JSON，供持续
+集成使用：
+
+````bash
+python -m nonebot_plugin_styledstr resources
+````
+
+各风格预设单独分析，不合并继承链。
+"""
+import importlib
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .index import ResourceIndex
+from .preset import (REFERENCE, SHARD_SUFFIXES, Preset, ShardedPreset,
+                     load_file)
+from .template import BLACKLIST, PLACEHOLDER
+
+# 形如占位符（可带有格式说明）但不符合占位符命名规则的内容
+SUSPICIOUS = re.compile(r'\$\w+(?::[^$\s]{1,32})?\$')
+# 占位符名称的最大长度
+NAME_LENGTH = 24
+
+# 由问题类型、字符串标签（与字符串标签无关时为 `None`）与问题描述组成
+Problem = Tuple[str, Optional[str], str]
+
+
+def check(loaded: Preset) -> List[Problem]:
+    """
+    检查风格预设的内容。
+
+    参数：
+    - `loaded: preset.Preset`：编译后的风格预设。
+
+    返回：
+    - `List[Tuple[str, Optional[str], str]]`：问题列表，问题类型包括：
+      - `invalid_value`：字符串标签的内容不是数值、布尔值、字符串或非空列表；
+      - `reserved_placeholder`：占位符使用了保留名称；
+      - `placeholder_too_long`：占位符名称超过 24 个字符；
+      - `invalid_placeholder`：占位符名称不符合其他命名规则；
+      - `unresolved_reference`：引用了不存在、内容无效或内容为列表的字符串标
+        签。风格预设声明了基础风格预设时不检查。
+    """
+    # 无效字符串标签中包括嵌套层级，仅报告不含下层级的字符串标签
+    nodes = set()
+    for token in (*loaded.tokens, *loaded.invalid):
+        index = token.find('.')
+        while index != -1:
+            nodes.add(token[:index])
+            index = token.find('.', index + 1)
+
+    problems: List[Problem] = []
+    for token in sorted(loaded.invalid - nodes):
+        problems.append(('invalid_value', token,
+                         f'The value of the token "{token}" is not a '
+                         'numeric, boolean, string or list.'))
+
+    for token in sorted(loaded.tokens):
+        entry = loaded.tokens[token]
+        for template in entry if isinstance(entry, tuple) else (entry, ):
+            for raw in SUSPICIOUS.findall(template.text):
+                name = raw[1:-1].partition(':')[0]
+                if name.lower() in BLACKLIST:
+                    kind = 'reserved_placeholder'
+                    reason = 'uses a reserved name'
+                elif PLACEHOLDER.fullmatch(raw):
+                    continue
+                elif len(name) > NAME_LENGTH and name[0].isalpha():
+                    kind = 'placeholder_too_long'
+                    reason = f'has a name longer than {NAME_LENGTH} characters'
+                else:
+                    kind = 'invalid_placeholder'
+                    reason = 'is not a valid placeholder name'
+                problems.append(
+                    (kind, token, f'The placeholder {raw} in the token '
+                     f'"{token}" {reason} and will never be replaced.'))
+
+    # 被引用的字符串标签可能存在于基础风格预设中
+    if loaded.base is not None:
+        return problems
+    for token in sorted(loaded.references):
+        entry = loaded.tokens[token]
+        for template in entry if isinstance(entry, tuple) else (entry, ):
+            for target in REFERENCE.findall(template.text):
+                problems.append(
+                    ('unresolved_reference', token, f'The reference '
+                     f'${{{target}}} in the token "{token}" does not refer to '
+                     'a token with a numeric, boolean or string value.'))
+    return problems
+
+
+def analyze_preset(path: Path, top: int = 5) -> Dict[str, Any]:
+    """
+    读取、编译并分析单个风格预设。
+
+    参数：
+    - `path: pathlib.Path`：预设文件或以目录形式存储的风格预设的路径。
+
+    可选参数：
+    - `top: int`：报告的最大列表数量。默认为 `5`。
+
+    异常：
+    - `OSError`、`yaml.YAMLError`、`json.JSONDecodeError`：无法读取预设文件
+      或预设文件内容格式错误。
+
+    返回：
+    - `Dict[str, Any]`：分析结果，包括解析耗时 `parse_ms`、估算的内存占用
+      `size_bytes`、字符串标签数量 `tokens`、引用了其他字符串标签的字符串标签
+      数量 `references`、最大嵌套深度 `max_depth`、最大的列表
+      `largest_lists`、各占位符的出现次数 `placeholders` 与问题列表
+      `problems`。
+    """
+    start = time.perf_counter()
+    loaded = load_file(path)
+    if isinstance(loaded, ShardedPreset):
+        loaded = loaded.materialize()
+    elapsed = time.perf_counter() - start
+    assert isinstance(loaded, Preset)
+
+    lists = sorted(((token, len(entry))
+                    for token, entry in loaded.tokens.items()
+                    if isinstance(entry, tuple)),
+                   key=lambda item: (-item[1], item[0]))
+    placeholders: Counter = Counter()
+    for entry in loaded.tokens.values():
+        for template in entry if isinstance(entry, tuple) else (entry, ):
+            placeholders.update(segment[0]
+                                for segment in template.segments
+                                if isinstance(segment, tuple))
+    depths = [
+        token.count('.') + 1 for token in (*loaded.tokens, *loaded.invalid)
+    ]
+
+    return {
+        'parse_ms': elapsed * 1e3,
+        'size_bytes': _sizeof(loaded),
+        'tokens': len(loaded.tokens),
+        'references': len(loaded.references),
+        'max_depth': max(depths, default=0),
+        'base': loaded.base,
+        'largest_lists': [{
+            'token': token,
+            'length': length
+        } for token, length in lists[:top]],
+        'placeholders': dict(sorted(placeholders.items())),
+        'problems': check(loaded)
+    }
+
+
+def analyze(respath: Path, top: int = 5) -> Dict[str, Any]:
+    """
+    分析资源目录下的全部风格预设。
+
+    参数：
+    - `respath: pathlib.Path`：资源目录。
+
+    可选参数：
+    - `top: int`：每个风格预设报告的最大列表数量。默认为 `5`。
+
+    返回：
+    - `Dict[str, Any]`：可直接转换为 JSON 的分析结果。`presets` 为各风格预设
+      的分析结果，无法读取的风格预设仅包括 `error`；`problems` 为全部问题，每
+      项包括风格预设名称 `preset`、问题类型 `kind`、字符串标签 `token` 与问题
+      描述 `message`。除 `check()` 中的问题类型外，还包括无法读取的风格预设
+      `unreadable` 与因同名而被忽略的预设文件 `shadowed_file`。
+    """
+    # 预设文件在首次读取时才导入 yaml，预先导入以免计入首个风格预设的解析耗时
+    importlib.import_module('yaml')
+
+    index = ResourceIndex(respath)
+    presets: Dict[str, Dict[str, Any]] = {}
+    problems: List[Dict[str, Any]] = []
+
+    def report(name: str, kind: str, token: Optional[str],
+               message: str) -> None:
+        problems.append({
+            'preset': name,
+            'kind': kind,
+            'token': token,
+            'message': message
+        })
+
+    for name, ignored in index.shadowed().items():
+        used = index.lookup(name, refresh=False)
+        for path in ignored:
+            report(name, 'shadowed_file', None,
+                   f'{path.name} is shadowed by {used.name} and ignored.')
+
+    for name in index.names():
+        path = index.lookup(name, refresh=False)
+        assert path is not None
+        result: Dict[str, Any] = {'path': str(path), 'sharded': path.is_dir()}
+        presets[name] = result
+
+        if path.is_dir():
+            for shard, ignored in _shadowed_shards(path).items():
+                for file in ignored:
+                    message = (f'{path.name}/{file.name} is shadowed by '
+                               f'{path.name}/{shard.name} and ignored.')
+                    report(name, 'shadowed_file', None, message)
+
+        try:
+            result.update(analyze_preset(path, top))
+        # 预设文件无法读取或内容格式错误
+        except Exception as err:
+            result['error'] = f'{err.__class__.__name__}: {err}'
+            report(name, 'unreadable', None, result['error'])
+            continue
+
+        for kind, token, message in result.pop('problems'):
+            report(name, kind, token, message)
+
+    return {'respath': str(respath), 'presets': presets, 'problems': problems}
+
+
+def _shadowed_shards(directory: Path) -> Dict[Path, List[Path]]:
+    """
+    获取以目录形式存储的风格预设中因同名而被忽略的分片文件。
+
+    参数：
+    - `directory: pathlib.Path`：风格预设目录。
+
+    返回：
+    - `Dict[pathlib.Path, List[pathlib.Path]]`：被使用的分片文件到同名而被忽
+      略的分片文件的映射。
+    """
+    candidates: Dict[str, List[Path]] = {}
+    for file in directory.iterdir():
+        if file.suffix.lower() in SHARD_SUFFIXES:
+            candidates.setdefault(file.stem, []).append(file)
+    return {
+        min(files): sorted(file for file in files if file != min(files))
+        for files in candidates.values()
+        if len(files) > 1
+    }
+
+
+def _sizeof(loaded: Preset) -> int:
+    """
+    估算编译后的风格预设占用的内存，同一对象仅计算一次。
+
+    参数：
+    - `loaded: preset.Preset`：编译后的风格预设。
+
+    返回：
+    - `int`：估算的字节数。
+    """
+    seen = set()
+    size = 0
+    stack: List[Any] = [loaded.tokens, loaded.invalid]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, 'segments'):
+            stack.extend((obj.text, obj.segments, obj.names))
+    return size
@@ -0,0 +1,461 @@
+"""
+风格预设包。
+
+将资源目录下的全部风格预设（已合并继承链）编译为单个只读的二进制文件，由
+解析器通过 `mmap` 打开并直接从中查找字符串标签，无需反序列化整个文件。同一
+主机上的多个进程共享操作系统的同一份页缓存，启动时也无需加载预设文件。
+
+文件结构（小端序，偏移量均为相对文件起始位置的绝对偏移）：
+- 文件头 `HEADER`：魔数、格式版本与风格预设数量；
+- 风格预设目录：每个风格预设一条 `PRESET` 记录，包括名称（小写）、字符串标签
+  散列表的偏移与容量，以及有效字符串标签数量；
+- 散列表：开放寻址，每个槽位一条 `SLOT` 记录，包括字符串标签的 CRC32、字符
+  串标签、条目偏移、模板数量与内容是否为列表。模板数量为 `0` 表示对应内容
+  无效，条目偏移为 `0` 表示空槽位；
+- 条目：由模板记录偏移组成的数组，列表内容的每个元素对应一个模板；
+- 模板记录：`TEMPLATE` 记录原始字符串与片段数量，随后为各 `SEGMENT` 片段记
+  录，文本片段记录文本，占位符片段记录占位符名称、原始文本与格式说明；
+- 字符串表：UTF-8 编码的字符串，相同字符串仅存储一次。
+"""
+import mmap
+import random
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+from . import exception
+from .index import ResourceIndex
+from .preset import (Entry, MISSING_CAPACITY, Preset, ShardedPreset,
+                     search_sorted)
+from .source import PresetSource
+from .template import Segment, Template
+
+MAGIC = b'SSBN'
+BUNDLE_VERSION = 3
+
+HEADER = struct.Struct('<4sII')
+PRESET = struct.Struct('<QIQII')
+SLOT = struct.Struct('<IQIQI?')
+TEMPLATE = struct.Struct('<QII')
+SEGMENT = struct.Struct('<BQIQIQI')
+OFFSET = struct.Struct('<Q')
+
+# 每个风格预设最多缓存的已解码模板数量
+TEMPLATE_CAPACITY = 4096
+
+
+class BundlePreset(object):
+    """
+    风格预设包中的单个风格预设。
+
+    与 `preset.Preset` 提供相同的 `lookup()` 接口，字符串标签内容在查找时才从
+    风格预设包中解码，解码后的模板按偏移量缓存。
+
+    属性：
+    - `name: str`：风格预设名称（小写）。
+    - `base: None`：风格预设包中的风格预设均已合并继承链。
+    - `version: int`：内容版本。风格预设包为只读文件，恒为 `0`。
+    """
+
+    __slots__ = ('name', 'base', '__buffer', '__table', '__mask', '__count',
+                 '__templates', '__missing', '__keys')
+
+    version = 0
+
+    def __init__(self, buffer: mmap.mmap, name: str, table: int, capacity: int,
+                 count: int) -> None:
+        """
+        初始化风格预设。
+
+        参数：
+        - `buffer: mmap.mmap`：风格预设包的内存映射。
+        - `name: str`：风格预设名称。
+        - `table: int`：散列表偏移。
+        - `capacity: int`：散列表容量，为 2 的幂。
+        - `count: int`：有效字符串标签数量。
+        """
+        self.name = name
+        self.base = None
+        self.__buffer = buffer
+        self.__table = table
+        self.__mask = capacity - 1
+        self.__count = count
+        self.__templates: Dict[int, Template] = {}
+        self.__missing: Dict[str, exception.TokenError] = {}
+        # 有序的字符串标签索引，首次按前缀查找时扫描散列表建立
+        self.__keys: Optional[List[str]] = None
+
+    def lookup(self, token: str) -> Template:
+        """
+        查找字符串标签对应的模板。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        异常：
+        - `exception.TokenError`：字符串标签不存在于风格预设中，或其对应内容不
+          是数值、布尔值、字符串或列表。
+
+        返回：
+        - `template.Template`：标签所指示的字符串模板。特别地，当字符串标签所
+          对应的内容为列表时，则从中随机抽取值返回。
+        """
+        slot = self.__find(token)
+        if slot is None or not slot[1]:
+            err = self.__missing.get(token)
+            if err is None:
+                err = self.__error(token, slot is not None)
+            raise err.with_traceback(None)
+
+        entry, count, _ = slot
+        index = random.randrange(count) if count > 1 else 0
+        (offset, ) = OFFSET.unpack_from(self.__buffer,
+                                        entry + index * OFFSET.size)
+        return self.__template(offset)
+
+    def is_random(self, token: str) -> bool:
+        """
+        判断字符串标签的内容是否为列表，即每次查找时是否随机抽取。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        返回：
+        - `bool`：字符串标签的内容是否为列表。字符串标签无效时返回 `False`。
+        """
+        slot = self.__find(token)
+        return slot is not None and slot[2]
+
+    def search(self, prefix: str = '') -> List[str]:
+        """
+        查找字符串标签层级下的全部有效字符串标签，同 `preset.Preset.search()`。
+        首次查找时扫描散列表建立有序索引。
+
+        可选参数：
+        - `prefix: str`：字符串标签层级。默认为空字符串，即全部字符串标签。
+
+        返回：
+        - `List[str]`：按字典序排列的字符串标签。
+        """
+        keys = self.__keys
+        if keys is None:
+            keys = []
+            buffer = self.__buffer
+            for index in range(self.__mask + 1):
+                (_, key_offset, key_size, entry, count,
+                 _) = SLOT.unpack_from(buffer,
+                                       self.__table + index * SLOT.size)
+                if entry and count:
+                    keys.append(buffer[key_offset:key_offset +
+                                       key_size].decode())
+            keys.sort()
+            self.__keys = keys
+        return search_sorted(keys, prefix)
+
+    def __find(self, token: str) -> Optional[Tuple[int, int, bool]]:
+        """
+        在散列表中查找字符串标签。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        返回：
+        - `Optional[Tuple[int, int, bool]]`：条目偏移、模板数量与内容是否为
+          列表。字符串标签不存在时返回 `None`。
+        """
+        buffer = self.__buffer
+        key = token.encode()
+        digest = zlib.crc32(key)
+        index = digest & self.__mask
+
+        while True:
+            (slot_digest, key_offset, key_size, entry, count,
+             is_list) = SLOT.unpack_from(buffer,
+                                         self.__table + index * SLOT.size)
+            if not entry:
+                return None
+            if (slot_digest == digest and key_size == len(key)
+                    and buffer[key_offset:key_offset + key_size] == key):
+                return entry, count, is_list
+            index = (index + 1) & self.__mask
+
+    def __template(self, offset: int) -> Template:
+        """
+        解码模板记录。
+
+        参数：
+        - `offset: int`：模板记录偏移。
+
+        返回：
+        - `template.Template`：字符串模板。
+        """
+        template = self.__templates.get(offset)
+        if template is not None:
+            return template
+
+        buffer = self.__buffer
+        text_offset, text_size, count = TEMPLATE.unpack_from(buffer, offset)
+        text = buffer[text_offset:text_offset + text_size].decode()
+
+        segments: List[Segment] = []
+        position = offset + TEMPLATE.size
+        for _ in range(count):
+            (kind, a_offset, a_size, b_offset, b_size, c_offset,
+             c_size) = SEGMENT.unpack_from(buffer, position)
+            position += SEGMENT.size
+            first = buffer[a_offset:a_offset + a_size].decode()
+            if kind:
+                raw = buffer[b_offset:b_offset + b_size].decode()
+                spec = buffer[c_offset:c_offset + c_size].decode()
+                segments.append((first, raw, spec))
+            else:
+                segments.append(first)
+
+        template = Template.from_segments(text, tuple(segments))
+        if len(self.__templates) < TEMPLATE_CAPACITY:
+            self.__templates[offset] = template
+        return template
+
+    def __error(self, token: str, invalid: bool) -> exception.TokenError:
+        """
+        创建并缓存无效字符串标签所对应的异常。
+
+        参数：
+        - `token: str`：字符串标签。
+        - `invalid: bool`：字符串标签是否存在但对应内容无效。
+
+        返回：
+        - `exception.TokenError`：字符串标签异常。
+        """
+        if invalid:
+            message = (f'The value of the token "{token}" is not a '
+                       'numeric, boolean, string or list.')
+            err = exception.TokenError(message=message)
+        else:
+            err = exception.TokenError(token)
+
+        if len(self.__missing) < MISSING_CAPACITY:
+            self.__missing[token] = err
+        return err
+
+    def __len__(self) -> int:
+        return self.__count
+
+
+class Bundle(PresetSource):
+    """只读的风格预设包。"""
+
+    def __init__(self, path: Path) -> None:
+        """
+        打开风格预设包。
+
+        参数：
+        - `path: pathlib.Path`：风格预设包文件路径。
+
+        异常：
+        - `OSError`：无法读取文件。
+        - `ValueError`：文件不是有效的风格预设包，或格式版本不受支持。
+        """
+        self.__path = path
+        with path.open('rb') as f:
+            self.__buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self.__buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a valid preset bundle.')
+        if version != BUNDLE_VERSION:
+            raise ValueError(f'Unsupported preset bundle version {version} '
+                             f'of {path}.')
+
+        self.__presets: Dict[str, BundlePreset] = {}
+        for i in range(count):
+            name_offset, name_size, table, capacity, tokens = (
+                PRESET.unpack_from(self.__buffer,
+                                   HEADER.size + i * PRESET.size))
+            name = self.__buffer[name_offset:name_offset + name_size].decode()
+            self.__presets[name] = BundlePreset(self.__buffer, name, table,
+                                                capacity, tokens)
+
+    @property
+    def path(self) -> Path:
+        """风格预设包文件路径。"""
+        return self.__path
+
+    def names(self) -> List[str]:
+        """
+        获取风格预设包中的所有风格预设名称。
+
+        返回：
+        - `List[str]`：风格预设名称（小写）列表。
+        """
+        return sorted(self.__presets)
+
+    def get(self, preset: Union[str, Path]) -> BundlePreset:
+        """
+        获取风格预设。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设名称。为预设文件路径时
+          使用其文件名（不含后缀名）作为风格预设名称。
+
+        异常：
+        - `exception.PresetFileError`：风格预设包中不存在指定风格预设。
+
+        返回：
+        - `BundlePreset`：风格预设。
+        """
+        loaded = self.__presets.get(self.preset_name(preset))
+        if loaded is None:
+            message = (f'Cannot find preset "{preset}" in the preset bundle '
+                       f'{self.__path.absolute()}.')
+            raise exception.PresetFileError(message=message)
+        return loaded
+
+    def close(self) -> None:
+        """关闭内存映射。"""
+        self.__buffer.close()
+
+
+def build_bundle(respath: Path,
+                 output: Path,
+                 bases: Optional[Mapping[str, str]] = None) -> List[str]:
+    """
+    将资源目录下的全部风格预设编译为风格预设包。
+
+    参数：
+    - `respath: pathlib.Path`：资源目录。
+    - `output: pathlib.Path`：风格预设包文件路径。
+
+    可选参数：
+    - `bases: Optional[Mapping[str, str]]`：风格预设名称到其基础风格预设名称
+      的映射，同插件配置 `styledstr_bases`。默认为空。
+
+    异常：
+    - `exception.PresetFileError`：风格预设的继承链存在问题。
+    - `OSError`、`yaml.YAMLError`、`json.JSONDecodeError`：无法读取预设文件
+      或预设文件内容格式错误。
+
+    返回：
+    - `List[str]`：已编译的风格预设名称列表。
+    """
+    from .store import PresetStore
+
+    store = PresetStore(respath, bases)
+    names = ResourceIndex(respath).names()
+    presets = [(name, store.load(name)) for name in names]
+
+    writer = _BundleWriter(len(presets))
+    for i, (name, loaded) in enumerate(presets):
+        if isinstance(loaded, ShardedPreset):
+            loaded = loaded.materialize()
+        assert isinstance(loaded, Preset)
+        entries: Dict[str, Optional[Entry]] = dict(loaded.tokens)
+        entries.update((token, None) for token in loaded.invalid)
+        writer.add_preset(i, name, entries, len(loaded.tokens))
+
+    tmp_file = output.with_name(output.name + '.tmp')
+    tmp_file.write_bytes(writer.buffer)
+    tmp_file.replace(output)
+    return names
+
+
+class _BundleWriter(object):
+    """风格预设包写入器。"""
+
+    def __init__(self, count: int) -> None:
+        """
+        初始化写入器并预留文件头与风格预设目录。
+
+        参数：
+        - `count: int`：风格预设数量。
+        """
+        self.buffer = bytearray(HEADER.pack(MAGIC, BUNDLE_VERSION, count))
+        self.buffer.extend(bytes(PRESET.size * count))
+        self.__strings: Dict[str, Tuple[int, int]] = {}
+        self.__templates: Dict[int, int] = {}
+
+    def add_preset(self, index: int, name: str,
+                   entries: Mapping[str, Optional[Entry]], count: int) -> None:
+        """
+        写入风格预设。
+
+        参数：
+        - `index: int`：风格预设在目录中的序号。
+        - `name: str`：风格预设名称。
+        - `entries: Mapping[str, Optional[Entry]]`：字符串标签及其内容，内容
+          无效的字符串标签对应 `None`。
+        - `count: int`：有效字符串标签数量。
+        """
+        capacity = 8
+        while capacity < len(entries) * 2:
+            capacity <<= 1
+        mask = capacity - 1
+
+        table = len(self.buffer)
+        self.buffer.extend(bytes(SLOT.size * capacity))
+
+        for token, entry in entries.items():
+            key_offset, key_size = self.__string(token)
+            digest = zlib.crc32(token.encode())
+
+            if entry is None:
+                templates: Tuple[Template, ...] = ()
+            elif isinstance(entry, tuple):
+                templates = entry
+            else:
+                templates = (entry, )
+            offsets = [self.__template(template) for template in templates]
+
+            # 内容无效的字符串标签也需要非零的条目偏移以区分空槽位
+            entry_offset = len(self.buffer)
+            for offset in offsets or [0]:
+                self.buffer.extend(OFFSET.pack(offset))
+
+            slot = digest & mask
+            while SLOT.unpack_from(self.buffer, table + slot * SLOT.size)[3]:
+                slot = (slot + 1) & mask
+            SLOT.pack_into(self.buffer, table + slot * SLOT.size, digest,
+                           key_offset, key_size, entry_offset, len(offsets),
+                           isinstance(entry, tuple))
+
+        name_offset, name_size = self.__string(name)
+        PRESET.pack_into(self.buffer, HEADER.size + index * PRESET.size,
+                         name_offset, name_size, table, capacity, count)
+
+    def __template(self, template: Template) -> int:
+        """写入模板记录并返回其偏移，同一模板对象仅写入一次。"""
+        offset = self.__templates.get(id(template))
+        if offset is not None:
+            return offset
+
+        records = []
+        for segment in template.segments:
+            if isinstance(segment, str):
+                records.append(
+                    SEGMENT.pack(0, *self.__string(segment), 0, 0, 0, 0))
+            else:
+                name, raw, spec = segment
+                records.append(
+                    SEGMENT.pack(1, *self.__string(name), *self.__string(raw),
+                                 *self.__string(spec)))
+
+        text_offset, text_size = self.__string(template.text)
+        offset = len(self.buffer)
+        self.buffer.extend(
+            TEMPLATE.pack(text_offset, text_size, len(template.segments)))
+        for record in records:
+            self.buffer.extend(record)
+
+        self.__templates[id(template)] = offset
+        return offset
+
+    def __string(self, text: str) -> Tuple[int, int]:
+        """写入字符串并返回其偏移与长度，相同字符串仅写入一次。"""
+        location = self.__strings.get(text)
+        if location is None:
+            data = text.encode()
+            location = (len(self.buffer), len(data))
+            self.buffer.extend(data)
+            self.__strings[text] = location
+        return location
@@ -0,0 +1,291 @@
+"""风格预设缓存"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+Signature = Tuple[int, int, int]
+# 由状态签名、预设内容、权重与派生内容的权重组成的缓存条目
+Entry = Tuple[Signature, Any, int, int]
+
+
+class PresetCache(object):
+    """
+    风格预设内存缓存。
+
+    以预设文件的绝对路径作为键缓存已加载的预设内容，并记录加载时文件的
+    inode、大小与修改时间。仅当文件状态发生变化时缓存才会失效。
+
+    可以限制缓存的预设文件数量与字符串标签总数，超出限制时按最近最少使用
+    （LRU）的顺序淘汰缓存条目。被固定的风格预设不会被淘汰。每个缓存条目的权重
+    在写入时计算并随条目保存，内容会增长的条目（如按需读取分片的风格预设）需
+    通过 `reweigh()` 重新计算；由条目派生的内容（如继承链合并结果）通过
+    `charge()` 计入该条目的权重。
+
+    属性：
+    - `evictions: int`：被淘汰的缓存条目数量。
+    """
+
+    def __init__(self,
+                 capacity: int = 0,
+                 budget: int = 0,
+                 on_evict: Optional[Callable[[Path], None]] = None) -> None:
+        """
+        初始化缓存。
+
+        可选参数：
+        - `capacity: int`：最多缓存的预设文件数量。默认为 `0`，即不限制。
+        - `budget: int`：缓存的字符串标签总数上限，以预设内容的 `len()` 计。
+          默认为 `0`，即不限制。
+        - `on_evict: Optional[Callable[[pathlib.Path], None]]`：缓存条目被淘
+          汰后调用的函数，参数为预设文件路径。默认为 `None`。
+        """
+        self.__entries: 'OrderedDict[Path, Entry]' = OrderedDict()
+        self.__capacity = capacity
+        self.__budget = budget
+        self.__bounded = bool(capacity or budget)
+        self.__on_evict = on_evict
+        self.__pinned: Set[str] = set()
+        self.__weight = 0
+        self.__lock = threading.Lock()
+        self.evictions = 0
+
+    @staticmethod
+    def signature(path: Path) -> Signature:
+        """
+        获取文件状态签名。
+
+        参数：
+        - `path: pathlib.Path`：文件路径。
+
+        异常：
+        - `OSError`：无法读取文件状态。
+
+        返回：
+        - `Tuple[int, int, int]`：由 inode、文件大小与修改时间（纳秒）组成的
+          签名。
+        """
+        stat = path.stat()
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def get(self, path: Path, signature: Signature) -> Optional[Any]:
+        """
+        获取缓存的预设内容。
+
+        参数：
+        - `path: pathlib.Path`：预设文件的绝对路径。
+        - `signature: Tuple[int, int, int]`：文件当前的状态签名。
+
+        返回：
+        - `Optional[Any]`：缓存的预设内容。缓存不存在或已失效时返回 `None`。
+        """
+        entry = self.__entries.get(path)
+        if entry is None or entry[0] != signature:
+            return None
+        if self.__bounded:
+            self.__touch(path)
+        return entry[1]
+
+    def peek(self, path: Path) -> Optional[Tuple[Signature, Any]]:
+        """
+        获取缓存条目，不检查文件状态。
+
+        参数：
+        - `path: pathlib.Path`：预设文件的绝对路径。
+
+        返回：
+        - `Optional[Tuple[Tuple[int, int, int], Any]]`：写入缓存时的状态签名
+          与预设内容。缓存不存在时返回 `None`。
+        """
+        entry = self.__entries.get(path)
+        if entry is None:
+            return None
+        if self.__bounded:
+            self.__touch(path)
+        return entry[0], entry[1]
+
+    def paths(self) -> List[Path]:
+        """
+        获取所有已缓存的预设文件路径。
+
+        返回：
+        - `List[pathlib.Path]`：预设文件的绝对路径列表。
+        """
+        return list(self.__entries)
+
+    def put(self, path: Path, signature: Signature, contents: Any) -> None:
+        """
+        写入缓存。已存在的缓存条目将被整体替换。
+
+        参数：
+        - `path: pathlib.Path`：预设文件的绝对路径。
+        - `signature: Tuple[int, int, int]`：读取文件时的状态签名。
+        - `contents: Any`：预设内容。
+        """
+        weight = self.__weigh(contents)
+        with self.__lock:
+            self.__remove(path)
+            self.__entries[path] = (signature, contents, weight, 0)
+            self.__weight += weight
+            evicted = self.__evict(path) if self.__bounded else []
+
+        self.__notify(evicted)
+
+    def reweigh(self, path: Path) -> None:
+        """
+        重新计算缓存条目的权重，超出限制时淘汰其他缓存条目。权重未变化时不获
+        取锁。
+
+        参数：
+        - `path: pathlib.Path`：预设文件的绝对路径。
+        """
+        entry = self.__entries.get(path)
+        if entry is None or self.__weigh(entry[1]) == entry[2]:
+            return
+
+        with self.__lock:
+            entry = self.__entries.get(path)
+            if entry is None:
+                return
+            weight = self.__weigh(entry[1])
+            self.__entries[path] = (entry[0], entry[1], weight, entry[3])
+            self.__weight += weight - entry[2]
+            evicted = self.__evict(path) if self.__bounded else []
+
+        self.__notify(evicted)
+
+    def charge(self, path: Path, extra: int) -> bool:
+        """
+        将由缓存条目派生的内容的权重计入该条目，替换之前计入的权重，超出限制
+        时淘汰其他缓存条目。淘汰全部未固定的其他缓存条目后仍超出字符串标签总
+        数上限时不计入，调用方不应保留派生内容。
+
+        参数：
+        - `path: pathlib.Path`：预设文件的绝对路径。
+        - `extra: int`：派生内容的权重。为 `0` 时即移除之前计入的权重。
+
+        返回：
+        - `bool`：是否已计入。缓存条目不存在时返回 `False`。
+        """
+        with self.__lock:
+            entry = self.__entries.get(path)
+            if entry is None:
+                return False
+            accepted = not extra or self.__fits(path, entry[2] + extra)
+            if not accepted:
+                extra = 0
+
+            self.__entries[path] = (entry[0], entry[1], entry[2], extra)
+            self.__weight += extra - entry[3]
+            evicted = self.__evict(path) if self.__bounded else []
+
+        self.__notify(evicted)
+        return accepted
+
+    def invalidate(self, path: Path) -> bool:
+        """
+        使指定预设文件的缓存失效。
+
+        参数：
+        - `path: pathlib.Path`：预设文件的绝对路径。
+
+        返回：
+        - `bool`：缓存是否存在并已移除。
+        """
+        with self.__lock:
+            return self.__remove(path)
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__weight = 0
+
+    def pin(self, name: str) -> None:
+        """
+        固定风格预设，使其不会被淘汰。
+
+        参数：
+        - `name: str`：风格预设名称，即预设文件名（不含后缀名），对大小写不
+          敏感。
+        """
+        self.__pinned.add(name.lower())
+
+    @property
+    def weight(self) -> int:
+        """缓存的字符串标签总数。"""
+        return self.__weight
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self.__entries
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __touch(self, path: Path) -> None:
+        """将缓存条目标记为最近使用。"""
+        try:
+            self.__entries.move_to_end(path)
+        except KeyError:
+            pass
+
+    def __remove(self, path: Path) -> bool:
+        """移除缓存条目，需在持有锁时调用。"""
+        entry = self.__entries.pop(path, None)
+        if entry is None:
+            return False
+        self.__weight -= entry[2] + entry[3]
+        return True
+
+    def __notify(self, evicted: List[Path]) -> None:
+        """对被淘汰的缓存条目调用 `on_evict`，需在释放锁后调用。"""
+        if self.__on_evict is not None:
+            for victim in evicted:
+                self.__on_evict(victim)
+
+    def __evict(self, keep: Path) -> List[Path]:
+        """
+        按最近最少使用的顺序淘汰缓存条目直至满足限制，需在持有锁时调用。
+
+        参数：
+        - `keep: pathlib.Path`：不被淘汰的预设文件路径，即刚写入的缓存条目。
+
+        返回：
+        - `List[pathlib.Path]`：被淘汰的预设文件路径。
+        """
+        evicted: List[Path] = []
+        for path in list(self.__entries):
+            if not self.__exceeded():
+                break
+            if path == keep or path.stem.lower() in self.__pinned:
+                continue
+            self.__remove(path)
+            evicted.append(path)
+
+        self.evictions += len(evicted)
+        return evicted
+
+    def __fits(self, keep: Path, weight: int) -> bool:
+        """
+        淘汰全部未固定的其他缓存条目后，缓存条目能否以指定权重满足字符串标签
+        总数上限，需在持有锁时调用。
+        """
+        if not self.__budget:
+            return True
+        pinned = sum(entry[2] + entry[3]
+                     for path, entry in self.__entries.items()
+                     if path != keep and path.stem.lower() in self.__pinned)
+        return pinned + weight <= self.__budget
+
+    def __exceeded(self) -> bool:
+        """缓存是否超出限制。"""
+        return bool((self.__capacity and len(self.__entries) > self.__capacity)
+                    or (self.__budget and self.__weight > self.__budget))
+
+    @staticmethod
+    def __weigh(contents: Any) -> int:
+        """获取预设内容的权重。"""
+        try:
+            return len(contents)
+        except TypeError:
+            return 1
@@ -1,12 +1,83 @@
 """插件配置"""
+import threading
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import BaseSettings
+import nonebot
+from pydantic import BaseSettings, ValidationError
+
+from .source import PresetSource
 
 
 class Config(BaseSettings):
     styledstr_respath: Path = Path()
     styledstr_preset: str = 'default'
+    styledstr_bases: Dict[str, str] = {}
+    styledstr_watch: bool = False
+    styledstr_watch_interval: float = 1.0
+    styledstr_disk_cache: bool = False
+    styledstr_cache_dir: Optional[Path] = None
+    styledstr_bundle: Optional[Path] = None
+    styledstr_database: Optional[Path] = None
+    styledstr_source: Optional[PresetSource] = None
+    styledstr_cache_size: int = 0
+    styledstr_cache_budget: int = 0
+    styledstr_pinned: List[str] = []
+    styledstr_warmup: bool = False
+    styledstr_warmup_workers: Optional[int] = None
+    styledstr_render_cache: int = 0
+    styledstr_metrics: bool = False
+    styledstr_error_interval: float = 60.0
 
     class Config:
         extra = 'ignore'
+        arbitrary_types_allowed = True
+
+
+# 由 NoneBot 全局配置对象与据此校验得到的插件配置组成的缓存
+_cached: Optional[Tuple[Any, Config]] = None
+_lock = threading.Lock()
+
+
+def get_config(overrides: Optional[Dict[str, Any]] = None) -> Config:
+    """
+    获取插件配置。
+
+    由 NoneBot 全局配置校验得到的插件配置将被缓存，仅当 NoneBot 重新初始化后
+    才会重新校验；`overrides` 中的配置项则单独校验后覆盖缓存的插件配置。
+
+    可选参数：
+    - `overrides: Optional[Dict[str, Any]]`：覆盖 NoneBot 读取的插件配置。默
+      认为 `None`。
+
+    异常：
+    - `pydantic.ValidationError`：配置项的值无效。
+
+    返回：
+    - `Config`：插件配置。
+    """
+    global _cached
+
+    driver_config = nonebot.get_driver().config
+    with _lock:
+        if _cached is None or _cached[0] is not driver_config:
+            _cached = (driver_config, Config(**driver_config.dict()))
+        base = _cached[1]
+
+    if not overrides:
+        return base
+
+    values = {}
+    errors = []
+    for name, value in overrides.items():
+        field = Config.__fields__.get(name)
+        if field is None:
+            continue
+        value, error = field.validate(value, values, loc=name, cls=Config)
+        if error is not None:
+            errors.append(error)
+        values[name] = value
+
+    if errors:
+        raise ValidationError(errors, Config)
+    return base.copy(update=values)
@@ -0,0 +1,432 @@
+"""
+SQLite 风格预设数据库。
+
+将资源目录下的全部风格预设（已合并继承链）展开后导入单个 SQLite 数据库文件。
+解析器以只读方式打开数据库，每次查找字符串标签仅执行一次基于主键的点查询，
+不需要将整个风格预设载入内存，适用于包含大量字符串的本地化目录。
+
+表结构：
+- `meta`：键值对，记录格式版本 `version`；
+- `presets`：风格预设编号、名称（小写）与有效字符串标签数量；
+- `tokens`：以风格预设编号、字符串标签与序号为主键的字符串内容。内容为列表时
+  每一项为一行，序号为其在列表中的位置加 `1`；其他有效内容的序号为 `0`；对应
+  内容无效的字符串标签序号为 `-1`，内容为 `NULL`。
+"""
+import random
+import threading
+from pathlib import Path
+from typing import (TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple, Union,
+                    cast)
+
+from . import exception
+from .index import ResourceIndex
+from .preset import MISSING_CAPACITY, Entry, Preset, ShardedPreset
+from .source import PresetSource
+from .template import Template
+
+# sqlite3 仅在使用风格预设数据库时导入
+if TYPE_CHECKING:
+    import sqlite3
+
+DATABASE_VERSION = 2
+
+# 每个连接缓存的预编译语句数量
+STATEMENT_CACHE = 16
+# 每个风格预设最多缓存的已编译字符串标签数量
+TEMPLATE_CAPACITY = 4096
+
+SCHEMA = '''
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE presets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    tokens INTEGER NOT NULL
+);
+CREATE TABLE tokens (
+    preset INTEGER NOT NULL,
+    token TEXT NOT NULL,
+    variant INTEGER NOT NULL,
+    text TEXT,
+    PRIMARY KEY (preset, token, variant)
+) WITHOUT ROWID;
+'''
+LOOKUP = ('SELECT variant, text FROM tokens WHERE preset = ? AND token = ? '
+          'ORDER BY variant')
+# 每个有效字符串标签仅有一行的序号为 `0` 或 `1`
+SEARCH = ('SELECT token FROM tokens WHERE preset = ? AND token >= ? AND '
+          'token < ? AND variant IN (0, 1) ORDER BY token')
+SEARCH_ALL = ('SELECT token FROM tokens WHERE preset = ? AND '
+              'variant IN (0, 1) ORDER BY token')
+
+Row = Tuple[int, Optional[str]]
+
+
+class DatabasePreset(object):
+    """
+    SQLite 数据库中的单个风格预设。
+
+    与 `preset.Preset` 提供相同的 `lookup()` 接口，字符串标签内容在查找时才从
+    数据库中读取，读取后编译的模板按字符串标签缓存。
+
+    属性：
+    - `name: str`：风格预设名称（小写）。
+    - `base: None`：数据库中的风格预设均已合并继承链。
+    - `version: int`：内容版本。数据库以只读方式打开，恒为 `0`。
+    """
+
+    __slots__ = ('name', 'base', '__database', '__id', '__count',
+                 '__templates', '__missing')
+
+    version = 0
+
+    def __init__(self, database: 'Database', name: str, preset_id: int,
+                 count: int) -> None:
+        """
+        初始化风格预设。
+
+        参数：
+        - `database: Database`：风格预设数据库。
+        - `name: str`：风格预设名称。
+        - `preset_id: int`：风格预设编号。
+        - `count: int`：有效字符串标签数量。
+        """
+        self.name = name
+        self.base = None
+        self.__database = database
+        self.__id = preset_id
+        self.__count = count
+        self.__templates: Dict[str, Entry] = {}
+        self.__missing: Dict[str, exception.TokenError] = {}
+
+    def lookup(self, token: str) -> Template:
+        """
+        查找字符串标签对应的模板。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        异常：
+        - `exception.TokenError`：字符串标签不存在于风格预设中，或其对应内容不
+          是数值、布尔值、字符串或列表。
+
+        返回：
+        - `template.Template`：标签所指示的字符串模板。特别地，当字符串标签所
+          对应的内容为列表时，则从中随机抽取值返回。
+        """
+        entry = self.__templates.get(token)
+        if entry is None:
+            entry = self.__fetch(token)
+        if entry.__class__ is tuple:
+            return random.choice(cast(Tuple[Template, ...], entry))
+        return cast(Template, entry)
+
+    def is_random(self, token: str) -> bool:
+        """
+        判断字符串标签的内容是否为列表，即每次查找时是否随机抽取。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        返回：
+        - `bool`：字符串标签的内容是否为列表。字符串标签无效时返回 `False`。
+        """
+        entry = self.__templates.get(token)
+        if entry is None:
+            try:
+                entry = self.__fetch(token)
+            except exception.TokenError:
+                return False
+        return entry.__class__ is tuple
+
+    def search(self, prefix: str = '') -> List[str]:
+        """
+        查找字符串标签层级下的全部有效字符串标签，同 `preset.Preset.search()`。
+        基于主键执行范围查询，耗时仅与匹配数量相关。
+
+        可选参数：
+        - `prefix: str`：字符串标签层级。默认为空字符串，即全部字符串标签。
+
+        返回：
+        - `List[str]`：按字典序排列的字符串标签。
+        """
+        if not prefix:
+            return self.__database.query_range(self.__id)
+
+        # `/` 为 `.` 的下一个字符，范围内还可能包括如 `help-x` 的字符串标签
+        tokens = self.__database.query_range(self.__id, prefix, prefix + '/')
+        dotted = prefix + '.'
+        return [
+            token for token in tokens
+            if token == prefix or token.startswith(dotted)
+        ]
+
+    def __fetch(self, token: str) -> Entry:
+        """
+        从数据库中读取字符串标签的内容并编译为模板。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        异常：
+        - `exception.TokenError`：字符串标签无效。
+
+        返回：
+        - `preset.Entry`：字符串模板。内容为列表时为模板元组。
+        """
+        err = self.__missing.get(token)
+        if err is not None:
+            raise err.with_traceback(None)
+
+        rows = self.__database.query(self.__id, token)
+        if not rows or rows[0][1] is None:
+            if rows:
+                message = (f'The value of the token "{token}" is not a '
+                           'numeric, boolean, string or list.')
+                err = exception.TokenError(message=message)
+            else:
+                err = exception.TokenError(token)
+            if len(self.__missing) < MISSING_CAPACITY:
+                self.__missing[token] = err
+            raise err
+
+        entry: Entry
+        if rows[0][0]:
+            entry = tuple(Template(cast(str, text)) for _, text in rows)
+        else:
+            entry = Template(cast(str, rows[0][1]))
+        if len(self.__templates) < TEMPLATE_CAPACITY:
+            self.__templates[token] = entry
+        return entry
+
+    def __len__(self) -> int:
+        return self.__count
+
+
+class Database(PresetSource):
+    """只读的 SQLite 风格预设数据库。"""
+
+    def __init__(self, path: Path) -> None:
+        """
+        打开风格预设数据库。
+
+        参数：
+        - `path: pathlib.Path`：数据库文件路径。
+
+        异常：
+        - `OSError`：数据库文件不存在。
+        - `ValueError`：文件不是有效的风格预设数据库，或格式版本不受支持。
+        """
+        import sqlite3
+
+        if not path.is_file():
+            raise FileNotFoundError(f'Preset database {path} does not exist.')
+
+        self.__path = path
+        self.__uri = path.absolute().as_uri() + '?mode=ro'
+        self.__local = threading.local()
+        self.__connections: List['sqlite3.Connection'] = []
+        self.__lock = threading.Lock()
+
+        try:
+            connection = self.__connection()
+            (version, ) = connection.execute(
+                "SELECT value FROM meta WHERE key = 'version'").fetchone()
+            rows = connection.execute(
+                'SELECT id, name, tokens FROM presets').fetchall()
+        except (sqlite3.Error, TypeError) as err:
+            self.close()
+            raise ValueError(f'{path} is not a valid preset database: {err}')
+
+        if version != str(DATABASE_VERSION):
+            self.close()
+            raise ValueError(f'Unsupported preset database version {version} '
+                             f'of {path}.')
+
+        self.__presets = {
+            name: DatabasePreset(self, name, preset_id, count)
+            for preset_id, name, count in rows
+        }
+
+    @property
+    def path(self) -> Path:
+        """数据库文件路径。"""
+        return self.__path
+
+    def names(self) -> List[str]:
+        """
+        获取数据库中的所有风格预设名称。
+
+        返回：
+        - `List[str]`：风格预设名称（小写）列表。
+        """
+        return sorted(self.__presets)
+
+    def get(self, preset: Union[str, Path]) -> DatabasePreset:
+        """
+        获取风格预设。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设名称。为预设文件路径时
+          使用其文件名（不含后缀名）作为风格预设名称。
+
+        异常：
+        - `exception.PresetFileError`：数据库中不存在指定风格预设。
+
+        返回：
+        - `DatabasePreset`：风格预设。
+        """
+        loaded = self.__presets.get(self.preset_name(preset))
+        if loaded is None:
+            message = (f'Cannot find preset "{preset}" in the preset database '
+                       f'{self.__path.absolute()}.')
+            raise exception.PresetFileError(message=message)
+        return loaded
+
+    def query(self, preset_id: int, token: str) -> List[Row]:
+        """
+        查询字符串标签的内容。
+
+        参数：
+        - `preset_id: int`：风格预设编号。
+        - `token: str`：字符串标签。
+
+        返回：
+        - `List[Tuple[int, Optional[str]]]`：按序号排列的序号与字符串内容。字
+          符串标签不存在时为空列表。
+        """
+        return self.__connection().execute(LOOKUP,
+                                           (preset_id, token)).fetchall()
+
+    def query_range(self,
+                    preset_id: int,
+                    low: Optional[str] = None,
+                    high: Optional[str] = None) -> List[str]:
+        """
+        查询字典序在给定范围内的有效字符串标签。
+
+        参数：
+        - `preset_id: int`：风格预设编号。
+
+        可选参数：
+        - `low: Optional[str]`：范围下界（包含）。
+        - `high: Optional[str]`：范围上界（不包含）。未指定范围时查询全部有效
+          字符串标签。
+
+        返回：
+        - `List[str]`：按字典序排列的字符串标签。
+        """
+        connection = self.__connection()
+        if low is None or high is None:
+            rows = connection.execute(SEARCH_ALL, (preset_id, )).fetchall()
+        else:
+            rows = connection.execute(SEARCH,
+                                      (preset_id, low, high)).fetchall()
+        return [token for token, in rows]
+
+    def close(self) -> None:
+        """关闭所有线程中的数据库连接。"""
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections.clear()
+        self.__local = threading.local()
+
+    def __connection(self) -> 'sqlite3.Connection':
+        """
+        获取当前线程的数据库连接，不存在时创建。
+
+        返回：
+        - `sqlite3.Connection`：只读的数据库连接。
+        """
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            import sqlite3
+
+            connection = sqlite3.connect(self.__uri,
+                                         uri=True,
+                                         check_same_thread=False,
+                                         cached_statements=STATEMENT_CACHE)
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.append(connection)
+        return connection
+
+
+def build_database(respath: Path,
+                   output: Path,
+                   bases: Optional[Mapping[str, str]] = None) -> List[str]:
+    """
+    将资源目录下的全部风格预设导入 SQLite 风格预设数据库。
+
+    参数：
+    - `respath: pathlib.Path`：资源目录。
+    - `output: pathlib.Path`：数据库文件路径。已存在的文件将被替换。
+
+    可选参数：
+    - `bases: Optional[Mapping[str, str]]`：风格预设名称到其基础风格预设名称
+      的映射，同插件配置 `styledstr_bases`。默认为空。
+
+    异常：
+    - `exception.PresetFileError`：风格预设的继承链存在问题。
+    - `OSError`、`yaml.YAMLError`、`json.JSONDecodeError`：无法读取预设文件
+      或预设文件内容格式错误。
+
+    返回：
+    - `List[str]`：已导入的风格预设名称列表。
+    """
+    import sqlite3
+
+    from .store import PresetStore
+
+    store = PresetStore(respath, bases)
+    names = ResourceIndex(respath).names()
+
+    tmp_file = output.with_name(output.name + '.tmp')
+    tmp_file.unlink(missing_ok=True)
+    connection = sqlite3.connect(tmp_file)
+    try:
+        connection.executescript(SCHEMA)
+        connection.execute("INSERT INTO meta VALUES ('version', ?)",
+                           (str(DATABASE_VERSION), ))
+
+        for preset_id, name in enumerate(names):
+            loaded = store.load(name)
+            if isinstance(loaded, ShardedPreset):
+                loaded = loaded.materialize()
+            assert isinstance(loaded, Preset)
+
+            connection.execute('INSERT INTO presets VALUES (?, ?, ?)',
+                               (preset_id, name, len(loaded.tokens)))
+            connection.executemany('INSERT INTO tokens VALUES (?, ?, ?, ?)',
+                                   _rows(preset_id, loaded))
+
+        connection.commit()
+    finally:
+        connection.close()
+
+    tmp_file.replace(output)
+    return names
+
+
+def _rows(preset_id: int,
+          loaded: Preset) -> List[Tuple[int, str, int, Optional[str]]]:
+    """
+    将编译后的风格预设展开为 `tokens` 表的行。
+
+    参数：
+    - `preset_id: int`：风格预设编号。
+    - `loaded: preset.Preset`：编译后的风格预设。
+
+    返回：
+    - `List[Tuple[int, str, int, Optional[str]]]`：由风格预设编号、字符串标
+      签、序号与字符串内容组成的行。
+    """
+    rows: List[Tuple[int, str, int, Optional[str]]] = []
+    for token, entry in loaded.tokens.items():
+        if isinstance(entry, tuple):
+            rows.extend((preset_id, token, variant, template.text)
+                        for variant, template in enumerate(entry, 1))
+        else:
+            rows.append((preset_id, token, 0, entry.text))
+    rows.extend((preset_id, token, -1, None) for token in loaded.invalid)
+    return rows
@@ -0,0 +1,137 @@
+"""编译后风格预设的磁盘缓存"""
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from nonebot.log import logger
+
+from .preset import Compiled, Preset, load_file
+
+# 缓存格式版本，编译结果的结构发生变化时递增
+CACHE_VERSION = 5
+
+Header = Tuple[int, str, int, int, str]
+
+
+class DiskCache(object):
+    """
+    编译后风格预设的磁盘缓存。
+
+    将展开并预编译后的风格预设序列化保存至缓存目录，重启后可跳过预设文件的解
+    析。缓存以预设文件的绝对路径为键，并记录预设文件的大小、修改时间与内容摘
+    要：大小与修改时间一致时直接使用缓存；不一致但内容摘要一致时同样视为有效。
+
+    **注意：** 缓存使用 `pickle` 序列化，请确保缓存目录仅可被受信任的用户写入。
+    """
+
+    def __init__(self,
+                 directory: Path,
+                 loader: Callable[[Path], Compiled] = load_file) -> None:
+        """
+        初始化磁盘缓存。
+
+        参数：
+        - `directory: pathlib.Path`：缓存目录，不存在时将在写入缓存时创建。
+
+        可选参数：
+        - `loader: Callable[[pathlib.Path], preset.Compiled]`：缓存未命中时使
+          用的预设文件加载函数。默认为 `preset.load_file`。
+        """
+        self.__directory = directory
+        self.__loader = loader
+
+    @property
+    def directory(self) -> Path:
+        """缓存目录。"""
+        return self.__directory
+
+    def load(self, path: Path) -> Compiled:
+        """
+        加载风格预设。缓存有效时直接反序列化缓存内容，否则读取并编译预设文件
+        后写入缓存。以目录形式存储的风格预设仅在查找时读取分片，不使用磁盘缓
+        存。
+
+        参数：
+        - `path: pathlib.Path`：预设文件的绝对路径。
+
+        异常：
+        - 同 `loader` 所抛出的异常。
+
+        返回：
+        - `preset.Compiled`：编译后的风格预设。
+        """
+        if path.is_dir():
+            return self.__loader(path)
+
+        stat = path.stat()
+        cache_file = self.__cache_file(path)
+
+        cached = self.__read(cache_file)
+        if cached is not None and cached[0][1] == str(path):
+            header, loaded = cached
+            _, _, size, mtime, digest = header
+
+            if (size, mtime) == (stat.st_size, stat.st_mtime_ns):
+                return loaded
+            if digest == self.__digest(path):
+                header = (CACHE_VERSION, str(path), stat.st_size,
+                          stat.st_mtime_ns, digest)
+                self.__write(cache_file, header, loaded)
+                return loaded
+
+        digest = self.__digest(path)
+        loaded = self.__loader(path)
+        header = (CACHE_VERSION, str(path), stat.st_size, stat.st_mtime_ns,
+                  digest)
+        self.__write(cache_file, header, loaded)
+        return loaded
+
+    def clear(self) -> None:
+        """删除缓存目录下的所有缓存文件。"""
+        if not self.__directory.is_dir():
+            return
+        for file in self.__directory.glob('*.pickle'):
+            file.unlink()
+
+    def __cache_file(self, path: Path) -> Path:
+        name = hashlib.sha1(str(path).encode()).hexdigest()
+        return self.__directory / f'{name}.pickle'
+
+    @staticmethod
+    def __digest(path: Path) -> str:
+        with path.open('rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def __read(cache_file: Path) -> Optional[Tuple[Header, Preset]]:
+        """读取缓存文件。缓存不存在、格式版本不一致或已损坏时返回 `None`。"""
+        try:
+            with cache_file.open('rb') as f:
+                header = pickle.load(f)
+                if header[0] != CACHE_VERSION:
+                    return None
+                return header, pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            logger.warning(f'Ignored broken preset cache {cache_file}: {err}')
+            return None
+
+    def __write(self, cache_file: Path, header: Header,
+                loaded: Preset) -> None:
+        """原子地写入缓存文件。写入失败时仅输出日志。"""
+        tmp = None
+        try:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.__directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(loaded, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        except OSError as err:
+            logger.warning(f'Failed to write preset cache {cache_file}: {err}')
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
@@ -0,0 +1,145 @@
+"""资源目录索引"""
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 风格预设文件后缀名，同名预设按 .json > .yaml > .yml 的优先级选取
+PRESET_SUFFIXES = ('.json', '.yaml', '.yml')
+
+
+class ResourceIndex(object):
+    """
+    资源目录索引。
+
+    建立风格预设名称（小写）到预设文件的映射，仅当资源目录的修改时间发生变化
+    时才会重新扫描目录。包含预设文件的子目录视为以目录形式存储的风格预设，
+    名称为目录名。映射中的路径在扫描时即解析为绝对路径，查找时无需再访问文件
+    系统。
+    """
+
+    def __init__(self, respath: Path) -> None:
+        """
+        初始化索引。
+
+        参数：
+        - `respath: pathlib.Path`：资源目录路径。
+        """
+        self.__respath = respath
+        self.__mtime: Optional[int] = None
+        self.__files: Dict[str, Path] = {}
+        self.__shadowed: Dict[str, List[Path]] = {}
+
+    @property
+    def respath(self) -> Path:
+        """资源目录路径。"""
+        return self.__respath
+
+    def lookup(self, name: str, refresh: bool = True) -> Optional[Path]:
+        """
+        根据风格预设名称查找预设文件。
+
+        参数：
+        - `name: str`：风格预设名称，对大小写不敏感。
+        - `refresh: bool`：查找前是否检查资源目录的修改时间。为 `False` 时仅
+          在索引尚未建立时扫描资源目录。默认为 `True`。
+
+        返回：
+        - `Optional[pathlib.Path]`：预设文件的绝对路径（已解析符号链接）。不
+          存在时返回 `None`。
+        """
+        if refresh or self.__mtime is None:
+            self.refresh()
+        return self.__files.get(name.lower())
+
+    def names(self) -> List[str]:
+        """
+        获取资源目录下所有风格预设名称。
+
+        返回：
+        - `List[str]`：风格预设名称（小写）列表。
+        """
+        self.refresh()
+        return sorted(self.__files)
+
+    def shadowed(self) -> Dict[str, List[Path]]:
+        """
+        获取因同名而被忽略的预设文件与目录。
+
+        返回：
+        - `Dict[str, List[pathlib.Path]]`：风格预设名称（小写）到被忽略的预设
+          文件与目录的映射。
+        """
+        self.refresh()
+        return {name: list(paths) for name, paths in self.__shadowed.items()}
+
+    def stale(self) -> bool:
+        """
+        检查索引是否需要重建。
+
+        返回：
+        - `bool`：索引尚未建立或资源目录的修改时间已发生变化。
+        """
+        try:
+            return self.__respath.stat().st_mtime_ns != self.__mtime
+        except OSError:
+            return True
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        检查资源目录的修改时间，必要时重建索引。
+
+        参数：
+        - `force: bool`：是否强制重建索引。默认为 `False`。
+
+        返回：
+        - `bool`：索引是否被重建。
+        """
+        try:
+            mtime = self.__respath.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if not force and mtime == self.__mtime and self.__mtime is not None:
+            return False
+
+        candidates: Dict[str, List[Path]] = {}
+        directories: Dict[str, Path] = {}
+        if mtime is not None:
+            for file in self.__respath.iterdir():
+                if file.suffix.lower() in PRESET_SUFFIXES:
+                    candidates.setdefault(file.stem.lower(), []).append(file)
+                elif file.is_dir() and self.__sharded(file):
+                    directories[file.name.lower()] = file
+
+        # 同名的预设文件优先于以目录形式存储的风格预设
+        files = {
+            **directories,
+            **{name: min(files)
+               for name, files in candidates.items()}
+        }
+        self.__files = {name: path.resolve() for name, path in files.items()}
+        self.__shadowed = {}
+        for name, files in candidates.items():
+            ignored = sorted(file for file in files if file != min(files))
+            if name in directories:
+                ignored.append(directories[name])
+            if ignored:
+                self.__shadowed[name] = ignored
+        self.__mtime = mtime
+        return True
+
+    @staticmethod
+    def __sharded(directory: Path) -> bool:
+        """
+        检查目录是否为以目录形式存储的风格预设，即其中包含预设文件。
+
+        参数：
+        - `directory: pathlib.Path`：目录路径。
+
+        返回：
+        - `bool`：目录中是否包含预设文件。
+        """
+        try:
+            return any(file.suffix.lower() in PRESET_SUFFIXES
+                       for file in directory.iterdir())
+        except OSError:
+            return False
@@ -0,0 +1,153 @@
+"""解析器运行指标"""
+import bisect
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+# 延迟直方图的桶上界（秒）
+BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1,
+           0.5, 1.0, float('inf'))
+
+COUNTERS = ('parses', 'preset_loads', 'cache_hits', 'cache_misses',
+            'token_errors', 'preset_errors')
+HISTOGRAMS = ('load', 'lookup', 'render')
+
+Hook = Callable[[str, str, float], None]
+
+
+class Histogram(object):
+    """
+    固定分桶的延迟直方图。
+
+    属性：
+    - `counts: List[int]`：各桶的计数，桶上界见 `BUCKETS`。
+    - `count: int`：观测次数。
+    - `total: float`：观测值总和（秒）。
+    """
+
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        记录一次观测。
+
+        参数：
+        - `seconds: float`：耗时（秒）。
+        """
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取直方图快照。
+
+        返回：
+        - `Dict[str, Any]`：包括观测次数 `count`、总耗时 `sum`、平均耗时
+          `mean` 与各桶上界及计数组成的 `buckets`。
+        """
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'buckets': list(zip(BUCKETS, self.counts))
+        }
+
+
+class Metrics(object):
+    """
+    解析器运行指标。
+
+    记录解析、预设加载、缓存命中与异常次数的计数器，加载、查找与替换占位符的
+    延迟直方图，以及各风格预设与字符串标签的命中次数。可通过钩子函数将每次记
+    录转发至外部指标系统，钩子函数的参数依次为指标类型（`counter` 或
+    `histogram`）、指标名称与数值。
+    """
+
+    def __init__(self, hook: Optional[Hook] = None) -> None:
+        """
+        初始化运行指标。
+
+        可选参数：
+        - `hook: Callable[[str, str, float], None]`：钩子函数。
+        """
+        self.hook = hook
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """重置所有指标。"""
+        with self.__lock:
+            self.__counters = Counter({name: 0 for name in COUNTERS})
+            self.__histograms = {name: Histogram() for name in HISTOGRAMS}
+            self.__presets: Counter = Counter()
+            self.__tokens: Counter = Counter()
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """
+        增加计数器的值。
+
+        参数：
+        - `name: str`：计数器名称。
+        - `value: int`：增加的值。默认为 `1`。
+        """
+        with self.__lock:
+            self.__counters[name] += value
+        if self.hook is not None:
+            self.hook('counter', name, value)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        记录一次延迟观测。
+
+        参数：
+        - `name: str`：直方图名称。
+        - `seconds: float`：耗时（秒）。
+        """
+        with self.__lock:
+            self.__histograms[name].observe(seconds)
+        if self.hook is not None:
+            self.hook('histogram', name, seconds)
+
+    def hit(self, preset: str, token: str) -> None:
+        """
+        记录一次字符串标签解析。
+
+        参数：
+        - `preset: str`：风格预设。
+        - `token: str`：字符串标签。
+        """
+        with self.__lock:
+            self.__counters['parses'] += 1
+            self.__presets[preset] += 1
+            self.__tokens[token] += 1
+        if self.hook is not None:
+            self.hook('counter', 'parses', 1)
+
+    def snapshot(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        获取指标快照。
+
+        可选参数：
+        - `top: Optional[int]`：仅返回命中次数最多的风格预设与字符串标签的数
+          量。默认返回全部。
+
+        返回：
+        - `Dict[str, Any]`：由 `counters`、`histograms`、`presets` 与
+          `tokens` 组成的快照。
+        """
+        with self.__lock:
+            return {
+                'counters': dict(self.__counters),
+                'histograms': {
+                    name: histogram.snapshot()
+                    for name, histogram in self.__histograms.items()
+                },
+                'presets': self.__presets.most_common(top),
+                'tokens': self.__tokens.most_common(top)
+            }
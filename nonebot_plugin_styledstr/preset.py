@@ -0,0 +1,762 @@
+"""编译后的风格预设"""
+import bisect
+import random
+import re
+import threading
+from pathlib import Path
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Set, Tuple,
+                    Type, Union)
+
+from . import exception
+from .template import Template
+
+# 声明基础风格预设的保留键
+BASE_KEY = '__base__'
+
+# 对其他字符串标签的引用，如 `${common.bot_name}`，在编译时替换为其内容
+REFERENCE = re.compile(r'\$\{([^${}\s]+)\}')
+
+Entry = Union[Template, Tuple[Template, ...]]
+Raw = Union[str, Tuple[str, ...]]
+State = Tuple[Dict[str, Entry], Set[str], Optional[str], Dict[str, Raw]]
+# 查找不在风格预设中的被引用字符串标签所在的风格预设
+External = Callable[[str], Optional['Preset']]
+
+# 每个风格预设最多缓存的无效字符串标签数量
+MISSING_CAPACITY = 1024
+
+# 分片文件后缀名，同名分片按 .json > .yaml > .yml 的优先级选取
+SHARD_SUFFIXES = ('.json', '.yaml', '.yml')
+
+
+class Preset(object):
+    """
+    编译后的风格预设。
+
+    加载时将嵌套的预设内容展开为以点记法字符串标签为键的扁平索引，字符串标签
+    内容预先编译为模板，列表内容则编译为模板元组。
+
+    属性：
+    - `tokens: Dict[str, Union[template.Template, Tuple[template.Template,
+      ...]]]`：字符串标签索引。
+    - `invalid: Set[str]`：对应内容不是数值、布尔值、字符串或非空列表的字符串
+      标签。
+    - `missing: Dict[str, exception.TokenError]`：已知无效的字符串标签及其异
+      常。
+    - `base: Optional[str]`：预设文件中以顶层键 `__base__` 声明的基础风格预
+      设。
+    - `references: Dict[str, Union[str, Tuple[str, ...]]]`：内容中引用了其他
+      字符串标签的字符串标签及其原始内容，用于合并继承链后重新替换引用。
+    - `version: int`：内容版本。编译后的风格预设不会被修改，恒为 `0`。
+    """
+
+    __slots__ = ('tokens', 'invalid', 'missing', 'base', 'references',
+                 '__keys', '__weakref__')
+
+    version = 0
+
+    def __init__(self, contents: Any, link: bool = True) -> None:
+        """
+        编译风格预设。
+
+        参数：
+        - `contents: Any`：风格预设文件内容。
+
+        可选参数：
+        - `link: bool`：是否在编译后替换对其他字符串标签的引用。默认为
+          `True`。
+
+        异常：
+        - `exception.PresetFileError`：字符串标签之间存在循环引用。
+        """
+        self.tokens: Dict[str, Entry] = {}
+        self.invalid: Set[str] = set()
+        self.missing: Dict[str, exception.TokenError] = {}
+        self.base: Optional[str] = None
+        self.references: Dict[str, Raw] = {}
+        # 有序的字符串标签索引，首次按前缀查找时建立
+        self.__keys: Optional[List[str]] = None
+
+        if not isinstance(contents, dict):
+            return
+
+        if isinstance(base := contents.get(BASE_KEY), str):
+            self.base = base
+
+        stack = [('', contents)]
+        while stack:
+            prefix, node = stack.pop()
+            for key, val in node.items():
+                if not isinstance(key, str):
+                    continue
+                if not prefix and key == BASE_KEY:
+                    continue
+
+                token = prefix + key
+                if isinstance(val, (str, int, float, bool)):
+                    self.tokens[token] = Template(str(val))
+                    if isinstance(val, str) and '${' in val:
+                        self.references[token] = val
+                elif isinstance(val, list) and val:
+                    items = tuple(str(item) for item in val)
+                    self.tokens[token] = tuple(
+                        Template(item) for item in items)
+                    if any('${' in item for item in items):
+                        self.references[token] = items
+                else:
+                    self.invalid.add(token)
+                    if isinstance(val, dict):
+                        stack.append((token + '.', val))
+
+        if link and self.references:
+            self.link()
+
+    @classmethod
+    def merge(cls, overlay: 'Preset', base: 'Preset') -> 'Preset':
+        """
+        合并风格预设，结果与逐层合并预设内容后再编译一致：覆盖预设中的字符串
+        标签优先于基础预设；覆盖预设中为非字符串内容（如嵌套层级）的字符串标
+        签将屏蔽基础预设中的同名字符串标签，为字符串内容的字符串标签将屏蔽基
+        础预设中其下层级的字符串标签。
+
+        参数：
+        - `overlay: Preset`：覆盖风格预设。
+        - `base: Preset`：基础风格预设。
+
+        返回：
+        - `Preset`：合并后的风格预设。
+        """
+
+        def shadowed(token: str) -> bool:
+            if token in overlay.invalid:
+                return True
+            index = token.find('.')
+            while index != -1:
+                if token[:index] in overlay.tokens:
+                    return True
+                index = token.find('.', index + 1)
+            return False
+
+        merged = cls(None)
+        merged.tokens = {
+            token: entry
+            for token, entry in base.tokens.items()
+            if not shadowed(token)
+        }
+        merged.tokens.update(overlay.tokens)
+        invalid = base.invalid | overlay.invalid
+        merged.invalid = invalid - merged.tokens.keys()
+
+        # 基础预设中的引用可能指向覆盖预设中的字符串标签，需重新替换
+        merged.references = {
+            token: raw
+            for token, raw in base.references.items()
+            if token in merged.tokens and token not in overlay.tokens
+        }
+        merged.references.update(overlay.references)
+        if merged.references:
+            merged.link()
+        return merged
+
+    def link(self, external: Optional[External] = None) -> None:
+        """
+        将内容中形如 `${common.bot_name}` 的引用替换为被引用字符串标签的内容，
+        被引用的内容中的引用同样会被替换。被引用的字符串标签不存在、内容无效
+        或内容为列表时保留引用原文。
+
+        可选参数：
+        - `external: Optional[Callable[[str], Optional[Preset]]]`：查找不在
+          该风格预设中的字符串标签所在的风格预设，如以目录形式存储的风格预设
+          中的其他分片。默认为 `None`。
+
+        异常：
+        - `exception.PresetFileError`：字符串标签之间存在循环引用。
+        """
+        texts: Dict[str, Optional[str]] = {}
+
+        def expand(raw: str, chain: Tuple[str, ...]) -> str:
+
+            def replace(match: 're.Match[str]') -> str:
+                text = resolve(match.group(1), chain)
+                return match.group(0) if text is None else text
+
+            return REFERENCE.sub(replace, raw)
+
+        def resolve(token: str, chain: Tuple[str, ...]) -> Optional[str]:
+            if token in texts:
+                return texts[token]
+            if token in chain:
+                cycle = (*chain[chain.index(token):], token)
+                message = ('Circular token reference detected: '
+                           f'{" -> ".join(cycle)}.')
+                raise exception.PresetFileError(message=message)
+
+            owner = self if token in self.tokens else (
+                external(token) if external is not None else None)
+            if owner is None:
+                return None
+
+            raw = owner.references.get(token)
+            entry = owner.tokens.get(token)
+            if raw.__class__ is str:
+                text = expand(raw, (*chain, token))
+            elif raw is None and entry.__class__ is Template:
+                text = entry.text
+            else:
+                text = None
+            texts[token] = text
+            return text
+
+        for token, raw in self.references.items():
+            if raw.__class__ is tuple:
+                self.tokens[token] = tuple(
+                    Template(expand(item, (token, ))) for item in raw)
+            else:
+                text = resolve(token, ())
+                self.tokens[token] = Template(raw if text is None else text)
+
+    def lookup(self, token: str) -> Template:
+        """
+        查找字符串标签对应的模板。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        异常：
+        - `exception.TokenError`：字符串标签不存在于风格预设中，或其对应内容不
+          是数值、布尔值、字符串或列表。
+
+        返回：
+        - `template.Template`：标签所指示的字符串模板。特别地，当字符串标签所
+          对应的内容为列表时，则从中随机抽取值返回。
+        """
+        entry = self.tokens.get(token)
+
+        if entry is None:
+            # 复用的异常对象需清除上一次抛出时的调用栈
+            raise self.__missing(token).with_traceback(None)
+
+        if entry.__class__ is tuple:
+            return random.choice(entry)
+        return entry
+
+    def is_random(self, token: str) -> bool:
+        """
+        判断字符串标签的内容是否为列表，即每次查找时是否随机抽取。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        返回：
+        - `bool`：字符串标签的内容是否为列表。字符串标签无效时返回 `False`。
+        """
+        return self.tokens.get(token).__class__ is tuple
+
+    def search(self, prefix: str = '') -> List[str]:
+        """
+        查找字符串标签层级下的全部有效字符串标签。首次查找时建立有序索引，之
+        后每次查找的耗时仅与匹配数量相关。
+
+        可选参数：
+        - `prefix: str`：字符串标签层级，如 `help.commands`。默认为空字符串，
+          即全部字符串标签。
+
+        返回：
+        - `List[str]`：按字典序排列的字符串标签，包括 `prefix` 本身（如果其
+          为有效字符串标签）。
+        """
+        keys = self.__keys
+        if keys is None:
+            keys = self.__keys = sorted(self.tokens)
+        return search_sorted(keys, prefix)
+
+    def __missing(self, token: str) -> exception.TokenError:
+        """
+        获取无效字符串标签所对应的异常。已知无效的字符串标签直接返回缓存的异
+        常。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        返回：
+        - `exception.TokenError`：字符串标签异常。
+        """
+        err = self.missing.get(token)
+        if err is not None:
+            return err
+
+        if token in self.invalid:
+            message = (f'The value of the token "{token}" is not a '
+                       'numeric, boolean, string or list.')
+            err = exception.TokenError(message=message)
+        else:
+            err = exception.TokenError(token)
+
+        if len(self.missing) < MISSING_CAPACITY:
+            self.missing[token] = err
+        return err
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __getstate__(self) -> State:
+        # 无效字符串标签的异常缓存不参与序列化
+        return self.tokens, self.invalid, self.base, self.references
+
+    def __setstate__(self, state: State) -> None:
+        self.tokens, self.invalid, self.base, self.references = state
+        self.missing = {}
+        self.__keys = None
+
+
+class ShardedPreset(object):
+    """
+    以目录形式存储的风格预设。
+
+    目录下的每个预设文件为一个分片，对应以文件名（不含后缀名）为名称的顶层字
+    符串标签层级，如 `default/help.yaml` 中的 `prompt` 对应字符串标签
+    `help.prompt`。分片仅在其中的字符串标签首次被查找时才读取与编译，其中对
+    其他分片中字符串标签的引用将读取被引用的分片。
+
+    属性：
+    - `path: pathlib.Path`：风格预设目录。
+    - `shards: Dict[str, pathlib.Path]`：顶层字符串标签到分片文件的映射。
+    - `base: None`：目录形式的风格预设仅可在插件配置中声明基础风格预设。
+    - `version: int`：内容版本，每次有分片因发生变化被移除时递增。
+    - `verify: bool`：查找时是否检查字符串标签所在的分片文件是否发生变化。由
+      热重载监视器通过 `refresh()` 检查时应为 `False`。默认为 `True`。
+    """
+
+    __slots__ = ('path', 'shards', 'base', 'version', 'verify', '__loaded',
+                 '__pending', '__missing', '__failed', '__lock', '__weakref__')
+
+    def __init__(self, path: Path) -> None:
+        """
+        扫描风格预设目录。
+
+        参数：
+        - `path: pathlib.Path`：风格预设目录。
+
+        异常：
+        - `OSError`：无法读取目录。
+        """
+        candidates: Dict[str, List[Path]] = {}
+        for file in path.iterdir():
+            if file.suffix.lower() in SHARD_SUFFIXES:
+                candidates.setdefault(file.stem, []).append(file)
+
+        self.path = path
+        self.shards = {
+            section: min(files)
+            for section, files in candidates.items()
+        }
+        self.base = None
+        self.version = 0
+        self.verify = True
+        # 顶层字符串标签 -> (分片文件状态, 编译后的分片)
+        self.__loaded: Dict[str, Tuple[Tuple[int, int], Preset]] = {}
+        # 因被其他分片引用而读取、尚未替换引用的分片
+        self.__pending: Dict[str, Tuple[Tuple[int, int], Preset]] = {}
+        self.__missing: Dict[str, exception.TokenError] = {}
+        # 预先读取失败的分片 -> 下一次查找时抛出的异常
+        self.__failed: Dict[str, exception.TokenError] = {}
+        # 多个线程同时查找同一未读取的分片时仅读取一次
+        self.__lock = threading.Lock()
+
+    def lookup(self, token: str) -> Template:
+        """
+        查找字符串标签对应的模板，必要时读取其所在的分片。`verify` 为 `True`
+        时仅检查该分片文件是否发生变化。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        异常：
+        - `exception.TokenError`：字符串标签不存在于风格预设中，其对应内容不是
+          数值、布尔值、字符串或列表，或其所在的分片无法读取。
+
+        返回：
+        - `template.Template`：标签所指示的字符串模板。
+        """
+        section = token.split('.', 1)[0]
+        loaded = self.__loaded.get(section)
+        if loaded is not None and self.verify:
+            loaded = self.__verify(section, loaded)
+        if loaded is None:
+            if section not in self.shards:
+                err = self.__missing.get(token)
+                if err is None:
+                    err = exception.TokenError(token)
+                    if len(self.__missing) < MISSING_CAPACITY:
+                        self.__missing[token] = err
+                raise err.with_traceback(None)
+            with self.__lock:
+                loaded = self.__loaded.get(section) or self.__load(section)
+
+        return loaded[1].lookup(token)
+
+    def is_random(self, token: str) -> bool:
+        """
+        判断字符串标签的内容是否为列表，即每次查找时是否随机抽取。
+
+        参数：
+        - `token: str`：字符串标签。
+
+        返回：
+        - `bool`：字符串标签的内容是否为列表。所在分片尚未读取时无法确定，返
+          回 `True`。
+        """
+        loaded = self.__loaded.get(token.split('.', 1)[0])
+        return loaded is None or loaded[1].is_random(token)
+
+    def search(self, prefix: str = '') -> List[str]:
+        """
+        查找字符串标签层级下的全部有效字符串标签，仅读取 `prefix` 所在的分
+        片。
+
+        可选参数：
+        - `prefix: str`：字符串标签层级。默认为空字符串，即全部字符串标签，
+          此时读取全部分片。
+
+        异常：
+        - `exception.TokenError`：分片无法读取。
+
+        返回：
+        - `List[str]`：按字典序排列的字符串标签。
+        """
+        if not prefix:
+            return sorted(token for section in self.shards
+                          for token in self.__shard(section).search())
+
+        section = prefix.split('.', 1)[0]
+        if section not in self.shards:
+            return []
+        return self.__shard(section).search(prefix)
+
+    def unloaded(self, tokens: Iterable[str]) -> List[str]:
+        """
+        获取字符串标签所在的、尚未读取的分片。
+
+        参数：
+        - `tokens: Iterable[str]`：字符串标签或字符串标签层级。空字符串表示全
+          部字符串标签。
+
+        返回：
+        - `List[str]`：尚未读取的分片所对应的顶层字符串标签。
+        """
+        sections: Set[str] = set()
+        for token in tokens:
+            if token:
+                sections.add(token.split('.', 1)[0])
+            else:
+                sections.update(self.shards)
+        return sorted(
+            section for section in sections
+            if section in self.shards and section not in self.__loaded)
+
+    def preload(self, sections: Iterable[str]) -> None:
+        """
+        读取并编译分片，使之后的查找不再读取文件。用于在线程池中预先读取分
+        片，分片无法读取时不抛出异常，而是在下一次查找该分片时抛出。
+
+        参数：
+        - `sections: Iterable[str]`：分片所对应的顶层字符串标签。
+        """
+        for section in sections:
+            self.__failed.pop(section, None)
+            try:
+                self.__shard(section)
+            except exception.TokenError as err:
+                self.__failed[section] = err
+
+    def refresh(self) -> List[str]:
+        """
+        检查已读取的分片文件，移除已发生变化的分片，使其在下一次查找时重新读
+        取。
+
+        返回：
+        - `List[str]`：被移除的分片所对应的顶层字符串标签。
+        """
+        changed = [
+            section for section, (state, _) in list(self.__loaded.items())
+            if self.__state(section) != state
+        ]
+        if not changed:
+            return []
+        with self.__lock:
+            return self.__drop(changed)
+
+    def materialize(self) -> Preset:
+        """
+        读取全部分片并合并为单个风格预设。
+
+        异常：
+        - `exception.TokenError`：分片无法读取。
+
+        返回：
+        - `Preset`：编译后的风格预设。
+        """
+        merged = Preset(None)
+        for section in sorted(self.shards):
+            loaded = self.__shard(section)
+            merged.tokens.update(loaded.tokens)
+            merged.invalid.update(loaded.invalid)
+            merged.references.update(loaded.references)
+        return merged
+
+    def __shard(self, section: str) -> Preset:
+        """
+        获取编译后的分片，必要时读取。
+
+        参数：
+        - `section: str`：顶层字符串标签。
+
+        异常：
+        - `exception.TokenError`：分片无法读取。
+
+        返回：
+        - `Preset`：编译后的分片。
+        """
+        loaded = self.__loaded.get(section)
+        if loaded is not None and self.verify:
+            loaded = self.__verify(section, loaded)
+        if loaded is None:
+            with self.__lock:
+                loaded = self.__loaded.get(section) or self.__load(section)
+        return loaded[1]
+
+    def __verify(
+        self, section: str, loaded: Tuple[Tuple[int, int], Preset]
+    ) -> Optional[Tuple[Tuple[int, int], Preset]]:
+        """
+        检查已读取的分片文件是否发生变化，发生变化时移除该分片。
+
+        参数：
+        - `section: str`：顶层字符串标签。
+        - `loaded: Tuple[Tuple[int, int], Preset]`：已读取的分片。
+
+        返回：
+        - `Optional[Tuple[Tuple[int, int], Preset]]`：分片未发生变化时返回
+          `loaded`，否则返回 `None`。
+        """
+        if self.__state(section) == loaded[0]:
+            return loaded
+        with self.__lock:
+            # 等待期间其他调用方可能已重新读取该分片
+            if self.__loaded.get(section) is loaded:
+                self.__drop([section])
+        return None
+
+    def __drop(self, changed: List[str]) -> List[str]:
+        """
+        移除已发生变化的分片与引用了其他分片的分片。需在持有锁时调用。
+
+        参数：
+        - `changed: List[str]`：已发生变化的分片所对应的顶层字符串标签。
+
+        返回：
+        - `List[str]`：被移除的分片所对应的顶层字符串标签。
+        """
+        dropped = [
+            section for section in changed
+            if self.__loaded.pop(section, None) is not None
+        ]
+        if not dropped:
+            return []
+
+        # 引用了其他分片的分片可能包含已变化的内容
+        for section, (_, loaded) in list(self.__loaded.items()):
+            if loaded.references:
+                self.__loaded.pop(section, None)
+                dropped.append(section)
+        self.__pending.clear()
+        self.version += 1
+        return dropped
+
+    def __state(self, section: str) -> Optional[Tuple[int, int]]:
+        """
+        获取分片文件的大小与修改时间。
+
+        参数：
+        - `section: str`：顶层字符串标签。
+
+        返回：
+        - `Optional[Tuple[int, int]]`：分片文件的大小与修改时间。无法读取文件
+          状态时返回 `None`。
+        """
+        try:
+            stat = self.shards[section].stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def __load(self, section: str) -> Tuple[Tuple[int, int], Preset]:
+        """
+        读取并编译分片，替换其中的引用。需在持有锁时调用。
+
+        参数：
+        - `section: str`：顶层字符串标签。
+
+        异常：
+        - `exception.TokenError`：分片无法读取，或字符串标签之间存在循环引
+          用。
+
+        返回：
+        - `Tuple[Tuple[int, int], Preset]`：分片文件的大小与修改时间，以及编
+          译后的分片。
+        """
+        err = self.__failed.pop(section, None)
+        if err is not None:
+            raise err.with_traceback(None)
+
+        loaded = self.__pending.pop(section, None) or self.__read(section)
+        if loaded[1].references:
+            try:
+                loaded[1].link(self.__external)
+            except exception.PresetFileError as err:
+                message = (f'Failed to load preset shard '
+                           f'{self.shards[section].name} of {self.path.name}: '
+                           f'{err.message}')
+                raise exception.TokenError(message=message)
+
+        self.__loaded[section] = loaded
+        return loaded
+
+    def __read(self, section: str) -> Tuple[Tuple[int, int], Preset]:
+        """
+        读取并编译分片，不替换其中的引用。
+
+        参数：
+        - `section: str`：顶层字符串标签。
+
+        异常：
+        - `exception.TokenError`：分片无法读取。
+
+        返回：
+        - `Tuple[Tuple[int, int], Preset]`：分片文件的大小与修改时间，以及编
+          译后的分片。
+        """
+        shard = self.shards[section]
+        try:
+            stat = shard.stat()
+            contents = _read(shard)
+        except read_errors() as err:
+            message = (f'Failed to load preset shard {shard.name} of '
+                       f'{self.path.name}: {err}')
+            raise exception.TokenError(message=message)
+
+        state = (stat.st_size, stat.st_mtime_ns)
+        return state, Preset({section: contents}, link=False)
+
+    def __external(self, token: str) -> Optional[Preset]:
+        """
+        查找被引用的字符串标签所在的分片，必要时读取该分片。需在持有锁时调
+        用。
+
+        参数：
+        - `token: str`：被引用的字符串标签。
+
+        返回：
+        - `Optional[Preset]`：编译后的分片。分片不存在或无法读取时返回
+          `None`。
+        """
+        section = token.split('.', 1)[0]
+        if section not in self.shards:
+            return None
+
+        loaded = self.__loaded.get(section) or self.__pending.get(section)
+        if loaded is None:
+            try:
+                loaded = self.__pending[section] = self.__read(section)
+            except exception.TokenError:
+                return None
+        return loaded[1]
+
+    def __len__(self) -> int:
+        return sum(len(loaded) for _, loaded in self.__loaded.values())
+
+
+# 由预设文件或目录编译得到的风格预设
+Compiled = Union[Preset, ShardedPreset]
+
+
+def load_file(path: Path) -> Compiled:
+    """
+    读取并编译风格预设文件。
+
+    参数：
+    - `path: pathlib.Path`：预设文件路径。为目录时视为以目录形式存储的风格预
+      设，仅扫描其中的分片文件。
+
+    异常：
+    - `OSError`：无法读取预设文件。
+    - `yaml.YAMLError`、`json.JSONDecodeError`：预设文件内容格式错误。
+
+    返回：
+    - `Union[Preset, ShardedPreset]`：编译后的风格预设。
+    """
+    if path.is_dir():
+        return ShardedPreset(path)
+    return Preset(_read(path))
+
+
+def _read(path: Path) -> Any:
+    """
+    读取风格预设文件内容。
+
+    参数：
+    - `path: pathlib.Path`：预设文件路径。
+
+    异常：
+    - `OSError`：无法读取预设文件。
+    - `yaml.YAMLError`、`json.JSONDecodeError`：预设文件内容格式错误。
+
+    返回：
+    - `Any`：预设文件内容。
+    """
+    # 导入 yaml 的开销较大，仅在首次读取预设文件时导入
+    with path.open() as f:
+        if path.suffix.lower() in ('.yaml', '.yml'):
+            import yaml
+
+            # 优先使用 libyaml 提供的加载器
+            loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+            return yaml.load(f, Loader=loader)
+
+        import json
+        return json.load(f)
+
+
+def search_sorted(keys: List[str], prefix: str) -> List[str]:
+    """
+    在有序的字符串标签列表中查找字符串标签层级下的全部字符串标签。
+
+    参数：
+    - `keys: List[str]`：按字典序排列的字符串标签。
+    - `prefix: str`：字符串标签层级。为空字符串时返回全部字符串标签。
+
+    返回：
+    - `List[str]`：`prefix` 本身（如果存在）及以 `prefix.` 开头的字符串标签。
+    """
+    if not prefix:
+        return list(keys)
+
+    index = bisect.bisect_left(keys, prefix)
+    matches = [prefix] if index < len(keys) and keys[index] == prefix else []
+    # `/` 为 `.` 的下一个字符，以 `prefix.` 开头的字符串标签均在此范围内
+    start = bisect.bisect_left(keys, prefix + '.', index)
+    end = bisect.bisect_left(keys, prefix + '/', start)
+    return matches + keys[start:end]
+
+
+def read_errors() -> Tuple[Type[Exception], ...]:
+    """
+    获取读取预设文件时可能抛出的异常类型，用于 `except` 子句。`except` 子句中
+    的表达式仅在异常发生时才被求值，因此不会提前导入 yaml。
+
+    返回：
+    - `Tuple[Type[Exception], ...]`：`OSError`、`ValueError`（包括
+      `json.JSONDecodeError`）与 `yaml.YAMLError`。
+    """
+    import yaml
+    return OSError, ValueError, yaml.YAMLError
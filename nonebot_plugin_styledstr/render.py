@@ -0,0 +1,137 @@
+"""解析结果缓存"""
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional
+
+from .template import is_async
+
+
+class RenderCache(object):
+    """
+    解析结果缓存。
+
+    以编译后的风格预设对象（的弱引用）及其版本、字符串标签与占位符替换内容作
+    为键缓存解析结果。风格预设重新加载后为新的对象，旧的缓存条目不会再被命中，
+    也不会使旧的风格预设无法释放，并随最近最少使用（LRU）淘汰。内容为列表的字
+    符串标签每次随机抽取，不会被缓存。
+
+    属性：
+    - `hits: int`：缓存命中次数。
+    - `misses: int`：缓存未命中次数。
+    - `skips: int`：无法缓存的解析次数，如替换内容为可调用对象或不可散列，或
+      字符串标签的内容为列表。
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        初始化缓存。
+
+        参数：
+        - `capacity: int`：最多缓存的解析结果数量，应为正整数。
+        """
+        self.__entries: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self.__capacity = capacity
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skips = 0
+
+    def key(self, loaded: Any, token: str,
+            placeholders: Mapping[str, Any]) -> Optional[Hashable]:
+        """
+        生成缓存键。
+
+        参数：
+        - `loaded: Any`：编译后的风格预设。
+        - `token: str`：字符串标签。
+        - `placeholders: Mapping[str, Any]`：占位符及替换内容。
+
+        返回：
+        - `Optional[Hashable]`：缓存键。替换内容包括可调用对象、可等待对象或
+          不可散列的对象时返回 `None`。
+        """
+        try:
+            # 替换内容的类型参与比较，避免 `1` 与 `True` 等相等的值互相命中
+            frozen = frozenset((name, value.__class__, value)
+                               for name, value in placeholders.items()
+                               if not (callable(value) or is_async(value)))
+        except TypeError:
+            frozen = None
+
+        if frozen is None or len(frozen) != len(placeholders):
+            self.skip()
+            return None
+
+        try:
+            ref = weakref.ref(loaded)
+        # 不支持弱引用的风格预设（如其他风格预设来源提供的）不会被重新加载
+        except TypeError:
+            ref = loaded
+        return ref, loaded.version, token, frozen
+
+    def skip(self) -> None:
+        """记录一次无法缓存的解析。"""
+        with self.__lock:
+            self.skips += 1
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        获取缓存的解析结果。
+
+        参数：
+        - `key: Hashable`：缓存键。
+
+        返回：
+        - `Optional[str]`：解析结果。缓存不存在时返回 `None`。
+        """
+        with self.__lock:
+            result = self.__entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Hashable, result: str) -> None:
+        """
+        写入缓存，超出容量时淘汰最近最少使用的解析结果。
+
+        参数：
+        - `key: Hashable`：缓存键。
+        - `result: str`：解析结果。
+        """
+        with self.__lock:
+            self.__entries[key] = result
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__capacity:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存，命中统计不受影响。"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计。
+
+        返回：
+        - `Dict[str, Any]`：包括缓存条目数量 `size`、容量 `capacity`、命中次
+          数 `hits`、未命中次数 `misses`、无法缓存的解析次数 `skips` 与命中
+          率 `hit_rate`（命中次数占可缓存解析次数的比例）。
+        """
+        with self.__lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.__entries),
+                'capacity': self.__capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'skips': self.skips,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -0,0 +1,140 @@
+"""异常日志去重与限流"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Hashable, List, Optional
+
+from nonebot.log import logger
+
+from .exception import StyledstrError
+
+
+class ErrorReporter(object):
+    """
+    异常日志去重与限流。
+
+    以 `(风格预设, 字符串标签)` 等键对异常去重：同一异常在限流间隔内仅输出一次
+    日志，其余重复异常仅计数，并在下一次输出日志时附带被抑制次数的汇总。首次抑
+    制异常时启动后台线程，每个限流间隔输出一次被抑制异常的汇总，因此不再出现
+    的异常也会被汇总。
+    """
+
+    def __init__(self, interval: float = 60.0, capacity: int = 4096) -> None:
+        """
+        初始化异常日志限流器。
+
+        可选参数：
+        - `interval: float`：同一异常两次输出日志的最小间隔（秒）。为 `0` 时
+          不进行限流。默认为 `60.0`。
+        - `capacity: int`：最多记录的异常数量，超出时淘汰最早记录的异常。默认
+          为 `4096`。
+        """
+        self.__interval = interval
+        self.__capacity = capacity
+        self.__lock = threading.Lock()
+        # 键 -> [上次输出日志的时间, 被抑制次数, 异常信息]
+        self.__records: 'OrderedDict[Hashable, list]' = OrderedDict()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        weakref.finalize(self, self.__stop.set)
+
+    def report(self, err: StyledstrError, key: Hashable) -> bool:
+        """
+        报告异常。
+
+        参数：
+        - `err: exception.StyledstrError`：异常。
+        - `key: Hashable`：去重键。
+
+        返回：
+        - `bool`：是否输出了日志。
+        """
+        if self.__interval <= 0:
+            err.log()
+            return True
+
+        now = time.monotonic()
+        with self.__lock:
+            record = self.__records.get(key)
+            if record is not None and now - record[0] < self.__interval:
+                record[1] += 1
+                if self.__thread is None:
+                    self.__start()
+                return False
+
+            suppressed = record[1] if record is not None else 0
+            self.__records[key] = [now, 0, err.message]
+            self.__records.move_to_end(key)
+            while len(self.__records) > self.__capacity:
+                self.__records.popitem(last=False)
+
+        if suppressed:
+            self.__summarize(err.message, suppressed)
+        err.log()
+        return True
+
+    def flush(self) -> List[Hashable]:
+        """
+        立即输出所有被抑制异常的汇总，并重置计数。
+
+        返回：
+        - `List[Hashable]`：输出了汇总的异常去重键。
+        """
+        flushed = []
+        with self.__lock:
+            pending = [(key, record[1], record[2])
+                       for key, record in self.__records.items()
+                       if record[1]]
+            for key, _, _ in pending:
+                self.__records[key][1] = 0
+
+        for key, suppressed, message in pending:
+            self.__summarize(message, suppressed)
+            flushed.append(key)
+        return flushed
+
+    def clear(self) -> None:
+        """清空所有异常记录。"""
+        with self.__lock:
+            self.__records.clear()
+
+    @property
+    def running(self) -> bool:
+        """定期输出汇总的后台线程是否正在运行。"""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def stop(self) -> None:
+        """停止定期输出汇总的后台线程。"""
+        self.__stop.set()
+        thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __start(self) -> None:
+        """启动定期输出汇总的后台线程，需在持有锁时调用。"""
+        if self.__stop.is_set():
+            return
+
+        # 线程仅弱引用限流器，限流器被回收后线程随之退出
+        self.__thread = threading.Thread(target=self.__run,
+                                         args=(weakref.ref(self), self.__stop,
+                                               self.__interval),
+                                         name='styledstr-reporter',
+                                         daemon=True)
+        self.__thread.start()
+
+    @staticmethod
+    def __run(ref: 'weakref.ref[ErrorReporter]', stop: threading.Event,
+              interval: float) -> None:
+        while not stop.wait(interval):
+            reporter = ref()
+            if reporter is None:
+                return
+            reporter.flush()
+            del reporter
+
+    @staticmethod
+    def __summarize(message: str, suppressed: int) -> None:
+        logger.warning('Suppressed {} repeated occurrences of the error: {}',
+                       suppressed, message)
@@ -0,0 +1,65 @@
+"""风格预设来源"""
+from pathlib import Path
+from typing import Any, List, Union
+
+# 预设文件后缀名，以文件路径指定风格预设时使用其文件名（不含后缀名）
+PRESET_SUFFIXES = ('.json', '.yaml', '.yml')
+
+
+class PresetSource(object):
+    """
+    风格预设来源。
+
+    解析器默认从资源目录下的预设文件加载风格预设，由 `store.PresetStore` 负责
+    缓存、继承链合并与热重载。风格预设也可以由其他来源提供，如风格预设包
+    （`bundle.Bundle`）或 SQLite 数据库（`database.Database`）。此时所有风格预
+    设均由来源提供，不再读取资源目录下的预设文件。
+
+    子类需实现 `names()` 与 `get()`。`get()` 返回的风格预设需提供与
+    `preset.Preset` 相同的 `lookup()`、`is_random()`、`search()`、`version`、
+    `base` 与 `len()` 接口，且其继承链应已在导入来源时合并。
+    """
+
+    def names(self) -> List[str]:
+        """
+        获取来源中的所有风格预设名称。
+
+        返回：
+        - `List[str]`：风格预设名称（小写）列表。
+        """
+        raise NotImplementedError
+
+    def get(self, preset: Union[str, Path]) -> Any:
+        """
+        获取风格预设。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设名称。为预设文件路径时
+          使用其文件名（不含后缀名）作为风格预设名称。
+
+        异常：
+        - `exception.PresetFileError`：来源中不存在指定风格预设。
+
+        返回：
+        - `Any`：风格预设。
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """释放来源所占用的资源。默认不做任何操作。"""
+
+    @staticmethod
+    def preset_name(preset: Union[str, Path]) -> str:
+        """
+        获取风格预设所对应的风格预设名称。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设名称或预设文件路径。
+
+        返回：
+        - `str`：风格预设名称（小写）。
+        """
+        name = preset if isinstance(preset, str) else preset.name
+        if Path(name).suffix.lower() in PRESET_SUFFIXES:
+            name = Path(name).stem
+        return name.lower()
@@ -0,0 +1,576 @@
+"""进程级共享风格预设存储"""
+import asyncio
+import re
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import (Callable, Dict, Hashable, List, Mapping, Optional, Tuple,
+                    Union)
+
+from nonebot.log import logger
+
+from . import exception
+from .bundle import Bundle, BundlePreset
+from .cache import PresetCache, Signature
+from .database import Database, DatabasePreset
+from .diskcache import DiskCache
+from .index import ResourceIndex
+from .metrics import Metrics
+from .preset import Compiled, Preset, ShardedPreset, load_file
+from .reporter import ErrorReporter
+from .source import PresetSource
+from .watcher import PresetWatcher
+
+Loaded = Union[Preset, ShardedPreset, BundlePreset, DatabasePreset]
+
+
+class PresetStore(object):
+    """
+    进程级共享风格预设存储。
+
+    持有同一资源目录下已加载的风格预设、资源目录索引、继承链合并结果、热重载
+    监视器与异常日志限流器。同一进程中配置相同的解析器共享同一存储，因此每个
+    预设文件只会被加载与缓存一次。存储仅被解析器弱引用登记，所有引用它的解析
+    器被回收后，存储及其缓存随之释放，监视器也将停止。
+
+    存储可被多个线程与事件循环同时使用。缓存命中时不获取任何锁；缓存未命中时
+    以预设文件为单位加锁，同时请求同一预设文件的调用方中仅有一个读取预设文件，
+    其余调用方等待后直接使用其结果。
+
+    属性：
+    - `inflight: Dict[Tuple[asyncio.AbstractEventLoop, Union[str,
+      pathlib.Path]], asyncio.Future]`：各事件循环中正在异步加载的风格预设。
+    - `warmup_scheduled: bool`：是否已安排预热。
+    """
+
+    __stores: 'weakref.WeakValueDictionary[Hashable, PresetStore]' = (
+        weakref.WeakValueDictionary())
+    __lock = threading.Lock()
+
+    def __init__(self,
+                 respath: Path,
+                 bases: Optional[Mapping[str, str]] = None,
+                 cache_dir: Optional[Path] = None,
+                 bundle: Optional[Path] = None,
+                 capacity: int = 0,
+                 budget: int = 0,
+                 database: Optional[Path] = None,
+                 source: Optional[PresetSource] = None) -> None:
+        """
+        初始化风格预设存储。一般应通过 `acquire()` 获取共享的存储。
+
+        参数：
+        - `respath: pathlib.Path`：资源目录。
+
+        可选参数：
+        - `bases: Optional[Mapping[str, str]]`：风格预设名称到其基础风格预设
+          名称的映射。默认为空。
+        - `cache_dir: Optional[pathlib.Path]`：磁盘缓存目录。默认为 `None`，
+          即不启用磁盘缓存。
+        - `bundle: Optional[pathlib.Path]`：风格预设包文件路径。设置后仅从风
+          格预设包中获取风格预设。默认为 `None`。
+        - `capacity: int`：最多缓存的预设文件数量。默认为 `0`，即不限制。
+        - `budget: int`：缓存的字符串标签总数上限。默认为 `0`，即不限制。
+        - `database: Optional[pathlib.Path]`：SQLite 风格预设数据库文件路径。
+          设置后仅从数据库中获取风格预设。默认为 `None`。
+        - `source: Optional[source.PresetSource]`：其他风格预设来源。设置后仅
+          从该来源获取风格预设。默认为 `None`。
+
+        异常：
+        - `OSError`：无法读取风格预设包或风格预设数据库。
+        - `ValueError`：风格预设包或风格预设数据库无效，或同时设置了多个风格
+          预设来源。
+        """
+        if sum(item is not None for item in (bundle, database, source)) > 1:
+            raise ValueError('Only one of preset bundle, preset database and '
+                             'preset source can be used at the same time.')
+
+        self.__respath = respath
+        self.__cache = PresetCache(capacity, budget, self.__evicted)
+        self.__index = ResourceIndex(respath)
+        self.__bases = {
+            name.lower(): base
+            for name, base in (bases or {}).items()
+        }
+        # 继承链末端的预设文件 -> (继承链中的预设文件, 继承链中的风格预设, 合并
+        # 结果)
+        self.__merged: Dict[Path, Tuple[Tuple[Path, ...], Tuple[Compiled, ...],
+                                        Preset]] = {}
+        self.__merge_lock = threading.Lock()
+        self.__file_locks: Dict[Path, threading.Lock] = {}
+        self.__file_locks_lock = threading.Lock()
+        self.inflight: Dict[Tuple[asyncio.AbstractEventLoop, Union[str, Path]],
+                            asyncio.Future] = {}
+        self.warmup_scheduled = False
+
+        self.__loader: Callable[[Path], Compiled] = load_file
+        if cache_dir is not None:
+            self.__loader = DiskCache(cache_dir).load
+
+        # 风格预设包或数据库中的风格预设均已合并继承链，无需缓存与热重载
+        self.__source = source
+        if bundle is not None:
+            self.__source = Bundle(bundle)
+        elif database is not None:
+            self.__source = Database(database)
+        self.__watcher: Optional[PresetWatcher] = None
+        self.__reporters: Dict[float, ErrorReporter] = {}
+        self.__reporters_lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls,
+                respath: Path,
+                bases: Optional[Mapping[str, str]] = None,
+                cache_dir: Optional[Path] = None,
+                bundle: Optional[Path] = None,
+                capacity: int = 0,
+                budget: int = 0,
+                database: Optional[Path] = None,
+                source: Optional[PresetSource] = None) -> 'PresetStore':
+        """
+        获取配置相同的共享存储，不存在时创建。
+
+        参数与 `PresetStore()` 相同。
+
+        返回：
+        - `PresetStore`：共享的风格预设存储。
+        """
+        key = (respath.resolve(), tuple(sorted((bases or {}).items())),
+               cache_dir.resolve() if cache_dir is not None else None,
+               bundle.resolve() if bundle is not None else None, capacity,
+               budget, database.resolve() if database is not None else None,
+               source)
+
+        with cls.__lock:
+            store = cls.__stores.get(key)
+            if store is None:
+                store = cls(respath, bases, cache_dir, bundle, capacity,
+                            budget, database, source)
+                cls.__stores[key] = store
+        return store
+
+    @property
+    def respath(self) -> Path:
+        """资源目录。"""
+        return self.__respath
+
+    def names(self) -> List[str]:
+        """
+        获取所有可用的风格预设名称。
+
+        返回：
+        - `List[str]`：风格预设名称（小写）列表。使用风格预设包或风格预设数据
+          库时为其中的风格预设。
+        """
+        if self.__source is not None:
+            return self.__source.names()
+        return self.__index.names()
+
+    @property
+    def watching(self) -> bool:
+        """是否已启用风格预设热重载。"""
+        return self.__watcher is not None and self.__watcher.running
+
+    def watch(self, interval: float = 1.0) -> None:
+        """
+        启用风格预设热重载。已启用或使用风格预设包、风格预设数据库时不做任何
+        操作。
+
+        可选参数：
+        - `interval: float`：检查间隔（秒）。默认为 `1.0`。
+        """
+        if self.watching or self.__source is not None:
+            return
+
+        self.__watcher = PresetWatcher(self.__cache, self.__index, interval,
+                                       self.__loader, self.__changed)
+        self.__watcher.start()
+        weakref.finalize(self, self.__watcher.stop)
+
+    def reporter(self, interval: float) -> ErrorReporter:
+        """
+        获取限流间隔相同的共享异常日志限流器，不存在时创建。共享同一存储的解
+        析器对同一异常仅输出一次日志，存储被释放时限流器的后台线程随之停止。
+
+        参数：
+        - `interval: float`：同一异常两次输出日志的最小间隔（秒）。
+
+        返回：
+        - `reporter.ErrorReporter`：异常日志限流器。
+        """
+        reporter = self.__reporters.get(interval)
+        if reporter is None:
+            with self.__reporters_lock:
+                reporter = self.__reporters.get(interval)
+                if reporter is None:
+                    reporter = ErrorReporter(interval)
+                    self.__reporters[interval] = reporter
+                    weakref.finalize(self, reporter.stop)
+        return reporter
+
+    @property
+    def cache(self) -> PresetCache:
+        """风格预设缓存。"""
+        return self.__cache
+
+    @property
+    def resident_tokens(self) -> int:
+        """
+        内存中缓存的风格预设与继承链合并结果中的字符串标签总数，用于核对缓存
+        的字符串标签总数上限。
+        """
+        total = 0
+        for path in self.__cache.paths():
+            entry = self.__cache.peek(path)
+            if entry is not None:
+                total += len(entry[1])
+        for _, _, merged in list(self.__merged.values()):
+            total += len(merged)
+        return total
+
+    def invalidate(self, preset_file: Path) -> bool:
+        """
+        使预设文件的缓存失效。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件的绝对路径。
+
+        返回：
+        - `bool`：缓存是否存在并已移除。
+        """
+        self.__merged.pop(preset_file, None)
+        return self.__cache.invalidate(preset_file)
+
+    def clear(self) -> None:
+        """清空所有风格预设缓存。"""
+        self.__merged.clear()
+        self.__cache.clear()
+
+    def load(self,
+             preset: Union[str, Path],
+             blocking: bool = True,
+             metrics: Optional[Metrics] = None) -> Optional[Loaded]:
+        """
+        加载风格预设，并在风格预设声明了基础风格预设时合并继承链。使用风格预
+        设包或风格预设数据库时直接从中获取。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。
+
+        可选参数：
+        - `blocking: bool`：是否允许扫描资源目录与读取预设文件。为 `False` 时
+          仅从缓存中获取。默认为 `True`。
+        - `metrics: Optional[metrics.Metrics]`：记录缓存命中与加载耗时的运行
+          指标。默认为 `None`。
+
+        异常：
+        - `exception.ResourcePathError`：资源目录未有效设置。
+        - `exception.PresetFileError`：指定预设名称错误、预设文件不存在或风格
+          预设的继承链存在循环。
+
+        返回：
+        - `Optional[Loaded]`：编译后的风格预设。仅当 `blocking` 为 `False` 且
+          风格预设（或其继承链中的任一风格预设）未缓存时返回 `None`。
+        """
+        if self.__source is not None:
+            return self.__source.get(preset)
+
+        preset_file = self.resolve(preset, scan=blocking)
+        if preset_file is None:
+            return None
+
+        loaded = self.__load_file(preset_file, blocking, metrics)
+        if loaded is None:
+            return None
+
+        base = self.__base_of(preset_file, loaded)
+        if base is None:
+            return loaded
+
+        # 收集继承链中的风格预设
+        members = [loaded]
+        visited = [preset_file]
+        while base is not None:
+            base_file = self.resolve(base, scan=blocking)
+            if base_file is None:
+                return None
+
+            if base_file in visited:
+                visited.append(base_file)
+                chain = ' -> '.join(path.name for path in visited)
+                message = f'Circular preset inheritance detected: {chain}.'
+                raise exception.PresetFileError(message=message)
+
+            member = self.__load_file(base_file, blocking, metrics)
+            if member is None:
+                return None
+
+            visited.append(base_file)
+            members.append(member)
+            base = self.__base_of(base_file, member)
+
+        # 合并结果包含以目录形式存储的风格预设的全部分片，需检查全部分片文件；
+        # 启用热重载时由监视器负责检查
+        if not self.watching:
+            for path, member in zip(visited, members):
+                if isinstance(member, ShardedPreset) and member.refresh():
+                    self.__drop_merged(path)
+
+        cached = self.__get_merged(preset_file, members)
+        if cached is not None:
+            return cached
+
+        with self.__merge_lock:
+            # 等待期间其他调用方可能已完成合并
+            cached = self.__get_merged(preset_file, members)
+            if cached is not None:
+                return cached
+
+            # 以目录形式存储的风格预设参与合并时需读取全部分片
+            flattened = [
+                member.materialize()
+                if isinstance(member, ShardedPreset) else member
+                for member in members
+            ]
+            merged = flattened[-1]
+            for member in reversed(flattened[:-1]):
+                merged = Preset.merge(member, merged)
+
+            # 合并结果计入继承链末端的缓存条目的权重，随其一同被淘汰
+            if self.__cache.charge(preset_file, len(merged)):
+                self.__merged[preset_file] = (tuple(visited), tuple(members),
+                                              merged)
+            else:
+                logger.debug(
+                    'Merged view of {} exceeds the cache budget and is not '
+                    'cached.', preset_file.name)
+
+        logger.info('Preset inheritance chain {} merged.',
+                    ' -> '.join(path.name for path in visited))
+        return merged
+
+    def resolve(self,
+                preset: Union[str, Path],
+                scan: bool = True) -> Optional[Path]:
+        """
+        解析风格预设所对应的预设文件。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。
+
+        可选参数：
+        - `scan: bool`：资源目录索引过期时是否重新扫描资源目录。默认为
+          `True`。
+
+        异常：
+        - `exception.PresetFileError`：指定预设名称错误或预设文件不存在。
+
+        返回：
+        - `Optional[pathlib.Path]`：预设文件的绝对路径（已解析符号链接）。仅当
+          `scan` 为 `False` 且资源目录索引已过期时返回 `None`。
+        """
+        valid_format = r'\.(?:json|ya?ml)'
+        preset_file = None
+
+        is_file_path = re.search(valid_format, str(preset))
+
+        # preset 为风格预设名称
+        if isinstance(preset, str) and not is_file_path:
+            if not (scan or self.watching) and self.__index.stale():
+                return None
+            preset_file = self.__index.lookup(preset,
+                                              refresh=not self.watching)
+
+            if preset_file is None:
+                raise exception.PresetFileError(preset, self.__respath)
+        # preset 为风格预设文件的相对或绝对路径
+        else:
+            if isinstance(preset, Path):
+                preset_file = preset
+            else:
+                preset_file = (Path(preset) if Path(preset).is_file() else
+                               self.__respath / preset)
+
+            if not preset_file.exists():
+                message = (f'Preset file {preset_file.absolute()} does not '
+                           'exist.')
+                raise exception.PresetFileError(message=message)
+            # 资源目录索引中的路径已预先解析，仅显式指定的路径需要解析
+            preset_file = preset_file.resolve()
+
+        return preset_file
+
+    def __load_file(self, preset_file: Path, blocking: bool,
+                    metrics: Optional[Metrics]) -> Optional[Compiled]:
+        """
+        加载并编译单个预设文件。预设文件未发生变化时直接返回缓存内容。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件的绝对路径。
+        - `blocking: bool`：缓存未命中时是否读取预设文件。
+        - `metrics: Optional[metrics.Metrics]`：运行指标。
+
+        异常：
+        - `exception.PresetFileError`：预设文件不存在。
+
+        返回：
+        - `Optional[preset.Compiled]`：编译后的风格预设。仅当 `blocking` 为
+          `False` 且缓存未命中时返回 `None`。
+        """
+        signature, loaded = self.__get_cached(preset_file)
+        if loaded is None and blocking:
+            with self.__file_lock(preset_file):
+                # 等待期间其他调用方可能已加载同一版本的预设文件
+                signature, loaded = self.__get_cached(preset_file)
+                if loaded is None:
+                    return self.__read_file(preset_file, signature, metrics)
+
+        if loaded is not None and metrics is not None:
+            metrics.incr('cache_hits')
+        return loaded
+
+    def __read_file(self, preset_file: Path, signature: Signature,
+                    metrics: Optional[Metrics]) -> Compiled:
+        """
+        读取并编译预设文件后写入缓存，需在持有预设文件的锁时调用。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件的绝对路径。
+        - `signature: Tuple[int, int, int]`：预设文件的状态签名。
+        - `metrics: Optional[metrics.Metrics]`：运行指标。
+
+        返回：
+        - `preset.Compiled`：编译后的风格预设。
+        """
+        if metrics is not None:
+            metrics.incr('cache_misses')
+            start = time.perf_counter()
+
+        loaded = self.__loader(preset_file)
+        self.__cache.put(preset_file, signature, loaded)
+        self.__drop_merged(preset_file)
+
+        if metrics is not None:
+            metrics.observe('load', time.perf_counter() - start)
+            metrics.incr('preset_loads')
+        logger.info('Preset file {} loaded.', preset_file.name)
+        return loaded
+
+    def __file_lock(self, preset_file: Path) -> threading.Lock:
+        """
+        获取预设文件的锁，不存在时创建。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件的绝对路径。
+
+        返回：
+        - `threading.Lock`：预设文件的锁。
+        """
+        lock = self.__file_locks.get(preset_file)
+        if lock is None:
+            with self.__file_locks_lock:
+                lock = self.__file_locks.setdefault(preset_file,
+                                                    threading.Lock())
+        return lock
+
+    def __get_merged(self, preset_file: Path,
+                     members: List[Compiled]) -> Optional[Preset]:
+        """
+        获取继承链的合并结果。继承链中的风格预设均未重新加载时才可复用。
+
+        参数：
+        - `preset_file: pathlib.Path`：继承链末端的预设文件的绝对路径。
+        - `members: List[preset.Compiled]`：继承链中的风格预设。
+
+        返回：
+        - `Optional[preset.Preset]`：合并后的风格预设。不存在或已失效时返回
+          `None`。
+        """
+        cached = self.__merged.get(preset_file)
+        if cached is not None and len(cached[1]) == len(members) and all(
+                old is new for old, new in zip(cached[1], members)):
+            return cached[2]
+        return None
+
+    def __drop_merged(self, preset_file: Path) -> None:
+        """
+        移除继承链中包含指定预设文件的合并结果。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件的绝对路径。
+        """
+        for key, (visited, _, _) in list(self.__merged.items()):
+            if preset_file in visited and self.__merged.pop(key, None):
+                self.__cache.charge(key, 0)
+
+    def __evicted(self, preset_file: Path) -> None:
+        """
+        缓存条目被淘汰后移除对应的继承链合并结果。
+
+        参数：
+        - `preset_file: pathlib.Path`：被淘汰的预设文件路径。
+        """
+        self.__merged.pop(preset_file, None)
+        logger.debug('Preset file {} evicted from cache.', preset_file.name)
+
+    def __changed(self, preset_file: Path) -> None:
+        """
+        监视器重新加载或移除预设文件，或以目录形式存储的风格预设中有分片发生
+        变化后，移除继承链中包含该预设文件的合并结果。分片变化时风格预设对象
+        不变，合并结果无法通过比较继承链成员判断是否失效。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件或风格预设目录路径。
+        """
+        self.__drop_merged(preset_file)
+        logger.debug('Preset {} changed.', preset_file.name)
+
+    def __base_of(self, preset_file: Path, loaded: Compiled) -> Optional[str]:
+        """
+        获取风格预设的基础风格预设。插件配置中的声明优先于预设文件中的声明。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件路径。
+        - `loaded: preset.Compiled`：编译后的风格预设。
+
+        返回：
+        - `Optional[str]`：基础风格预设。未声明时返回 `None`。
+        """
+        return self.__bases.get(preset_file.stem.lower(), loaded.base)
+
+    def __get_cached(
+            self, preset_file: Path) -> Tuple[Signature, Optional[Compiled]]:
+        """
+        获取预设文件的状态签名与缓存内容。
+
+        参数：
+        - `preset_file: pathlib.Path`：预设文件的绝对路径。
+
+        异常：
+        - `exception.PresetFileError`：预设文件不存在。
+
+        返回：
+        - `Tuple[Tuple[int, int, int], Optional[preset.Compiled]]`：预设文件的
+          状态签名，与缓存的风格预设（缓存不存在或已失效时为 `None`）。
+        """
+        # 启用热重载时由监视器负责检查文件状态，包括分片文件
+        if self.watching and (entry := self.__cache.peek(preset_file)):
+            if isinstance(entry[1], ShardedPreset):
+                entry[1].verify = False
+                self.__cache.reweigh(preset_file)
+            return entry
+
+        try:
+            signature = self.__cache.signature(preset_file)
+        except OSError:
+            message = f'Preset file {preset_file} does not exist.'
+            raise exception.PresetFileError(message=message)
+
+        loaded = self.__cache.get(preset_file, signature)
+        # 以目录形式存储的风格预设中的分片文件可能被原地修改，由其在查找时仅检
+        # 查字符串标签所在的分片；已读取的分片数量也随查找而变化
+        if isinstance(loaded, ShardedPreset):
+            loaded.verify = True
+            self.__cache.reweigh(preset_file)
+        return signature, loaded
@@ -1,17 +1,27 @@
 """风格化字符串解析器"""
-import json
-import random
-import re
-from functools import reduce
+import asyncio
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import (AbstractSet, Any, Callable, Dict, Iterable, List, Mapping,
+                    Optional, Tuple, Union, cast)
 
 import nonebot
-import yaml
 from nonebot.log import logger
 
 from . import config as conf
 from . import exception
+from .metrics import Hook, Metrics
+from .preset import ShardedPreset
+from .render import RenderCache
+from .store import Loaded, PresetStore
+from .template import Template, discard, is_async, resolve
+from .warmup import WarmupReport, warm_up
+
+Placeholders = Optional[Dict[str, Any]]
+Router = Callable[[Any], Optional[Union[str, Path]]]
+Rendered = Tuple[str, AbstractSet[str]]
+BatchItems = Union[Iterable[Union[str, Tuple[str, Placeholders]]],
+                   Mapping[str, Placeholders]]
 
 
 class Parser(object):
@@ -22,16 +32,42 @@ class Parser(object):
 
         可选参数：
         - `**config`：插件配置，覆盖 NoneBot 读取的插件配置。
-        """
-        init_conf = nonebot.get_driver().config.dict()
-        if config:
-            init_conf.update(config)
 
-        init = conf.Config(**init_conf)
+        异常：
+        - `pydantic.ValidationError`：配置项的值无效。
+        - `OSError`：无法读取配置的风格预设包或风格预设数据库。
+        - `ValueError`：配置的风格预设包或风格预设数据库无效，或同时配置了多
+          个风格预设来源。
+        """
+        init = conf.get_config(config)
 
-        self.__respath = init.styledstr_respath
         self.__preset = init.styledstr_preset
 
+        cache_dir = None
+        if init.styledstr_disk_cache:
+            cache_dir = (init.styledstr_cache_dir
+                         or init.styledstr_respath / '.styledstr-cache')
+        self.__store = PresetStore.acquire(
+            init.styledstr_respath, init.styledstr_bases, cache_dir,
+            init.styledstr_bundle, init.styledstr_cache_size,
+            init.styledstr_cache_budget, init.styledstr_database,
+            init.styledstr_source)
+        for name in [self.__preset, *init.styledstr_pinned]:
+            self.__store.cache.pin(name)
+        if init.styledstr_watch:
+            self.__store.watch(init.styledstr_watch_interval)
+
+        self.__metrics = Metrics() if init.styledstr_metrics else None
+        self.__reporter = self.__store.reporter(init.styledstr_error_interval)
+        self.__router: Optional[Router] = None
+        self.__renders = (RenderCache(init.styledstr_render_cache)
+                          if init.styledstr_render_cache > 0 else None)
+
+        # 同一存储仅预热一次
+        self.__warmup_workers = init.styledstr_warmup_workers
+        if init.styledstr_warmup and not self.__store.warmup_scheduled:
+            self.__schedule_warm_up()
+
     def parse(self,
               token: str,
               preset: Optional[Union[str, Path]] = None,
@@ -49,88 +85,704 @@ class Parser(object):
           - 当 `preset` 为 `str` 且 `preset` 包含预设文件后缀名时，将视为相对于
             资源目录的文件相对路径，否则将视为风格预设名称；
           - 当 `preset` 为 `pathlib.Path` 对象时，视为文件绝对路径。
+        - `**placeholders`：将被替换的占位符及替换内容。替换内容可以是无参数
+          的可调用对象，仅当字符串中存在对应占位符时才会被调用。
+
+        返回：
+        - `str`：根据标签获取的字符串。异常时返回空字符串。
+        """
+        preset = self.__preset if not preset else preset
+
+        try:
+            loaded = self.__load_preset(preset)
+        except exception.PresetFileError as err:
+            self.__report(err, preset)
+            return ''
+
+        result = self.__render(loaded, preset, token, placeholders)
+        if result is None:
+            return ''
+
+        logger.debug('Token "{}" parsed as expected.', token)
+        return result
+
+    def parse_many(self,
+                   items: BatchItems,
+                   preset: Optional[Union[str, Path]] = None) -> List[str]:
+        """
+        批量解析字符串标签。风格预设仅被解析与加载一次，适用于由多个字符串拼
+        接而成的回复内容。
+
+        参数：
+        - `items: Union[Iterable[Union[str, Tuple[str, Optional[Dict[str,
+          Any]]]]], Mapping[str, Optional[Dict[str, Any]]]]`：待解析的字符串
+          标签。可以是由字符串标签或 `(字符串标签, 占位符)` 元组组成的可迭代对
+          象，也可以是字符串标签到占位符的映射。
+
+        关键字参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。规则同 `parse()`。
+
+        返回：
+        - `List[str]`：按顺序排列的解析结果。解析异常的字符串标签对应空字符
+          串，异常将逐项输出日志。
+        """
+        preset = self.__preset if not preset else preset
+        pairs = self.__batch_pairs(items)
+
+        try:
+            loaded = self.__load_preset(preset)
+        except exception.PresetFileError as err:
+            self.__report(err, preset)
+            return [''] * len(pairs)
+
+        return self.__render_many(loaded, preset, pairs)
+
+    async def aparse(self,
+                     token: str,
+                     preset: Optional[Union[str, Path]] = None,
+                     **placeholders) -> str:
+        """
+        `parse()` 的异步版本。
+
+        已缓存且未发生变化的风格预设直接从内存中读取；否则在线程池中查找并加
+        载预设文件，避免阻塞事件循环。并发请求同一未加载的风格预设时共享同一
+        次加载。
+
+        除同步版本支持的替换内容外，替换内容还可以是可等待对象或协程函数，仅
+        当字符串中存在对应占位符时才会被并发等待。
+
+        参数与返回值同 `parse()`。
+        """
+        preset = self.__preset if not preset else preset
+
+        try:
+            loaded = await self.__aload_preset(preset, (token, ))
+        except exception.PresetFileError as err:
+            discard(placeholders)
+            self.__report(err, preset)
+            return ''
+
+        result = await self.__arender(loaded, preset, token, placeholders)
+        if result is None:
+            return ''
+
+        logger.debug('Token "{}" parsed as expected.', token)
+        return result
+
+    async def aparse_many(
+            self,
+            items: BatchItems,
+            preset: Optional[Union[str, Path]] = None) -> List[str]:
+        """
+        `parse_many()` 的异步版本，风格预设的加载方式与支持的替换内容同
+        `aparse()`。
+
+        参数与返回值同 `parse_many()`。
+        """
+        preset = self.__preset if not preset else preset
+        pairs = self.__batch_pairs(items)
+
+        try:
+            loaded = await self.__aload_preset(preset,
+                                               [token for token, _ in pairs])
+        except exception.PresetFileError as err:
+            for _, placeholders in pairs:
+                discard(placeholders or {})
+            self.__report(err, preset)
+            return [''] * len(pairs)
+
+        if not any(
+                is_async(value) for _, placeholders in pairs if placeholders
+                for value in placeholders.values()):
+            return self.__render_many(loaded, preset, pairs)
+
+        results = [
+            await self.__arender(loaded, preset, token, placeholders or {})
+            or '' for token, placeholders in pairs
+        ]
+
+        logger.debug('{} tokens parsed in batch.', len(pairs))
+        return results
+
+    def tokens(self,
+               prefix: str = '',
+               preset: Optional[Union[str, Path]] = None) -> List[str]:
+        """
+        列出字符串标签层级下的全部有效字符串标签，如 `help.commands` 下的
+        `help.commands.start` 与 `help.commands.stop`。查找基于风格预设的有序
+        索引，耗时仅与匹配数量相关。
+
+        可选参数：
+        - `prefix: str`：字符串标签层级。默认为空字符串，即全部字符串标签。
+
+        关键字参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。规则同 `parse()`。
+
+        返回：
+        - `List[str]`：按字典序排列的字符串标签，包括 `prefix` 本身（如果其
+          为有效字符串标签）。异常时返回空列表。
+        """
+        preset = self.__preset if not preset else preset
+
+        try:
+            loaded = self.__load_preset(preset)
+        except exception.PresetFileError as err:
+            self.__report(err, preset)
+            return []
+
+        return self.__search(loaded, preset, prefix)
+
+    def parse_subtree(self,
+                      prefix: str,
+                      preset: Optional[Union[str, Path]] = None,
+                      **placeholders) -> Dict[str, str]:
+        """
+        解析字符串标签层级下的全部有效字符串标签，适用于生成帮助与菜单等内
+        容。
+
+        参数：
+        - `prefix: str`：字符串标签层级，规则同 `tokens()`。
+
+        关键字参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。规则同 `parse()`。
+        - `**placeholders`：将被替换的占位符及替换内容，对所有字符串标签生
+          效。
+
+        返回：
+        - `Dict[str, str]`：按字典序排列的字符串标签到解析结果的映射。异常时
+          返回空字典。
+        """
+        preset = self.__preset if not preset else preset
+
+        try:
+            loaded = self.__load_preset(preset)
+        except exception.PresetFileError as err:
+            self.__report(err, preset)
+            return {}
+
+        tokens = self.__search(loaded, preset, prefix)
+        return self.__render_subtree(loaded, preset, tokens, placeholders)
+
+    async def aparse_subtree(self,
+                             prefix: str,
+                             preset: Optional[Union[str, Path]] = None,
+                             **placeholders) -> Dict[str, str]:
+        """
+        `parse_subtree()` 的异步版本，风格预设的加载方式与支持的替换内容同
+        `aparse()`。可等待替换内容对层级下的全部字符串标签仅被等待一次。
+
+        参数与返回值同 `parse_subtree()`。
+        """
+        preset = self.__preset if not preset else preset
+
+        try:
+            loaded = await self.__aload_preset(preset, (prefix, ))
+        except exception.PresetFileError as err:
+            discard(placeholders)
+            self.__report(err, preset)
+            return {}
+
+        tokens = self.__search(loaded, preset, prefix)
+        if not any(is_async(value) for value in placeholders.values()):
+            return self.__render_subtree(loaded, preset, tokens, placeholders)
+
+        templates = {}
+        for token in tokens:
+            if self.__metrics is not None:
+                self.__metrics.hit(str(preset), token)
+            try:
+                templates[token] = loaded.lookup(token)
+            except exception.TokenError as err:
+                self.__report(err, preset, token)
+
+        # 同一可等待对象不能被等待多次，对全部模板中的占位符统一求值
+        names = frozenset().union(*(template.names
+                                    for template in templates.values()))
+        resolved = await resolve(names, placeholders)
+        return {
+            token: self.__replace_placeholders(template, **resolved)
+            for token, template in templates.items()
+        }
+
+    def set_router(self, router: Optional[Router]) -> None:
+        """
+        设置由会话到风格预设的路由函数，供 `parse_for()` 与 `aparse_for()` 使
+        用。
+
+        参数：
+        - `router: Optional[Callable[[Any], Optional[Union[str,
+          pathlib.Path]]]]`：路由函数，参数为会话标识（如群号），返回该会话
+          所使用的风格预设，返回 `None` 时使用默认风格预设。也可以直接传入映
+          射的 `get` 方法。为 `None` 时移除路由函数。
+        """
+        self.__router = router
+
+    def parse_for(self, session: Any, token: str, /, **placeholders) -> str:
+        """
+        根据会话所对应的风格预设解析字符串标签。
+
+        参数：
+        - `session: Any`：会话标识，如群号或会话 ID。
+        - `token: str`：字符串标签。
+
+        关键字参数：
         - `**placeholders`：将被替换的占位符及替换内容。
 
         返回：
         - `str`：根据标签获取的字符串。异常时返回空字符串。
         """
+        return self.parse(token, preset=self.__route(session), **placeholders)
+
+    async def aparse_for(self, session: Any, token: str, /,
+                         **placeholders) -> str:
+        """
+        `parse_for()` 的异步版本，风格预设的加载方式同 `aparse()`。
+
+        参数与返回值同 `parse_for()`。
+        """
+        return await self.aparse(token,
+                                 preset=self.__route(session),
+                                 **placeholders)
+
+    def invalidate(self, preset: Optional[Union[str, Path]] = None) -> bool:
+        """
+        使指定风格预设的缓存失效，下次解析时将重新读取预设文件。
+
+        可选参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。默认为项目配置中设置的
+          风格预设。
+
+        返回：
+        - `bool`：缓存是否存在并已移除。
+        """
         preset = self.__preset if not preset else preset
-        result = ''
+        if self.__renders is not None:
+            self.__renders.clear()
 
         try:
-            strings = self.__load_preset(preset)
-            result = self.__token_parse(token, strings)
-        except (exception.PresetFileError, exception.TokenError) as err:
-            err.log()
+            preset_file = self.__store.resolve(preset)
+        except exception.PresetFileError:
+            return False
+
+        return self.__store.invalidate(preset_file)
+
+    def clear_cache(self) -> None:
+        """清空所有风格预设缓存与解析结果缓存。"""
+        self.__store.clear()
+        if self.__renders is not None:
+            self.__renders.clear()
+
+    def warm_up(self, workers: Optional[int] = None) -> WarmupReport:
+        """
+        在线程池中并行加载资源目录下的全部风格预设，校验字符串标签内容与占位
+        符，并输出汇总日志。
+
+        可选参数：
+        - `workers: Optional[int]`：线程池大小。默认为 `None`，即使用
+          `concurrent.futures.ThreadPoolExecutor` 的默认值。
+
+        返回：
+        - `warmup.WarmupReport`：预热结果汇总。
+        """
+        report = warm_up(self.__store, workers, self.__metrics)
+        report.log()
+        return report
+
+    def enable_metrics(self, hook: Optional[Hook] = None) -> Metrics:
+        """
+        启用运行指标记录。已启用时仅替换钩子函数。
+
+        可选参数：
+        - `hook: Callable[[str, str, float], None]`：钩子函数，参数依次为指标
+          类型（`counter` 或 `histogram`）、指标名称与数值。
+
+        返回：
+        - `metrics.Metrics`：运行指标对象。
+        """
+        if self.__metrics is None:
+            self.__metrics = Metrics(hook)
         else:
-            if placeholders:
-                result = self.__replace_placeholders(result, **placeholders)
-            logger.debug(f'Token "{token}" parsed as expected.')
+            self.__metrics.hook = hook
+        return self.__metrics
 
-        return result
+    def disable_metrics(self) -> None:
+        """停用运行指标记录。"""
+        self.__metrics = None
+
+    def stats(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        获取运行指标快照。
+
+        可选参数：
+        - `top: Optional[int]`：仅返回命中次数最多的风格预设与字符串标签的数
+          量。默认返回全部。
+
+        返回：
+        - `Dict[str, Any]`：运行指标快照，格式见 `metrics.Metrics.snapshot()`。
+          未启用运行指标记录时返回空字典。
+        """
+        if self.__metrics is None:
+            return {}
+        return self.__metrics.snapshot(top)
+
+    def render_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取解析结果缓存统计，可据此调整 `STYLEDSTR_RENDER_CACHE` 的大小。
+
+        返回：
+        - `Dict[str, Any]`：缓存统计，格式见 `render.RenderCache.stats()`。未
+          启用解析结果缓存时返回空字典。
+        """
+        if self.__renders is None:
+            return {}
+        return self.__renders.stats()
+
+    def flush(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        立即输出所有被抑制的重复异常日志的汇总，而不必等待下一个限流间隔。
+
+        返回：
+        - `List[Tuple[str, Optional[str]]]`：输出了汇总的风格预设与字符串标
+          签。与风格预设有关的异常中字符串标签为 `None`。
+        """
+        return cast(List[Tuple[str, Optional[str]]], self.__reporter.flush())
+
+    def __schedule_warm_up(self) -> None:
+        """
+        安排预热风格预设。
+
+        在事件循环中创建解析器对象时驱动器已经启动，启动钩子不会再被调用，此时
+        立即于线程池中预热；否则注册启动钩子。
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            nonebot.get_driver().on_startup(self.__warm_up_on_startup)
+        else:
+            loop.run_in_executor(None, self.warm_up, self.__warmup_workers)
+        self.__store.warmup_scheduled = True
+
+    async def __warm_up_on_startup(self) -> None:
+        """在 NoneBot 启动时于线程池中预热风格预设。"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.warm_up, self.__warmup_workers)
 
-    def __load_preset(self, preset: Union[str, Path]) -> Dict[str, Any]:
+    def __route(self, session: Any) -> Optional[Union[str, Path]]:
         """
-        加载风格预设文件内容。
+        获取会话所对应的风格预设。
+
+        参数：
+        - `session: Any`：会话标识。
+
+        返回：
+        - `Optional[Union[str, pathlib.Path]]`：风格预设。未设置路由函数或路
+          由函数返回 `None` 时返回 `None`，即使用默认风格预设。
+        """
+        return self.__router(session) if self.__router is not None else None
+
+    def __load_preset(self, preset: Union[str, Path]) -> Loaded:
+        """
+        加载并编译风格预设文件内容，并合并其继承链。预设文件未发生变化时直接
+        返回缓存内容。
 
         参数：
         - `preset: Union[str, pathlib.Path]`：风格预设。
 
         异常：
         - `exception.ResourcePathError`：资源目录未有效设置。
-        - `exception.PresetFileError`：指定预设名称错误或预设文件不存在。
+        - `exception.PresetFileError`：指定预设名称错误、预设文件不存在或风格
+          预设的继承链存在循环。
 
         返回:
-        - `Dict[str, Any]`：风格预设内容。
+        - `store.Loaded`：编译后的风格预设。
         """
-        valid_format = r'\.(?:json|ya?ml)'
-        preset_file = None
+        return cast(Loaded, self.__store.load(preset, metrics=self.__metrics))
 
-        is_file_path = re.search(valid_format, str(preset))
+    async def __aload_preset(
+        self, preset: Union[str, Path], tokens: Iterable[str] = ()) -> Loaded:
+        """
+        异步加载风格预设。以目录形式存储的风格预设中，字符串标签所在的分片同
+        样在线程池中读取。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。
 
-        # preset 为风格预设名称
-        if isinstance(preset, str) and not is_file_path:
-            valid_file = ''.join([preset, valid_format])
-            files = [
-                file for file in self.__respath.iterdir()
-                if re.match(valid_file, file.name, re.IGNORECASE)
-            ]
+        可选参数：
+        - `tokens: Iterable[str]`：将被查找的字符串标签或字符串标签层级。默
+          认为空。
 
-            if not files:
-                raise exception.PresetFileError(preset, self.__respath)
+        异常：
+        - `exception.PresetFileError`：指定预设名称错误或预设文件不存在。
 
-            files.sort()
-            preset_file = files[0]
-        # preset 为风格预设文件的相对或绝对路径
+        返回：
+        - `store.Loaded`：编译后的风格预设。
+        """
+        loaded = self.__peek_preset(preset)
+        if loaded is None:
+            loaded = await self.__aload_file(preset)
+
+        if isinstance(loaded, ShardedPreset):
+            sections = loaded.unloaded(tokens)
+            if sections:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, loaded.preload, sections)
+        return loaded
+
+    async def __aload_file(self, preset: Union[str, Path]) -> Loaded:
+        """
+        在线程池中加载风格预设，并发请求同一风格预设时共享同一次加载。
+
+        参数 `preset`、异常与返回值同 `__aload_preset()`。
+        """
+        # 不同事件循环中的 Future 不可互相等待，跨线程的加载由存储负责合并
+        loop = asyncio.get_running_loop()
+        inflight = self.__store.inflight
+        key = (loop, preset)
+        future = inflight.get(key)
+        if future is None:
+            future = loop.run_in_executor(None, self.__load_preset, preset)
+            inflight[key] = future
+            future.add_done_callback(lambda _: inflight.pop(key, None))
+
+        return await asyncio.shield(future)
+
+    def __peek_preset(self, preset: Union[str, Path]) -> Optional[Loaded]:
+        """
+        从缓存中获取风格预设，不扫描资源目录，也不读取预设文件。
+
+        参数：
+        - `preset: Union[str, pathlib.Path]`：风格预设。
+
+        返回：
+        - `Optional[store.Loaded]`：编译后的风格预设。风格预设未缓存、已发生
+          变化或无法确定对应的预设文件时返回 `None`。
+        """
+        try:
+            return self.__store.load(preset,
+                                     blocking=False,
+                                     metrics=self.__metrics)
+        except exception.PresetFileError:
+            return None
+
+    def __render(self, loaded: Loaded, preset: Union[str, Path], token: str,
+                 placeholders: Dict[str, Any]) -> Optional[str]:
+        """
+        从风格预设中获取字符串标签的内容并替换占位符。
+
+        参数：
+        - `loaded: store.Loaded`：编译后的风格预设。
+        - `preset: Union[str, pathlib.Path]`：风格预设，用于记录运行指标。
+        - `token: str`：字符串标签。
+        - `placeholders: Dict[str, Any]`：占位符及替换内容。
+
+        返回：
+        - `Optional[str]`：处理后的字符串。字符串标签无效时输出日志并返回
+          `None`。
+        """
+        key = None
+        if (renders := self.__renders) is not None:
+            # 内容为列表的字符串标签每次随机抽取，不缓存解析结果
+            if loaded.is_random(token):
+                renders.skip()
+            elif (key := renders.key(loaded, token, placeholders)) is not None:
+                if (result := renders.get(key)) is not None:
+                    if self.__metrics is not None:
+                        self.__metrics.hit(str(preset), token)
+                    return result
+
+        rendered = self.__render_uncached(loaded, preset, token, placeholders)
+        if rendered is None:
+            return None
+
+        result, invalid = rendered
+        # 存在无效占位符的解析结果不缓存，使每次解析都能输出警告
+        if invalid:
+            self.__warn_invalid(invalid)
+        elif renders is not None and key is not None:
+            renders.put(key, result)
+        return result
+
+    def __render_uncached(self, loaded: Loaded, preset: Union[str, Path],
+                          token: str,
+                          placeholders: Dict[str, Any]) -> Optional[Rendered]:
+        """
+        `__render()` 不使用解析结果缓存且不输出无效占位符警告的版本，参数同
+        `__render()`。
+
+        返回：
+        - `Optional[Tuple[str, AbstractSet[str]]]`：处理后的字符串与无效的占
+          位符。字符串标签无效时输出日志并返回 `None`。
+        """
+        if (metrics := self.__metrics) is not None:
+            return self.__render_measured(metrics, loaded, preset, token,
+                                          placeholders)
+
+        try:
+            template = loaded.lookup(token)
+        except exception.TokenError as err:
+            self.__report(err, preset, token)
+            return None
+
+        if placeholders:
+            return self.__substitute(template, placeholders)
+        return template.text, frozenset()
+
+    def __render_measured(self, metrics: Metrics, loaded: Loaded,
+                          preset: Union[str, Path], token: str,
+                          placeholders: Dict[str, Any]) -> Optional[Rendered]:
+        """
+        `__render_uncached()` 记录运行指标的版本，参数同 `__render()`，返回值
+        同 `__render_uncached()`。
+        """
+        metrics.hit(str(preset), token)
+
+        start = time.perf_counter()
+        try:
+            template = loaded.lookup(token)
+        except exception.TokenError as err:
+            self.__report(err, preset, token)
+            return None
+
+        looked_up = time.perf_counter()
+        metrics.observe('lookup', looked_up - start)
+
+        if placeholders:
+            rendered = self.__substitute(template, placeholders)
         else:
-            if isinstance(preset, Path):
-                preset_file = preset
-            else:
-                preset_file = (Path(preset) if Path(preset).is_file() else
-                               self.__respath / preset)
-
-            if not preset_file.exists():
-                message = (f'Preset file {preset_file.absolute()} does not '
-                           'exist.')
-                raise exception.PresetFileError(message=message)
-
-        loaded = {}
-        with preset_file.open() as f:
-            if re.match(r'\.ya?ml', preset_file.suffix):
-                loaded = yaml.safe_load(f)
+            rendered = template.text, frozenset()
+
+        metrics.observe('render', time.perf_counter() - looked_up)
+        return rendered
+
+    async def __arender(self, loaded: Loaded, preset: Union[str, Path],
+                        token: str, placeholders: Dict[str,
+                                                       Any]) -> Optional[str]:
+        """
+        `__render()` 的异步版本，替换占位符前并发等待模板中存在的占位符的可等
+        待替换内容。参数与返回值同 `__render()`。
+        """
+        if not any(is_async(value) for value in placeholders.values()):
+            return self.__render(loaded, preset, token, placeholders)
+
+        if self.__metrics is not None:
+            self.__metrics.hit(str(preset), token)
+
+        try:
+            template = loaded.lookup(token)
+        except exception.TokenError as err:
+            discard(placeholders)
+            self.__report(err, preset, token)
+            return None
+
+        resolved = await template.resolve(placeholders)
+        return self.__replace_placeholders(template, **resolved)
+
+    def __render_many(self, loaded: Loaded, preset: Union[str, Path],
+                      pairs: List[Tuple[str, Placeholders]]) -> List[str]:
+        """
+        批量获取字符串标签的内容并替换占位符。
+
+        参数：
+        - `loaded: store.Loaded`：编译后的风格预设。
+        - `preset: Union[str, pathlib.Path]`：风格预设，用于记录运行指标。
+        - `pairs: List[Tuple[str, Optional[Dict[str, Any]]]]`：字符串标签与
+          占位符。
+
+        返回：
+        - `List[str]`：按顺序排列的处理结果。
+        """
+        results = [
+            self.__render(loaded, preset, token, placeholders or {}) or ''
+            for token, placeholders in pairs
+        ]
+
+        logger.debug('{} tokens parsed in batch.', len(pairs))
+        return results
+
+    def __render_subtree(self, loaded: Loaded, preset: Union[str, Path],
+                         tokens: List[str],
+                         placeholders: Dict[str, Any]) -> Dict[str, str]:
+        """
+        获取字符串标签层级下的字符串标签的内容并替换占位符。
+
+        参数：
+        - `loaded: store.Loaded`：编译后的风格预设。
+        - `preset: Union[str, pathlib.Path]`：风格预设，用于记录运行指标。
+        - `tokens: List[str]`：层级下的字符串标签。
+        - `placeholders: Dict[str, Any]`：占位符及替换内容。
+
+        返回：
+        - `Dict[str, str]`：字符串标签到处理结果的映射，不包括无效字符串标
+          签。
+        """
+        results = {}
+        for token in tokens:
+            result = self.__render(loaded, preset, token, placeholders)
+            if result is not None:
+                results[token] = result
+        return results
+
+    def __search(self, loaded: Loaded, preset: Union[str, Path],
+                 prefix: str) -> List[str]:
+        """
+        查找字符串标签层级下的全部有效字符串标签。
+
+        参数：
+        - `loaded: store.Loaded`：编译后的风格预设。
+        - `preset: Union[str, pathlib.Path]`：风格预设，用于输出日志。
+        - `prefix: str`：字符串标签层级。
+
+        返回：
+        - `List[str]`：按字典序排列的字符串标签。分片无法读取时返回空列表。
+        """
+        try:
+            return loaded.search(prefix)
+        except exception.TokenError as err:
+            self.__report(err, preset, prefix)
+            return []
+
+    def __report(self,
+                 err: exception.StyledstrError,
+                 preset: Union[str, Path],
+                 token: Optional[str] = None) -> None:
+        """
+        记录运行指标，并经去重与限流后输出异常日志。
+
+        参数：
+        - `err: exception.StyledstrError`：异常。
+        - `preset: Union[str, pathlib.Path]`：风格预设。
+        - `token: Optional[str]`：字符串标签。默认为 `None`。
+        """
+        if self.__metrics is not None:
+            if isinstance(err, exception.TokenError):
+                self.__metrics.incr('token_errors')
             else:
-                loaded = json.load(f)
+                self.__metrics.incr('preset_errors')
+        self.__reporter.report(err, (str(preset), token))
 
-        logger.info(f'Preset file {preset_file.name} loaded.')
-        return loaded
+    @staticmethod
+    def __batch_pairs(items: BatchItems) -> List[Tuple[str, Placeholders]]:
+        """
+        将批量解析的参数统一为字符串标签与占位符组成的列表。
+
+        参数：
+        - `items`：待解析的字符串标签，格式同 `parse_many()`。
+
+        返回：
+        - `List[Tuple[str, Optional[Dict[str, Any]]]]`：字符串标签与占位符。
+        """
+        if isinstance(items, Mapping):
+            return list(items.items())
+        return [(item, None) if isinstance(item, str) else tuple(item)
+                for item in items]
 
     @staticmethod
-    def __replace_placeholders(contents: str, /, **placeholders) -> str:
+    def __replace_placeholders(template: Template, /, **placeholders) -> str:
         """
-        替换字符串中的占位符为指定内容。
+        替换模板中的占位符为指定内容。
 
         参数：
-        - `contents: str`：包含占位符的字符串内容。
+        - `template: template.Template`：预编译的字符串模板。
 
         关键字参数：
         - `**placeholders`：将被替换的占位符及替换内容。
@@ -138,59 +790,36 @@ class Parser(object):
         返回：
         - `str`：处理后的字符串。
         """
-        placeholder = r'(\$[a-zA-Z]\w{0,23}\$)'
-        blacklist = {'contents', 'preset', 'token'}
-
-        items = {i for i, _ in placeholders.items()}
-        replaced_items = set()
+        result, invalid = Parser.__substitute(template, placeholders)
+        if invalid:
+            Parser.__warn_invalid(invalid)
+        return result
 
-        split_str = re.split(placeholder, contents)
+    @staticmethod
+    def __substitute(template: Template,
+                     placeholders: Mapping[str, Any]) -> Rendered:
+        """
+        替换模板中的占位符为指定内容，不输出无效占位符警告。
 
-        for i, item in enumerate(split_str):
-            if (re.match(placeholder, item)
-                    and (val := item[1:-1].lower()) not in blacklist):
-                replaced = placeholders.get(val)
-                if replaced:
-                    split_str[i] = str(replaced)
-                    replaced_items.add(str(val))
-                else:
-                    split_str[i] = item
+        参数：
+        - `template: template.Template`：预编译的字符串模板。
+        - `placeholders: Mapping[str, Any]`：将被替换的占位符及替换内容。
 
-        if (invalid := items - replaced_items):
-            logger.warning('The following placeholders are regarded as '
-                           'invalid or nonexistent and skipped replacing: '
-                           f'{invalid}')
-        return ''.join(split_str)
+        返回：
+        - `Tuple[str, AbstractSet[str]]`：处理后的字符串与无效或不存在因而未
+          被替换的占位符。
+        """
+        result, replaced_items = template.render(placeholders)
+        return result, placeholders.keys() - replaced_items
 
     @staticmethod
-    def __token_parse(token: str, preset_contents: Dict[str, Any]) -> str:
+    def __warn_invalid(invalid: AbstractSet[str]) -> None:
         """
-        解析字符串标签。
+        输出无效占位符警告。
 
         参数：
-        - `token: str`：字符串标签。
-        - `preset_contents: Dict[str, Any]`：风格预设内容。
-
-        异常：
-        - `exception.TokenError`：字符串标签不存在于风格预设内容中，或其对应内
-          容不是数值、布尔值、字符串或列表。
-
-        返回：
-        - `str`：标签所指示的字符串内容。特别地，当 `preset_contents` 中字符串
-          标签所对应的内容为列表时，则从中随机抽取值返回。
+        - `invalid: AbstractSet[str]`：无效或不存在因而未被替换的占位符。
         """
-        try:
-            result = reduce(lambda key, val: key[val], token.split('.'),
-                            preset_contents)
-        except (KeyError, TypeError):
-            raise exception.TokenError(token)
-        else:
-            if isinstance(result, list):
-                return str(random.choice(result))
-            if isinstance(result, (str, int, float, bool)):
-                return str(result)
-
-            message = (
-                f'The value of the token "{token}" is not a numeric, boolean, '
-                'string or list.')
-            raise exception.TokenError(message=message)
+        logger.warning('The following placeholders are regarded as '
+                       'invalid or nonexistent and skipped replacing: '
+                       f'{invalid}')
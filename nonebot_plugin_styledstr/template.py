@@ -0,0 +1,242 @@
+"""预编译字符串模板"""
+import asyncio
+import inspect
+import re
+from typing import (AbstractSet, Any, Dict, FrozenSet, Mapping, Optional, Set,
+                    Tuple, Union)
+
+# 占位符，可在名称后以冒号分隔附加格式说明，如 `$price:.2f$`
+PLACEHOLDER = re.compile(r'(\$[a-zA-Z]\w{0,23}(?::[^$\s]{1,32})?\$)')
+# 由于历史实现原因，以下名称不视为有效的占位符
+BLACKLIST = frozenset({'contents', 'preset', 'token'})
+
+Segment = Union[str, Tuple[str, str, str]]
+
+
+class Template(object):
+    """
+    预编译字符串模板。
+
+    字符串在编译时被拆分为文本片段与占位符片段，渲染时仅需按顺序拼接。
+
+    属性：
+    - `text: str`：原始字符串。
+    - `segments: Tuple[Union[str, Tuple[str, str, str]], ...]`：模板片段。文
+      本片段为字符串，占位符片段为由小写占位符名称、原始文本与格式说明（不存
+      在时为空字符串）组成的元组。
+    - `names: FrozenSet[str]`：模板中出现的占位符名称（小写）。
+    """
+
+    __slots__ = ('text', 'segments', 'names')
+
+    def __init__(self, text: str) -> None:
+        """
+        编译字符串模板。
+
+        参数：
+        - `text: str`：字符串内容。
+        """
+        segments = []
+        names = set()
+        literal = ''
+
+        for i, item in enumerate(PLACEHOLDER.split(text)):
+            if i % 2:
+                name, _, spec = item[1:-1].partition(':')
+                if (name := name.lower()) not in BLACKLIST:
+                    if literal:
+                        segments.append(literal)
+                        literal = ''
+                    segments.append((name, item, spec))
+                    names.add(name)
+                    continue
+            literal += item
+        if literal:
+            segments.append(literal)
+
+        self.text = text
+        self.segments: Tuple[Segment, ...] = tuple(segments)
+        self.names: FrozenSet[str] = frozenset(names)
+
+    @classmethod
+    def from_segments(cls, text: str, segments: Tuple[Segment, ...],
+                      /) -> 'Template':
+        """
+        由已拆分的模板片段直接构造模板，不再匹配占位符。
+
+        参数：
+        - `text: str`：原始字符串。
+        - `segments: Tuple[Union[str, Tuple[str, str, str]], ...]`：模板片段，
+          格式同 `Template.segments`。
+
+        返回：
+        - `Template`：字符串模板。
+        """
+        template = cls.__new__(cls)
+        template.text = text
+        template.segments = segments
+        template.names = frozenset(
+            [segment[0] for segment in segments if isinstance(segment, tuple)])
+        return template
+
+    def render(self, placeholders: Mapping[str, Any]) -> Tuple[str, Set[str]]:
+        """
+        渲染模板。
+
+        替换内容为无参数的可调用对象时，仅当模板中存在对应占位符时才调用，且
+        每次渲染最多调用一次。替换内容（或可调用对象的返回值）为假值时不替换
+        占位符；带有格式说明的占位符仅在替换内容为 `None` 时不替换，格式化失
+        败时同样不替换。可等待对象需通过 `resolve()` 预先求值，否则不替换。
+
+        参数：
+        - `placeholders: Mapping[str, Any]`：占位符名称及替换内容。
+
+        返回：
+        - `Tuple[str, Set[str]]`：渲染后的字符串与被替换的占位符名称。
+        """
+        if not self.names:
+            return self.text, set()
+
+        parts = []
+        replaced = set()
+        values: Dict[str, Any] = {}
+        for segment in self.segments:
+            if segment.__class__ is str:
+                parts.append(segment)
+                continue
+
+            name, raw, spec = segment
+            if name in values:
+                value = values[name]
+            else:
+                value = values[name] = _evaluate(placeholders.get(name))
+
+            text = _format(value, spec)
+            if text is None:
+                parts.append(raw)
+            else:
+                parts.append(text)
+                replaced.add(name)
+
+        return ''.join(parts), replaced
+
+    async def resolve(self, placeholders: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        对模板中存在的占位符的替换内容求值，同模块函数 `resolve()`。
+
+        参数：
+        - `placeholders: Mapping[str, Any]`：占位符名称及替换内容。
+
+        返回：
+        - `Dict[str, Any]`：求值后的占位符名称及替换内容。
+        """
+        return await resolve(self.names, placeholders)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f'Template({self.text!r})'
+
+
+def is_async(value: Any) -> bool:
+    """
+    检查替换内容是否需要异步求值。
+
+    参数：
+    - `value: Any`：替换内容。
+
+    返回：
+    - `bool`：替换内容是否为可等待对象或协程函数。
+    """
+    return inspect.isawaitable(value) or inspect.iscoroutinefunction(value)
+
+
+async def resolve(names: AbstractSet[str],
+                  placeholders: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    对指定占位符的替换内容求值：调用可调用对象，并并发等待可等待对象。其他占
+    位符的替换内容保持不变，其中的协程对象将被关闭。
+
+    参数：
+    - `names: AbstractSet[str]`：需要求值的占位符名称，如模板中出现的占位符
+      名称。
+    - `placeholders: Mapping[str, Any]`：占位符名称及替换内容。
+
+    返回：
+    - `Dict[str, Any]`：求值后的占位符名称及替换内容。
+    """
+    discard(placeholders, names)
+
+    resolved = dict(placeholders)
+    pending = {}
+    for name in names & placeholders.keys():
+        value = placeholders[name]
+        if callable(value):
+            value = value()
+        if inspect.isawaitable(value):
+            pending[name] = value
+        resolved[name] = value
+
+    if pending:
+        values = await asyncio.gather(*pending.values())
+        resolved.update(zip(pending, values))
+    return resolved
+
+
+def discard(placeholders: Mapping[str, Any],
+            used: Optional[AbstractSet[str]] = None) -> None:
+    """
+    关闭不会被等待的协程对象替换内容，避免输出协程从未被等待的警告。
+
+    参数：
+    - `placeholders: Mapping[str, Any]`：占位符名称及替换内容。
+
+    可选参数：
+    - `used: Optional[AbstractSet[str]]`：仍会被求值的占位符名称。默认为
+      `None`，即关闭全部协程对象。
+    """
+    for name, value in placeholders.items():
+        if inspect.iscoroutine(value) and (used is None or name not in used):
+            value.close()
+
+
+def _evaluate(value: Any) -> Any:
+    """
+    对替换内容求值。可调用对象将被调用；可等待对象无法同步求值，视为 `None`。
+
+    参数：
+    - `value: Any`：替换内容。
+
+    返回：
+    - `Any`：求值后的替换内容。
+    """
+    if callable(value):
+        value = value()
+    if inspect.isawaitable(value):
+        # 关闭未被等待的协程，避免输出警告
+        if inspect.iscoroutine(value):
+            value.close()
+        return None
+    return value
+
+
+def _format(value: Any, spec: str) -> Optional[str]:
+    """
+    按格式说明格式化替换内容。
+
+    参数：
+    - `value: Any`：替换内容。
+    - `spec: str`：格式说明，为空字符串时不进行格式化。
+
+    返回：
+    - `Optional[str]`：格式化后的字符串。不替换占位符时返回 `None`。
+    """
+    if not spec:
+        return str(value) if value else None
+    if value is None:
+        return None
+    try:
+        return format(value, spec)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,105 @@
+"""风格预设预热与校验"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from nonebot.log import logger
+
+from . import exception
+from .analyze import check
+from .metrics import Metrics
+from .preset import Preset, ShardedPreset
+
+if TYPE_CHECKING:
+    from .store import PresetStore
+
+
+class WarmupReport(object):
+    """
+    预热结果汇总。
+
+    属性：
+    - `timings: Dict[str, float]`：各风格预设的加载耗时（秒）。
+    - `problems: List[Tuple[str, str]]`：由风格预设名称与问题描述组成的列表。
+    - `elapsed: float`：预热总耗时（秒）。
+    """
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self.problems: List[Tuple[str, str]] = []
+        self.elapsed = 0.0
+
+    def log(self) -> None:
+        """输出汇总日志，存在问题时逐条列出。"""
+        slowest = sorted(self.timings.items(), key=lambda item: -item[1])[:5]
+        logger.info(
+            'Preset warm-up finished: {} presets loaded in {:.1f} ms, {} '
+            'problems found. Slowest: {}', len(self.timings),
+            self.elapsed * 1e3, len(self.problems),
+            ', '.join(f'{name} ({seconds * 1e3:.1f} ms)'
+                      for name, seconds in slowest) or 'none')
+
+        if self.problems:
+            logger.warning(
+                'Problems found while warming up presets:\n{}',
+                '\n'.join(f'- [{name}] {problem}'
+                          for name, problem in self.problems))
+
+
+def validate(loaded: Preset) -> List[str]:
+    """
+    校验风格预设的内容。
+
+    参数：
+    - `loaded: preset.Preset`：编译后的风格预设。
+
+    返回：
+    - `List[str]`：问题描述列表，参见 `analyze.check()`。
+    """
+    return [message for _, _, message in check(loaded)]
+
+
+def warm_up(store: 'PresetStore',
+            workers: Optional[int] = None,
+            metrics: Optional[Metrics] = None) -> WarmupReport:
+    """
+    在线程池中并行加载并校验资源目录下的全部风格预设。
+
+    参数：
+    - `store: store.PresetStore`：风格预设存储。
+
+    可选参数：
+    - `workers: Optional[int]`：线程池大小。默认为 `None`，即使用
+      `concurrent.futures.ThreadPoolExecutor` 的默认值。
+    - `metrics: Optional[metrics.Metrics]`：运行指标。默认为 `None`。
+
+    返回：
+    - `WarmupReport`：预热结果汇总。
+    """
+    report = WarmupReport()
+    start = time.perf_counter()
+
+    def load(name: str) -> Tuple[str, float, List[str]]:
+        begin = time.perf_counter()
+        try:
+            loaded = store.load(name, metrics=metrics)
+            if isinstance(loaded, ShardedPreset):
+                loaded = loaded.materialize()
+        except exception.StyledstrError as err:
+            return name, time.perf_counter() - begin, [err.message]
+        # 预设文件无法读取或内容格式错误
+        except Exception as err:
+            message = f'{err.__class__.__name__}: {err}'
+            return name, time.perf_counter() - begin, [message]
+
+        elapsed = time.perf_counter() - begin
+        problems = validate(loaded) if isinstance(loaded, Preset) else []
+        return name, elapsed, problems
+
+    with ThreadPoolExecutor(workers, 'styledstr-warmup') as executor:
+        for name, elapsed, problems in executor.map(load, store.names()):
+            report.timings[name] = elapsed
+            report.problems.extend((name, problem) for problem in problems)
+
+    report.elapsed = time.perf_counter() - start
+    return report
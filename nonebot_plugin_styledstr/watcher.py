@@ -0,0 +1,129 @@
+"""风格预设热重载"""
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from nonebot.log import logger
+
+from . import exception
+from .cache import PresetCache, Signature
+from .index import ResourceIndex
+from .preset import Compiled, ShardedPreset, load_file, read_errors
+
+
+class PresetWatcher(object):
+    """
+    风格预设文件监视器。
+
+    在后台线程中定期检查资源目录与已缓存的预设文件：资源目录变化时重建索引，
+    预设文件被修改时仅重新编译该文件并整体替换缓存条目，预设文件被删除时移除
+    对应缓存。重新编译失败时保留最后一个有效版本。以目录形式存储的风格预设仅
+    移除发生变化的分片，不替换缓存条目。
+    """
+
+    def __init__(self,
+                 cache: PresetCache,
+                 index: ResourceIndex,
+                 interval: float = 1.0,
+                 loader: Callable[[Path], Compiled] = load_file,
+                 on_change: Optional[Callable[[Path], None]] = None) -> None:
+        """
+        初始化监视器。
+
+        参数：
+        - `cache: cache.PresetCache`：风格预设缓存。
+        - `index: index.ResourceIndex`：资源目录索引。
+
+        可选参数：
+        - `interval: float`：检查间隔（秒）。默认为 `1.0`。
+        - `loader: Callable[[pathlib.Path], preset.Compiled]`：预设文件加载函
+          数。默认为 `preset.load_file`。
+        - `on_change: Optional[Callable[[pathlib.Path], None]]`：预设文件被重
+          新加载或移除，或以目录形式存储的风格预设中有分片发生变化后调用的函
+          数，参数为预设文件或风格预设目录路径。默认为 `None`。
+        """
+        self.__cache = cache
+        self.__index = index
+        self.__interval = interval
+        self.__loader = loader
+        self.__on_change = on_change
+        self.__failed: Dict[Path, Signature] = {}
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """监视器是否正在运行。"""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self) -> None:
+        """启动后台监视线程。"""
+        if self.running:
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         name='styledstr-watcher',
+                                         daemon=True)
+        self.__thread.start()
+        logger.info('Watching preset files under resource path '
+                    f'{self.__index.respath.absolute()}.')
+
+    def stop(self) -> None:
+        """停止后台监视线程。"""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def poll(self) -> None:
+        """检查一次资源目录与已缓存的预设文件。"""
+        self.__index.refresh()
+
+        for path in self.__cache.paths():
+            entry = self.__cache.peek(path)
+            if entry is None:
+                continue
+
+            try:
+                signature = self.__cache.signature(path)
+            except OSError:
+                self.__cache.invalidate(path)
+                self.__failed.pop(path, None)
+                self.__notify(path)
+                logger.info(f'Preset file {path.name} removed.')
+                continue
+
+            if signature in (entry[0], self.__failed.get(path)):
+                # 以目录形式存储的风格预设中的分片文件可能被原地修改
+                if isinstance(entry[1], ShardedPreset):
+                    if entry[1].refresh():
+                        self.__notify(path)
+                    self.__cache.reweigh(path)
+                continue
+
+            try:
+                loaded = self.__loader(path)
+            except (exception.PresetFileError, *read_errors()) as err:
+                reason = getattr(err, 'message', err)
+                self.__failed[path] = signature
+                logger.error(f'Failed to reload preset file {path.name}, the '
+                             f'last valid version is kept: {reason}')
+                continue
+
+            self.__cache.put(path, signature, loaded)
+            self.__failed.pop(path, None)
+            self.__notify(path)
+            logger.info(f'Preset file {path.name} reloaded.')
+
+    def __notify(self, path: Path) -> None:
+        """调用 `on_change`。"""
+        if self.__on_change is not None:
+            self.__on_change(path)
+
+    def __run(self) -> None:
+        while not self.__stop.wait(self.__interval):
+            try:
+                self.poll()
+            except Exception as err:
+                logger.exception(f'Preset watcher failed: {err}')
@@ -0,0 +1,112 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture()
+def respath(tmp_path: Path) -> Path:
+    (tmp_path / 'default.yaml').write_text('help:\n'
+                                           '  prompt: 你好，$name$\n'
+                                           '  choices: [a, b, c]\n'
+                                           '  empty: []\n'
+                                           '  reserved: $token$\n'
+                                           '  padded: $Token:>5$\n'
+                                           f'  long: ${"a" * 25}$\n'
+                                           'bot: $name$ $count:d$\n')
+    (tmp_path / 'default.json').write_text('{"help": {"prompt": "JSON"}}')
+    (tmp_path / 'broken.yaml').write_text('help: [unclosed\n')
+    directory = tmp_path / 'sharded'
+    directory.mkdir()
+    (directory / 'help.yaml').write_text('prompt:\n  text: sharded\n')
+    (directory / 'help.yml').write_text('prompt: shadowed\n')
+    return tmp_path
+
+
+@pytest.mark.usefixtures('setup')
+class TestAnalyze(object):
+    """测试风格预设离线分析"""
+
+    def test_analyze(self, respath: Path) -> None:
+        """
+        测试分析资源目录下的风格预设。
+
+        测试预期：按 .json > .yaml > .yml 的优先级选取预设文件，统计结果与问
+        题列表正确。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot_plugin_styledstr.analyze import analyze
+
+        report = analyze(respath)
+        presets = report['presets']
+
+        assert set(presets) == {'broken', 'default', 'sharded'}
+        assert presets['default']['path'].endswith('default.json')
+        assert presets['default']['tokens'] == 1
+        assert presets['sharded']['max_depth'] == 3
+        assert 'error' in presets['broken']
+
+        kinds = {(problem['preset'], problem['kind'])
+                 for problem in report['problems']}
+        assert kinds == {('default', 'shadowed_file'),
+                         ('sharded', 'shadowed_file'),
+                         ('broken', 'unreadable')}
+
+    def test_analyze_preset(self, respath: Path) -> None:
+        """
+        测试分析单个风格预设。
+
+        测试预期：统计列表与占位符，并报告无效内容、保留名称与过长的占位符。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot_plugin_styledstr.analyze import analyze_preset
+
+        result = analyze_preset(respath / 'default.yaml')
+
+        assert result['tokens'] == 6
+        assert result['max_depth'] == 2
+        assert result['size_bytes'] > 0
+        assert result['largest_lists'] == [{
+            'token': 'help.choices',
+            'length': 3
+        }]
+        assert result['placeholders'] == {'count': 1, 'name': 2}
+        assert [(kind, token) for kind, token, _ in result['problems']] == [
+            ('invalid_value', 'help.empty'),
+            ('placeholder_too_long', 'help.long'),
+            ('reserved_placeholder', 'help.padded'),
+            ('reserved_placeholder', 'help.reserved'),
+        ]
+
+    def test_command_line(self, respath: Path) -> None:
+        """
+        测试以 `python -m nonebot_plugin_styledstr` 运行离线分析。
+
+        测试预期：输出 JSON 格式的分析结果；指定 `--strict` 且存在问题时以非
+        零状态码退出。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        command = [sys.executable, '-m', 'nonebot_plugin_styledstr']
+        cwd = Path(__file__).parents[1]
+
+        result = subprocess.run([*command, str(respath)],
+                                capture_output=True,
+                                cwd=cwd,
+                                text=True)
+        report = json.loads(result.stdout)
+        assert result.returncode == 0
+        assert set(report['presets']) == {'broken', 'default', 'sharded'}
+
+        result = subprocess.run([*command, str(respath), '--strict'],
+                                capture_output=True,
+                                cwd=cwd,
+                                text=True)
+        assert result.returncode == 1
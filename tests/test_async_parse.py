@@ -0,0 +1,112 @@
+import asyncio
+import warnings
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.usefixtures('get_parser')
+class TestAsyncParse(object):
+    """测试异步解析字符串标签"""
+
+    def test_aparse(self) -> None:
+        """
+        测试异步解析字符串标签。
+
+        测试预期：解析结果与 `parse()` 一致。
+        """
+        result = asyncio.run(
+            self.parser.aparse('placeholder.testchamber_text', text='pass'))
+        assert result == 'pass'
+
+    def test_aparse_awaitable(self) -> None:
+        """
+        测试以可等待对象作为替换内容异步解析字符串标签。
+
+        测试预期：可等待对象被等待后替换占位符。
+        """
+
+        async def fetch() -> str:
+            return 'pass'
+
+        result = asyncio.run(
+            self.parser.aparse('placeholder.testchamber_text', text=fetch()))
+        assert result == 'pass'
+
+        pairs = [('placeholder.testchamber_text', {
+            'text': fetch
+        }), 'token_value']
+        results = asyncio.run(self.parser.aparse_many(pairs, preset='test'))
+        assert results == ['pass', 'Layer 1']
+
+    def test_aparse_many(self) -> None:
+        """
+        测试异步批量解析字符串标签。
+
+        测试预期：按顺序返回解析结果。
+        """
+        results = asyncio.run(
+            self.parser.aparse_many(['token_value', 'not,a,valid,token'],
+                                    preset='test'))
+        assert results == ['Layer 1', '']
+
+    @pytest.mark.usefixtures('caplog')
+    def test_aparse_with_invalid_preset(self) -> None:
+        """
+        测试以不存在的风格预设异步解析字符串标签。
+
+        测试预期：返回空字符串并输出日志。
+        """
+        # 共享同一存储的解析器共享异常日志限流，使用其他测试未使用的风格预设
+        result = asyncio.run(
+            self.parser.aparse('token_value', preset='nonexistence_async'))
+        assert result == ''
+        assert 'Cannot find any valid file' in self.caplog.text
+
+    def test_share_inflight_load(self, tmp_path: Path, caplog) -> None:
+        """
+        测试并发请求同一未加载的风格预设。
+
+        测试预期：预设文件仅被读取一次。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        (tmp_path / 'cold.yaml').write_text('test:\n  status: cold\n')
+        config = {'styledstr_respath': tmp_path, 'styledstr_preset': 'cold'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        async def main():
+            return await asyncio.gather(*(parser.aparse('test.status')
+                                          for _ in range(10)))
+
+        assert asyncio.run(main()) == ['cold'] * 10
+        assert caplog.text.count('Preset file cold.yaml loaded.') == 1
+
+    def test_close_unused_coroutine(self) -> None:
+        """
+        测试以字符串中不存在的占位符的协程对象作为替换内容异步解析字符串标签。
+
+        测试预期：未被等待的协程对象被关闭，不输出协程从未被等待的警告。
+        """
+
+        async def fetch() -> str:
+            return 'pass'
+
+        unused, missing, invalid = fetch(), fetch(), fetch()
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert asyncio.run(self.parser.aparse('token_value',
+                                                  text=unused)) == 'Layer 1'
+            assert asyncio.run(
+                self.parser.aparse('not,a,valid,token', text=missing)) == ''
+            assert asyncio.run(
+                self.parser.aparse('token_value',
+                                   preset='nonexistence',
+                                   text=invalid)) == ''
+
+        for coroutine in (unused, missing, invalid):
+            assert coroutine.cr_frame is None
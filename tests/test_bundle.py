@@ -0,0 +1,124 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+assets_path = Path(__file__).parent / 'assets'
+
+
+@pytest.mark.usefixtures('setup')
+class TestBundle(object):
+    """测试风格预设包"""
+
+    @pytest.fixture()
+    def bundle_file(self, tmp_path: Path) -> Path:
+        from nonebot_plugin_styledstr.bundle import build_bundle
+
+        respath = tmp_path / 'presets'
+        respath.mkdir()
+        for name in ('default', 'customer_service', 'vip', 'plain'):
+            shutil.copy(assets_path / 'test_inheritance' / f'{name}.yaml',
+                        respath)
+
+        bundle_file = tmp_path / 'presets.bundle'
+        build_bundle(respath, bundle_file, {'plain': 'default'})
+        return bundle_file
+
+    def test_same_as_compiled_preset(self, tmp_path: Path) -> None:
+        """
+        测试风格预设包与编译后的风格预设一致。
+
+        测试预期：所有字符串标签的模板内容、片段与是否随机抽取均一致。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.bundle import Bundle, build_bundle
+        from nonebot_plugin_styledstr.preset import load_file
+
+        bundle_file = tmp_path / 'presets.bundle'
+        assert 'test' in build_bundle(assets_path, bundle_file)
+
+        expected = load_file(assets_path / 'test.yaml')
+        loaded = Bundle(bundle_file).get('test')
+
+        assert len(loaded) == len(expected)
+        for token, entry in expected.tokens.items():
+            template = loaded.lookup(token)
+            assert loaded.is_random(token) == expected.is_random(token)
+            if isinstance(entry, tuple):
+                assert template.text in {item.text for item in entry}
+            else:
+                assert template.text == entry.text
+                assert template.segments == entry.segments
+                assert template.names == entry.names
+
+    @pytest.mark.parametrize('preset, token, expected', [
+        ('vip', 'help.footer', '更多帮助请联系管理员'),
+        ('vip', 'bot', 'VIP 专属客服'),
+        ('plain', 'bot.name', 'Bot'),
+        ('default.yaml', 'help.prompt', '请输入你需要获取的帮助内容'),
+    ])
+    def test_parse_with_bundle(self, bundle_file: Path, preset: str,
+                               token: str, expected: str) -> None:
+        """
+        测试使用风格预设包解析字符串标签。
+
+        测试预期：继承链已在编译时合并，解析结果与预设文件一致。
+
+        参数：
+        - `bundle_file: pathlib.Path`：风格预设包文件。
+        - `preset: str`：风格预设。
+        - `token: str`：字符串标签。
+        - `expected: str`：预期字符串。
+        """
+        from nonebot import require
+
+        config = {'styledstr_bundle': bundle_file}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse(token, preset=preset) == expected
+
+    @pytest.mark.parametrize('preset, token, log', [
+        ('vip', 'bot.name', 'Token "bot.name"'),
+        ('vip', 'help', 'The value of the token "help"'),
+        ('nonexistent', 'help', 'Cannot find preset "nonexistent"'),
+    ])
+    def test_invalid_in_bundle(self, bundle_file: Path, caplog, preset: str,
+                               token: str, log: str) -> None:
+        """
+        测试风格预设包中不存在的风格预设与无效的字符串标签。
+
+        测试预期：返回空字符串并输出日志。
+
+        参数：
+        - `bundle_file: pathlib.Path`：风格预设包文件。
+        - `caplog`：捕捉日志输出固件。
+        - `preset: str`：风格预设。
+        - `token: str`：字符串标签。
+        - `log: str`：预期日志。
+        """
+        from nonebot import require
+
+        config = {'styledstr_bundle': bundle_file}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse(token, preset=preset) == ''
+        assert log in caplog.text
+
+    def test_reject_invalid_file(self, tmp_path: Path) -> None:
+        """
+        测试打开无效的风格预设包。
+
+        测试预期：抛出 `ValueError`。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.bundle import Bundle
+
+        invalid_file = tmp_path / 'invalid.bundle'
+        invalid_file.write_bytes(b'\0' * 64)
+
+        with pytest.raises(ValueError):
+            Bundle(invalid_file)
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, List
+
+import pytest
+
+THREADS = 32
+
+
+@pytest.fixture()
+def reads(monkeypatch) -> Counter:
+    """记录各预设文件被读取的次数，并放慢读取以扩大竞争窗口。"""
+    from nonebot_plugin_styledstr import preset
+
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    original = preset._read
+
+    def read(path: Path) -> Any:
+        with lock:
+            counts[path.name] += 1
+        time.sleep(0.05)
+        return original(path)
+
+    monkeypatch.setattr(preset, '_read', read)
+    return counts
+
+
+def hammer(func: Callable[[], Any], threads: int = THREADS) -> List[Any]:
+    """在多个线程中同时调用函数，返回各线程的结果。"""
+    barrier = threading.Barrier(threads)
+    results: List[Any] = [None] * threads
+
+    def run(index: int) -> None:
+        barrier.wait()
+        results[index] = func()
+
+    workers = [
+        threading.Thread(target=run, args=(i, )) for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+@pytest.mark.usefixtures('setup')
+class TestConcurrentLoading(object):
+    """测试并发加载风格预设"""
+
+    @staticmethod
+    def get_parser(respath: Path, preset: str) -> Any:
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': preset}
+        return require('nonebot_plugin_styledstr').init(config)
+
+    def test_single_load_from_threads(self, tmp_path: Path,
+                                      reads: Counter) -> None:
+        """
+        测试多个线程同时解析未加载的风格预设。
+
+        测试预期：预设文件仅被读取一次，所有线程均获得正确结果；预设文件变化
+        后同样仅被重新读取一次。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `reads: collections.Counter`：预设文件读取次数。
+        """
+        preset_file = tmp_path / 'cold.yaml'
+        preset_file.write_text('status: cold\n')
+        parser = self.get_parser(tmp_path, 'cold')
+
+        assert hammer(lambda: parser.parse('status')) == ['cold'] * THREADS
+        assert reads['cold.yaml'] == 1
+
+        preset_file.write_text('status: warm\n')
+        stat = preset_file.stat()
+        os.utime(preset_file,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert hammer(lambda: parser.parse('status')) == ['warm'] * THREADS
+        assert reads['cold.yaml'] == 2
+
+    def test_single_load_inheritance(self, tmp_path: Path,
+                                     reads: Counter) -> None:
+        """
+        测试多个线程同时解析未加载的继承风格预设。
+
+        测试预期：继承链中的每个预设文件仅被读取一次。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `reads: collections.Counter`：预设文件读取次数。
+        """
+        (tmp_path / 'base.yaml').write_text('footer: base\nname: base\n')
+        (tmp_path / 'derived.yaml').write_text('__base__: base\n'
+                                               'name: derived\n')
+        parser = self.get_parser(tmp_path, 'derived')
+
+        results = hammer(lambda: parser.parse_many(['name', 'footer']))
+
+        assert results == [['derived', 'base']] * THREADS
+        assert reads == {'base.yaml': 1, 'derived.yaml': 1}
+
+    def test_single_load_from_event_loops(self, tmp_path: Path,
+                                          reads: Counter) -> None:
+        """
+        测试多个线程中的事件循环同时异步解析未加载的风格预设。
+
+        测试预期：预设文件仅被读取一次。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `reads: collections.Counter`：预设文件读取次数。
+        """
+        (tmp_path / 'cold.yaml').write_text('status: cold\n')
+        parser = self.get_parser(tmp_path, 'cold')
+
+        async def main() -> List[str]:
+            return await asyncio.gather(*(parser.aparse('status')
+                                          for _ in range(8)))
+
+        results = hammer(lambda: asyncio.run(main()), threads=8)
+
+        assert results == [['cold'] * 8] * 8
+        assert reads['cold.yaml'] == 1
+
+    def test_single_shard_load(self, tmp_path: Path, reads: Counter) -> None:
+        """
+        测试多个线程同时查找以目录形式存储的风格预设中未读取的分片。
+
+        测试预期：分片文件仅被读取一次。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `reads: collections.Counter`：预设文件读取次数。
+        """
+        directory = tmp_path / 'sharded'
+        directory.mkdir()
+        (directory / 'help.yaml').write_text('prompt: sharded\n')
+        parser = self.get_parser(tmp_path, 'sharded')
+
+        assert hammer(lambda: parser.parse('help.prompt')) == (['sharded'] *
+                                                               THREADS)
+        assert reads['help.yaml'] == 1
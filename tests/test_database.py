@@ -0,0 +1,250 @@
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+assets_path = Path(__file__).parent / 'assets'
+
+
+@pytest.mark.usefixtures('setup')
+class TestDatabase(object):
+    """测试 SQLite 风格预设数据库"""
+
+    @pytest.fixture()
+    def database_file(self, tmp_path: Path) -> Path:
+        from nonebot_plugin_styledstr.database import build_database
+
+        respath = tmp_path / 'presets'
+        respath.mkdir()
+        for name in ('default', 'customer_service', 'vip', 'plain'):
+            shutil.copy(assets_path / 'test_inheritance' / f'{name}.yaml',
+                        respath)
+
+        database_file = tmp_path / 'presets.db'
+        build_database(respath, database_file, {'plain': 'default'})
+        return database_file
+
+    def test_same_as_compiled_preset(self, tmp_path: Path) -> None:
+        """
+        测试风格预设数据库与编译后的风格预设一致。
+
+        测试预期：所有字符串标签的内容、片段与是否随机抽取均一致。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.database import Database, build_database
+        from nonebot_plugin_styledstr.preset import load_file
+
+        database_file = tmp_path / 'presets.db'
+        assert 'test' in build_database(assets_path, database_file)
+
+        expected = load_file(assets_path / 'test.yaml')
+        database = Database(database_file)
+        loaded = database.get('test')
+
+        assert len(loaded) == len(expected)
+        for token, entry in expected.tokens.items():
+            template = loaded.lookup(token)
+            assert loaded.is_random(token) == expected.is_random(token)
+            if isinstance(entry, tuple):
+                assert template.text in {item.text for item in entry}
+            else:
+                assert template.text == entry.text
+                assert template.segments == entry.segments
+        database.close()
+
+    def test_same_random_rule_for_all_sources(self, tmp_path: Path) -> None:
+        """
+        测试各风格预设来源判断字符串标签是否随机抽取的规则。
+
+        测试预期：编译后的风格预设、以目录形式存储的风格预设、风格预设包与风
+        格预设数据库的结果一致，内容为仅有一项的列表时同样视为随机抽取。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.bundle import Bundle, build_bundle
+        from nonebot_plugin_styledstr.database import Database, build_database
+        from nonebot_plugin_styledstr.preset import load_file
+
+        contents = ('text: 你好\n'
+                    'single: [唯一]\n'
+                    'choices: [a, b]\n'
+                    'empty: []\n')
+        respath = tmp_path / 'presets'
+        (respath / 'sharded').mkdir(parents=True)
+        (respath / 'default.yaml').write_text(contents)
+        (respath / 'sharded' / 'help.yaml').write_text(contents)
+        build_bundle(respath, tmp_path / 'presets.bundle')
+        build_database(respath, tmp_path / 'presets.db')
+
+        database = Database(tmp_path / 'presets.db')
+        sources = {
+            'preset': load_file(respath / 'default.yaml'),
+            'bundle': Bundle(tmp_path / 'presets.bundle').get('default'),
+            'database': database.get('default'),
+        }
+        sharded = load_file(respath / 'sharded')
+
+        expected = {
+            'text': False,
+            'single': True,
+            'choices': True,
+            'empty': False,
+            'missing': False
+        }
+        for name, loaded in sources.items():
+            assert {token: loaded.is_random(token)
+                    for token in expected} == expected, name
+        sharded.lookup('help.text')
+        assert {
+            token: sharded.is_random(f'help.{token}')
+            for token in expected
+        } == expected
+        database.close()
+
+    @pytest.mark.parametrize('preset, token, expected', [
+        ('vip', 'help.footer', '更多帮助请联系管理员'),
+        ('vip', 'bot', 'VIP 专属客服'),
+        ('plain', 'bot.name', 'Bot'),
+        ('default.yaml', 'help.prompt', '请输入你需要获取的帮助内容'),
+    ])
+    def test_parse_with_database(self, database_file: Path, preset: str,
+                                 token: str, expected: str) -> None:
+        """
+        测试使用风格预设数据库解析字符串标签。
+
+        测试预期：继承链已在导入时合并，解析结果与预设文件一致。
+
+        参数：
+        - `database_file: pathlib.Path`：风格预设数据库文件。
+        - `preset: str`：风格预设。
+        - `token: str`：字符串标签。
+        - `expected: str`：预期字符串。
+        """
+        from nonebot import require
+
+        config = {'styledstr_database': database_file}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse(token, preset=preset) == expected
+
+    @pytest.mark.parametrize('preset, token, log', [
+        ('vip', 'bot.name', 'Token "bot.name"'),
+        ('vip', 'help', 'The value of the token "help"'),
+        ('nonexistent', 'help', 'Cannot find preset "nonexistent"'),
+    ])
+    def test_invalid_in_database(self, database_file: Path, caplog,
+                                 preset: str, token: str, log: str) -> None:
+        """
+        测试风格预设数据库中不存在的风格预设与无效的字符串标签。
+
+        测试预期：返回空字符串并输出日志。
+
+        参数：
+        - `database_file: pathlib.Path`：风格预设数据库文件。
+        - `caplog`：捕捉日志输出固件。
+        - `preset: str`：风格预设。
+        - `token: str`：字符串标签。
+        - `log: str`：预期日志。
+        """
+        from nonebot import require
+
+        config = {'styledstr_database': database_file}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse(token, preset=preset) == ''
+        assert log in caplog.text
+
+    def test_lookup_from_threads(self, database_file: Path) -> None:
+        """
+        测试在多个线程中查找字符串标签。
+
+        测试预期：各线程使用各自的数据库连接，查找结果正确。
+
+        参数：
+        - `database_file: pathlib.Path`：风格预设数据库文件。
+        """
+        from nonebot_plugin_styledstr.database import Database
+
+        database = Database(database_file)
+        results = []
+
+        def lookup() -> None:
+            results.append(database.get('vip').lookup('help.prompt').text)
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['亲，请问您需要什么帮助？'] * 8
+        database.close()
+
+    def test_reject_invalid_file(self, tmp_path: Path) -> None:
+        """
+        测试打开无效的风格预设数据库。
+
+        测试预期：文件不存在时抛出 `OSError`，文件无效时抛出 `ValueError`。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.database import Database
+
+        with pytest.raises(OSError):
+            Database(tmp_path / 'missing.db')
+
+        invalid_file = tmp_path / 'invalid.db'
+        invalid_file.write_bytes(b'\0' * 64)
+
+        with pytest.raises(ValueError):
+            Database(invalid_file)
+
+    def test_reject_bundle_and_database(self, database_file: Path) -> None:
+        """
+        测试同时配置风格预设包与风格预设数据库。
+
+        测试预期：抛出 `ValueError`。
+
+        参数：
+        - `database_file: pathlib.Path`：风格预设数据库文件。
+        """
+        from nonebot_plugin_styledstr.store import PresetStore
+
+        with pytest.raises(ValueError):
+            PresetStore(database_file.parent,
+                        bundle=database_file,
+                        database=database_file)
+
+    def test_custom_source(self, tmp_path: Path) -> None:
+        """
+        测试以配置项传入自定义风格预设来源。
+
+        测试预期：从自定义来源获取风格预设。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot import require
+        from nonebot_plugin_styledstr.preset import Preset
+        from nonebot_plugin_styledstr.source import PresetSource
+
+        class MemorySource(PresetSource):
+
+            def names(self):
+                return ['memory']
+
+            def get(self, preset):
+                return Preset({'greeting': '你好，$name$'})
+
+        config = {
+            'styledstr_respath': tmp_path,
+            'styledstr_source': MemorySource()
+        }
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse('greeting', name='Bot') == '你好，Bot'
@@ -0,0 +1,111 @@
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.usefixtures('setup')
+class TestDiskCache(object):
+    """测试编译后风格预设的磁盘缓存"""
+
+    @pytest.fixture()
+    def preset_file(self, tmp_path: Path) -> Path:
+        preset_file = tmp_path / 'cached.yaml'
+        preset_file.write_text('test:\n  status: [cached, stored]\n')
+        return preset_file
+
+    def test_skip_parsing_with_valid_cache(self, tmp_path: Path,
+                                           preset_file: Path) -> None:
+        """
+        测试缓存有效时跳过预设文件解析。
+
+        测试预期：第二次加载时不调用加载函数，且内容与编译结果一致。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `preset_file: pathlib.Path`：预设文件。
+        """
+        from nonebot_plugin_styledstr.diskcache import DiskCache
+        from nonebot_plugin_styledstr.preset import load_file
+
+        calls = []
+
+        def loader(path: Path):
+            calls.append(path)
+            return load_file(path)
+
+        cache_dir = tmp_path / '.styledstr-cache'
+        DiskCache(cache_dir, loader).load(preset_file)
+        loaded = DiskCache(cache_dir, loader).load(preset_file)
+
+        assert len(calls) == 1
+        assert loaded.lookup('test.status').text in {'cached', 'stored'}
+
+    def test_reuse_cache_with_same_contents(self, tmp_path: Path,
+                                            preset_file: Path) -> None:
+        """
+        测试预设文件修改时间变化但内容未变化。
+
+        测试预期：依据内容摘要继续使用缓存。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `preset_file: pathlib.Path`：预设文件。
+        """
+        from nonebot_plugin_styledstr.diskcache import DiskCache
+
+        cache = DiskCache(tmp_path / '.styledstr-cache')
+        cache.load(preset_file)
+
+        stat = preset_file.stat()
+        os.utime(preset_file,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        def loader(path: Path):
+            raise AssertionError('preset file should not be parsed')
+
+        DiskCache(tmp_path / '.styledstr-cache', loader).load(preset_file)
+
+    def test_invalidate_cache_on_change(self, tmp_path: Path,
+                                        preset_file: Path) -> None:
+        """
+        测试预设文件内容变化后重新编译。
+
+        测试预期：加载结果与新内容一致。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `preset_file: pathlib.Path`：预设文件。
+        """
+        from nonebot_plugin_styledstr.diskcache import DiskCache
+
+        cache = DiskCache(tmp_path / '.styledstr-cache')
+        cache.load(preset_file)
+
+        preset_file.write_text('test:\n  status: changed content\n')
+        loaded = cache.load(preset_file)
+
+        assert loaded.lookup('test.status').text == 'changed content'
+
+    def test_parse_with_disk_cache(self, tmp_path: Path,
+                                   preset_file: Path) -> None:
+        """
+        测试启用磁盘缓存后解析字符串标签。
+
+        测试预期：正常解析并在缓存目录中写入缓存文件。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `preset_file: pathlib.Path`：预设文件。
+        """
+        from nonebot import require
+
+        config = {
+            'styledstr_respath': tmp_path,
+            'styledstr_preset': 'cached',
+            'styledstr_disk_cache': True
+        }
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse('test.status') in {'cached', 'stored'}
+        assert list((tmp_path / '.styledstr-cache').glob('*.pickle'))
@@ -0,0 +1,110 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+assets_path = Path(__file__).parent / 'assets' / 'test_inheritance'
+
+
+@pytest.mark.usefixtures('setup')
+class TestInheritance(object):
+    """测试风格预设继承"""
+
+    @pytest.fixture()
+    def parser(self):
+        from nonebot import require
+
+        config = {'styledstr_respath': assets_path}
+        return require('nonebot_plugin_styledstr').init(config)
+
+    @pytest.mark.parametrize('preset, token, expected', [
+        ('customer_service', 'help.prompt', '亲，请问您需要什么帮助？'),
+        ('customer_service', 'help.footer', '更多帮助请联系管理员'),
+        ('customer_service', 'bot.name', 'Bot'),
+        ('vip', 'help.prompt', '亲，请问您需要什么帮助？'),
+        ('vip', 'help.footer', '更多帮助请联系管理员'),
+        ('vip', 'bot', 'VIP 专属客服'),
+    ])
+    def test_fallback_to_base(self, parser, preset: str, token: str,
+                              expected: str) -> None:
+        """
+        测试从基础风格预设中获取字符串。
+
+        测试预期：覆盖预设中不存在的字符串标签从继承链中获取。
+
+        参数：
+        - `preset: str`：风格预设。
+        - `token: str`：字符串标签。
+        - `expected: str`：预期字符串。
+        """
+        assert parser.parse(token, preset=preset) == expected
+
+    def test_hide_base_token(self, parser, caplog) -> None:
+        """
+        测试覆盖预设屏蔽基础预设中的字符串标签。
+
+        测试预期：`vip` 中的 `bot` 为字符串，`bot.name` 不再可用。
+
+        参数：
+        - `caplog`：捕捉日志输出固件。
+        """
+        assert parser.parse('bot.name', preset='vip') == ''
+        assert 'Token "bot.name"' in caplog.text
+
+    def test_base_in_config(self) -> None:
+        """
+        测试在插件配置中声明基础风格预设。
+
+        测试预期：配置中的声明生效。
+        """
+        from nonebot import require
+
+        config = {
+            'styledstr_respath': assets_path,
+            'styledstr_bases': {
+                'Plain': 'default'
+            }
+        }
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse('help.prompt', preset='plain') == 'plain'
+        assert parser.parse('bot.name', preset='plain') == 'Bot'
+
+    def test_circular_inheritance(self, parser, caplog) -> None:
+        """
+        测试继承链存在循环。
+
+        测试预期：返回空字符串并输出日志。
+
+        参数：
+        - `caplog`：捕捉日志输出固件。
+        """
+        assert parser.parse('test', preset='loop_a') == ''
+        assert 'Circular preset inheritance detected' in caplog.text
+
+    def test_rebuild_on_member_change(self, tmp_path: Path) -> None:
+        """
+        测试继承链中的预设文件变化后重新合并。
+
+        测试预期：解析结果随基础预设文件内容更新。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot import require
+
+        for name in ('default.yaml', 'customer_service.yaml'):
+            shutil.copy(assets_path / name, tmp_path / name)
+
+        config = {'styledstr_respath': tmp_path}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        assert parser.parse('bot.name', preset='customer_service') == 'Bot'
+
+        base_file = tmp_path / 'default.yaml'
+        base_file.write_text('bot:\n  name: Renamed\n')
+        stat = base_file.stat()
+        os.utime(base_file,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert parser.parse('bot.name', preset='customer_service') == 'Renamed'
@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.mark.usefixtures('get_parser')
+class TestMetrics(object):
+    """测试解析器运行指标"""
+
+    def test_stats_disabled(self) -> None:
+        """
+        测试未启用运行指标记录。
+
+        测试预期：返回空字典。
+        """
+        assert self.parser.stats() == {}
+
+    def test_record_metrics(self) -> None:
+        """
+        测试记录运行指标。
+
+        测试预期：计数器、直方图与命中次数与解析过程一致。
+        """
+        metrics = self.parser.enable_metrics()
+        try:
+            self.parser.parse('token_value')
+            self.parser.parse('token_value')
+            self.parser.parse('placeholder.testchamber_text', text='pass')
+            self.parser.parse('not,a,valid,token')
+            self.parser.parse('token_value', preset='nonexistence')
+
+            stats = self.parser.stats(top=1)
+        finally:
+            self.parser.disable_metrics()
+
+        counters = stats['counters']
+        assert counters['parses'] == 4
+        assert counters['cache_hits'] + counters['cache_misses'] == 4
+        assert counters['token_errors'] == 1
+        assert counters['preset_errors'] == 1
+        assert stats['histograms']['lookup']['count'] == 3
+        assert stats['histograms']['render']['count'] == 3
+        assert stats['presets'] == [('test', 4)]
+        assert stats['tokens'] == [('token_value', 2)]
+        assert metrics.snapshot()['counters'] == counters
+
+    def test_metrics_hook(self) -> None:
+        """
+        测试运行指标钩子函数。
+
+        测试预期：钩子函数收到计数器与直方图记录。
+        """
+        events = []
+
+        def hook(kind: str, name: str, value: float) -> None:
+            events.append((kind, name))
+
+        self.parser.enable_metrics(hook)
+        try:
+            self.parser.parse('token_value')
+        finally:
+            self.parser.disable_metrics()
+
+        assert ('counter', 'parses') in events
+        assert ('histogram', 'lookup') in events
+        assert ('histogram', 'render') in events
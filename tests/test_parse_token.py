@@ -46,3 +46,48 @@ class TestParseToken(object):
         """
         result = self.parser.parse('token_with_multiple_values')
         assert result in {'value 1', 'value 2', 'value 3'}
+
+    def test_parse_many(self) -> None:
+        """
+        测试批量解析字符串标签。
+
+        测试预期：按顺序返回解析结果，解析异常的字符串标签对应空字符串。
+        """
+        results = self.parser.parse_many([
+            'token_value', ('token.value', None),
+            ('placeholder.testchamber_text', {
+                'text': 'pass'
+            }), 'token.layer', 'not,a,valid,token'
+        ])
+        assert results == ['Layer 1', 'Layer 2', 'pass', '', '']
+
+    def test_parse_many_with_mapping(self) -> None:
+        """
+        测试以映射形式批量解析字符串标签。
+
+        测试预期：按映射顺序返回解析结果。
+        """
+        results = self.parser.parse_many({
+            'test.dirname': None,
+            'placeholder.testchamber_multiple.normal': {
+                'subject': 'The quick brown fox',
+                'action': 'jumps over',
+                'object': 'the lazy dog'
+            }
+        })
+        assert results == [
+            'assets/test.yaml', 'The quick brown fox jumps over the lazy dog.'
+        ]
+
+    @pytest.mark.usefixtures('caplog')
+    def test_parse_many_with_invalid_preset(self) -> None:
+        """
+        测试以不存在的风格预设批量解析字符串标签。
+
+        测试预期：所有结果为空字符串，异常日志仅输出一次。
+        """
+        # 共享同一存储的解析器共享异常日志限流，使用其他测试未使用的风格预设
+        results = self.parser.parse_many(['token_value', 'token.value'],
+                                         preset='nonexistence_many')
+        assert results == ['', '']
+        assert self.caplog.text.count('Cannot find any valid file') == 1
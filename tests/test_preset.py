@@ -0,0 +1,79 @@
+import pytest
+
+contents = {
+    'token_value': 'Layer 1',
+    'token': {
+        'value': 2,
+        'layer': {
+            'value': True
+        }
+    },
+    'multiple': ['value 1', 2, 3.0],
+    'empty': [],
+    'nothing': None,
+    404: 'unreachable'
+}
+
+
+@pytest.mark.usefixtures('setup')
+class TestPreset(object):
+    """测试编译风格预设"""
+
+    def test_flatten_tokens(self) -> None:
+        """
+        测试展开字符串标签索引。
+
+        测试预期：字符串标签以点记法展开，内容预先转换为字符串。
+        """
+        from nonebot_plugin_styledstr.preset import Preset
+
+        preset = Preset(contents)
+        assert sorted(preset.tokens) == [
+            'multiple', 'token.layer.value', 'token.value', 'token_value'
+        ]
+        assert preset.lookup('token.layer.value').text == 'True'
+        assert preset.lookup('multiple').text in {'value 1', '2', '3.0'}
+
+    @pytest.mark.parametrize('token, expected', [
+        ('token', 'is not a numeric'),
+        ('token.layer', 'is not a numeric'),
+        ('empty', 'is not a numeric'),
+        ('nothing', 'is not a numeric'),
+        ('404', 'is regarded as invalid or nonexistent'),
+        ('token_value.layer', 'is regarded as invalid or nonexistent'),
+    ])
+    def test_lookup_invalid_token(self, token: str, expected: str) -> None:
+        """
+        测试查找无效的字符串标签。
+
+        测试预期：抛出 `TokenError` 异常，且异常信息包含 `expected`。
+
+        参数：
+        - `token: str`：字符串标签。
+        - `expected: str`：预期异常信息。
+        """
+        from nonebot_plugin_styledstr.exception import TokenError
+        from nonebot_plugin_styledstr.preset import Preset
+
+        with pytest.raises(TokenError) as err:
+            Preset(contents).lookup(token)
+        assert expected in err.value.message
+
+    def test_cache_missing_token(self) -> None:
+        """
+        测试缓存已知无效的字符串标签。
+
+        测试预期：重复查找同一无效字符串标签时复用同一异常对象。
+        """
+        from nonebot_plugin_styledstr.exception import TokenError
+        from nonebot_plugin_styledstr.preset import Preset
+
+        preset = Preset(contents)
+        errors = []
+        for _ in range(2):
+            with pytest.raises(TokenError) as err:
+                preset.lookup('missing')
+            errors.append(err.value)
+
+        assert errors[0] is errors[1]
+        assert 'missing' in preset.missing
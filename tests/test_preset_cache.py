@@ -0,0 +1,206 @@
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture()
+def respath(tmp_path: Path) -> Path:
+    (tmp_path / 'cached.yaml').write_text('test:\n  status: before\n')
+    return tmp_path
+
+
+@pytest.mark.usefixtures('setup')
+class TestPresetCache(object):
+    """测试风格预设缓存"""
+
+    def test_reuse_cached_preset(self, respath: Path, caplog) -> None:
+        """
+        测试预设文件未变化时复用缓存内容。
+
+        测试预期：预设文件仅被读取一次。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'cached'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        for _ in range(3):
+            assert parser.parse('test.status') == 'before'
+        assert caplog.text.count('Preset file cached.yaml loaded.') == 1
+
+    def test_reload_changed_preset(self, respath: Path) -> None:
+        """
+        测试预设文件变化后重新读取。
+
+        测试预期：解析结果随文件内容更新。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'cached'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        assert parser.parse('test.status') == 'before'
+
+        preset_file = respath / 'cached.yaml'
+        preset_file.write_text('test:\n  status: after_change\n')
+        stat = preset_file.stat()
+        os.utime(preset_file,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert parser.parse('test.status') == 'after_change'
+
+    def test_invalidate_and_clear_cache(self, respath: Path, caplog) -> None:
+        """
+        测试手动使缓存失效。
+
+        测试预期：`invalidate()` 与 `clear_cache()` 后重新读取预设文件。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'cached'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        parser.parse('test.status')
+        assert parser.invalidate()
+        assert not parser.invalidate()
+        parser.parse('test.status')
+        parser.clear_cache()
+        parser.parse('test.status')
+
+        assert caplog.text.count('Preset file cached.yaml loaded.') == 3
+
+    def test_evict_least_recently_used(self, tmp_path: Path) -> None:
+        """
+        测试缓存的预设文件数量超出限制。
+
+        测试预期：淘汰最近最少使用的风格预设，固定的风格预设不被淘汰。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot import require
+
+        for name in ('default', 'group1', 'group2', 'group3'):
+            (tmp_path / f'{name}.yaml').write_text(f'name: {name}\n')
+
+        config = {
+            'styledstr_respath': tmp_path,
+            'styledstr_preset': 'default',
+            'styledstr_cache_size': 2,
+            'styledstr_metrics': True
+        }
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        for preset in ('group1', 'default', 'group2', 'group1', 'group3'):
+            assert parser.parse('name', preset=preset) == preset
+        assert parser.stats()['counters']['preset_loads'] == 5
+
+        # group3 刚被加载，default 被固定
+        for preset in ('group3', 'default'):
+            parser.parse('name', preset=preset)
+        assert parser.stats()['counters']['preset_loads'] == 5
+
+    def test_evict_by_token_budget(self, tmp_path: Path) -> None:
+        """
+        测试缓存的字符串标签总数超出限制。
+
+        测试预期：缓存的字符串标签总数不超过限制。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.cache import PresetCache
+        from nonebot_plugin_styledstr.preset import Preset
+
+        evicted = []
+        cache = PresetCache(budget=5, on_evict=evicted.append)
+        for i in range(4):
+            contents = {f'token{j}': 'text' for j in range(2)}
+            cache.put(tmp_path / f'preset{i}.yaml', (0, 0, i),
+                      Preset(contents))
+
+        assert len(cache) == 2
+        assert cache.weight == 4
+        assert cache.evictions == 2
+        assert evicted == [
+            tmp_path / 'preset0.yaml', tmp_path / 'preset1.yaml'
+        ]
+
+    def test_weigh_sharded_preset(self, tmp_path: Path) -> None:
+        """
+        测试缓存以目录形式存储的风格预设。
+
+        测试预期：权重随已读取的分片更新，移除缓存条目时扣除当前记录的权重，
+        缓存的字符串标签总数不会为负数。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.cache import PresetCache
+        from nonebot_plugin_styledstr.preset import load_file
+
+        directory = tmp_path / 'sharded'
+        directory.mkdir()
+        (directory / 'help.yaml').write_text('prompt: 帮助\nfooter: 结尾\n')
+        (directory / 'shop.yaml').write_text('items: [apple, banana]\n')
+
+        cache = PresetCache(budget=10)
+        loaded = load_file(directory)
+        cache.put(directory, (0, 0, 0), loaded)
+        assert cache.weight == 0
+
+        loaded.lookup('help.prompt')
+        loaded.lookup('shop.items')
+        cache.reweigh(directory)
+        assert cache.weight == 3
+
+        cache.invalidate(directory)
+        assert cache.weight == 0
+
+    def test_budget_covers_merged_views(self, tmp_path: Path) -> None:
+        """
+        测试继承链合并结果与缓存的字符串标签总数上限。
+
+        测试预期：合并结果计入继承链末端的缓存条目的权重，内存中的字符串标签
+        总数与缓存权重一致且不超过上限；无法容纳的合并结果不被缓存，解析结果
+        不受影响。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        import json
+
+        from nonebot_plugin_styledstr.store import PresetStore
+
+        contents = {f'token{i}': 'default' for i in range(2000)}
+        (tmp_path / 'default.json').write_text(json.dumps(contents))
+        for i in range(50):
+            (tmp_path / f'group{i}.yaml').write_text('__base__: default\n'
+                                                     f'name: group{i}\n')
+
+        store = PresetStore(tmp_path, budget=2100)
+        store.cache.pin('default')
+        for i in range(50):
+            loaded = store.load(f'group{i}')
+            assert loaded.lookup('name').text == f'group{i}'
+            assert loaded.lookup('token0').text == 'default'
+            assert store.resident_tokens == store.cache.weight
+            assert store.resident_tokens <= 2100
+
+        # 上限足够时合并结果被缓存并计入权重
+        store = PresetStore(tmp_path, budget=5000)
+        for i in range(3):
+            store.load(f'group{i}')
+        assert store.resident_tokens == store.cache.weight
+        assert store.resident_tokens > 4000
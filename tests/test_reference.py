@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+
+contents = {
+    'common': {
+        'bot_name': 'Bot',
+        'signature': '—— ${common.bot_name}',
+        'choices': ['a', 'b']
+    },
+    'greeting': '你好，$name$，我是${common.bot_name}',
+    'footer': '${common.signature}',
+    'missing': '${common.nothing} ${common.choices}',
+    'replies': ['${common.bot_name} 在', '在']
+}
+
+
+@pytest.mark.usefixtures('setup')
+class TestReference(object):
+    """测试引用其他字符串标签"""
+
+    def test_inline_reference(self) -> None:
+        """
+        测试编译时替换引用。
+
+        测试预期：引用被替换为被引用字符串标签的内容，嵌套引用同样被替换；无
+        法替换的引用保留原文；替换后的占位符仍然有效。
+        """
+        from nonebot_plugin_styledstr.preset import Preset
+
+        preset = Preset(contents)
+
+        assert preset.lookup('footer').text == '—— Bot'
+        assert preset.lookup('missing').text == contents['missing']
+        assert preset.lookup('replies').text in {'Bot 在', '在'}
+
+        template = preset.lookup('greeting')
+        assert template.text == '你好，$name$，我是Bot'
+        assert template.render({'name': '用户'})[0] == '你好，用户，我是Bot'
+
+    @pytest.mark.parametrize('circular, chain', [
+        ({
+            'a': '${a}'
+        }, 'a -> a'),
+        ({
+            'a': '${b}',
+            'b': 'x${c.d}',
+            'c': {
+                'd': '${a}'
+            }
+        }, 'a -> b -> c.d -> a'),
+    ])
+    def test_circular_reference(self, circular: dict, chain: str) -> None:
+        """
+        测试字符串标签之间的循环引用。
+
+        测试预期：编译时抛出 `PresetFileError` 异常，异常信息包含循环链。
+
+        参数：
+        - `circular: dict`：风格预设内容。
+        - `chain: str`：预期循环链。
+        """
+        from nonebot_plugin_styledstr.exception import PresetFileError
+        from nonebot_plugin_styledstr.preset import Preset
+
+        with pytest.raises(PresetFileError) as err:
+            Preset(circular)
+        assert chain in err.value.message
+
+    def test_reference_across_inheritance(self, tmp_path: Path,
+                                          caplog) -> None:
+        """
+        测试继承风格预设中的引用。
+
+        测试预期：基础风格预设中的引用指向覆盖风格预设中的字符串标签；存在循
+        环引用的风格预设解析失败并输出日志。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        (tmp_path / 'default.yaml').write_text('bot: Bot\n'
+                                               'footer: 来自 ${bot}\n')
+        (tmp_path / 'vip.yaml').write_text('__base__: default\n'
+                                           'bot: VIP Bot\n')
+        (tmp_path / 'circular.yaml').write_text('a: ${b}\nb: ${a}\n')
+
+        config = {'styledstr_respath': tmp_path, 'styledstr_preset': 'vip'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse('footer') == '来自 VIP Bot'
+        assert parser.parse('footer', preset='default') == '来自 Bot'
+        assert parser.parse('a', preset='circular') == ''
+        assert 'Circular token reference detected: a -> b -> a' in caplog.text
+
+    def test_reference_across_shards(self, tmp_path: Path) -> None:
+        """
+        测试以目录形式存储的风格预设中跨分片的引用。
+
+        测试预期：读取被引用的分片并替换引用，分片之间的相互引用不视为循环引
+        用。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.preset import load_file
+
+        directory = tmp_path / 'sharded'
+        directory.mkdir()
+        (directory / 'common.yaml').write_text('bot: Bot\n'
+                                               'title: ${help.title}\n')
+        (directory / 'help.yaml').write_text('title: 帮助\n'
+                                             'prompt: ${common.bot} 帮助\n')
+
+        loaded = load_file(directory)
+
+        assert loaded.lookup('help.prompt').text == 'Bot 帮助'
+        assert loaded.lookup('common.title').text == '帮助'
+        assert loaded.materialize().tokens['help.prompt'].text == 'Bot 帮助'
+
+    def test_report_unresolved(self) -> None:
+        """
+        测试校验无法替换的引用。
+
+        测试预期：报告引用了不存在或内容为列表的字符串标签的引用。
+        """
+        from nonebot_plugin_styledstr.analyze import check
+        from nonebot_plugin_styledstr.preset import Preset
+
+        problems = [(kind, token)
+                    for kind, token, _ in check(Preset(contents))
+                    if kind == 'unresolved_reference']
+
+        assert problems == [('unresolved_reference', 'missing')] * 2
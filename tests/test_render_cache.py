@@ -0,0 +1,208 @@
+import gc
+import os
+import weakref
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+
+@pytest.fixture()
+def respath(tmp_path: Path) -> Path:
+    (tmp_path / 'default.yaml').write_text('status: 当前状态：$state$\n'
+                                           'menu: 菜单\n'
+                                           'random: [a, b, c, d, e, f]\n')
+    return tmp_path
+
+
+@pytest.mark.usefixtures('setup')
+class TestRenderCache(object):
+    """测试解析结果缓存"""
+
+    @staticmethod
+    def get_parser(respath: Path, capacity: int = 16) -> Any:
+        from nonebot import require
+
+        config = {
+            'styledstr_respath': respath,
+            'styledstr_preset': 'default',
+            'styledstr_render_cache': capacity
+        }
+        return require('nonebot_plugin_styledstr').init(config)
+
+    def test_hit_same_placeholders(self, respath: Path) -> None:
+        """
+        测试以相同的字符串标签与替换内容重复解析。
+
+        测试预期：第二次解析命中缓存，替换内容不同时不命中。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        parser = self.get_parser(respath)
+
+        assert parser.parse('status', state='在线') == '当前状态：在线'
+        assert parser.parse('status', state='在线') == '当前状态：在线'
+        assert parser.parse('status', state='离线') == '当前状态：离线'
+        assert parser.parse('menu') == '菜单'
+
+        stats = parser.render_cache_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 3
+        assert stats['size'] == 3
+        assert stats['hit_rate'] == 0.25
+
+    @pytest.mark.parametrize('placeholders', [
+        {
+            'state': lambda: '在线'
+        },
+        {
+            'state': ['unhashable']
+        },
+    ])
+    def test_skip_uncacheable(self, respath: Path,
+                              placeholders: Dict[str, Any]) -> None:
+        """
+        测试替换内容为可调用对象或不可散列的对象。
+
+        测试预期：不缓存解析结果，并计入无法缓存的次数。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `placeholders: Dict[str, Any]`：占位符及替换内容。
+        """
+        parser = self.get_parser(respath)
+
+        parser.parse('status', **placeholders)
+        parser.parse('status', **placeholders)
+
+        stats = parser.render_cache_stats()
+        assert stats['size'] == 0
+        assert stats['skips'] == 2
+
+    def test_skip_random_token(self, respath: Path) -> None:
+        """
+        测试内容为列表的字符串标签。
+
+        测试预期：不缓存解析结果，每次仍随机抽取，并计入无法缓存的次数而非未
+        命中次数。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        parser = self.get_parser(respath)
+
+        results = {parser.parse('random') for _ in range(64)}
+
+        assert len(results) > 1
+        stats = parser.render_cache_stats()
+        assert stats['size'] == 0
+        assert stats['skips'] == 64
+        assert stats['misses'] == 0
+
+    def test_warn_invalid_placeholders(self, respath: Path, caplog) -> None:
+        """
+        测试以相同的无效占位符重复解析。
+
+        测试预期：解析结果不被缓存，每次解析都输出警告。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        parser = self.get_parser(respath)
+
+        for _ in range(3):
+            result = parser.parse('status', state='在线', mood='愉快')
+            assert result == '当前状态：在线'
+            assert parser.parse('menu', contents='x') == '菜单'
+
+        assert caplog.text.count("skipped replacing: {'mood'}") == 3
+        assert caplog.text.count("skipped replacing: {'contents'}") == 3
+        assert parser.render_cache_stats()['size'] == 0
+
+    def test_distinguish_value_types(self, respath: Path) -> None:
+        """
+        测试相等但类型不同的替换内容。
+
+        测试预期：`1` 与 `True` 不互相命中。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        parser = self.get_parser(respath)
+
+        assert parser.parse('status', state=1) == '当前状态：1'
+        assert parser.parse('status', state=True) == '当前状态：True'
+
+    def test_reload_preset(self, respath: Path) -> None:
+        """
+        测试预设文件发生变化。
+
+        测试预期：重新加载后不再返回旧的解析结果。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        parser = self.get_parser(respath)
+        assert parser.parse('menu') == '菜单'
+
+        preset_file = respath / 'default.yaml'
+        preset_file.write_text('menu: 新菜单\n')
+        stat = preset_file.stat()
+        os.utime(preset_file,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert parser.parse('menu') == '新菜单'
+
+    def test_release_replaced_preset(self) -> None:
+        """
+        测试风格预设不再被使用。
+
+        测试预期：缓存条目不会使风格预设无法释放。
+        """
+        from nonebot_plugin_styledstr.preset import Preset
+        from nonebot_plugin_styledstr.render import RenderCache
+
+        cache = RenderCache(4)
+        loaded = Preset({'menu': '菜单'})
+        cache.put(cache.key(loaded, 'menu', {}), '菜单')
+        ref = weakref.ref(loaded)
+
+        del loaded
+        gc.collect()
+
+        assert ref() is None
+        assert len(cache) == 1
+
+    def test_evict_least_recently_used(self, respath: Path) -> None:
+        """
+        测试超出缓存容量。
+
+        测试预期：淘汰最近最少使用的解析结果。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        parser = self.get_parser(respath, capacity=2)
+
+        for state in ('a', 'b', 'a', 'c', 'a', 'b'):
+            parser.parse('status', state=state)
+
+        stats = parser.render_cache_stats()
+        assert stats['size'] == 2
+        assert stats['hits'] == 2
+
+    def test_disabled_by_default(self, respath: Path) -> None:
+        """
+        测试未启用解析结果缓存。
+
+        测试预期：统计为空字典。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        parser = self.get_parser(respath, capacity=0)
+
+        assert parser.parse('menu') == '菜单'
+        assert parser.render_cache_stats() == {}
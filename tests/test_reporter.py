@@ -0,0 +1,139 @@
+import time
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.usefixtures('setup')
+class TestErrorReporter(object):
+    """测试异常日志去重与限流"""
+
+    def test_deduplicate_errors(self, caplog) -> None:
+        """
+        测试限流间隔内的重复异常。
+
+        测试预期：同一异常仅输出一次日志，不同异常分别输出。
+
+        参数：
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot_plugin_styledstr.exception import TokenError
+        from nonebot_plugin_styledstr.reporter import ErrorReporter
+
+        reporter = ErrorReporter(interval=60.0)
+        results = [
+            reporter.report(TokenError('typo'), ('test', 'typo'))
+            for _ in range(100)
+        ]
+        reporter.report(TokenError('other'), ('test', 'other'))
+
+        assert results.count(True) == 1
+        assert caplog.text.count('Token "typo"') == 1
+        assert caplog.text.count('Token "other"') == 1
+
+    def test_summarize_suppressed_errors(self, caplog) -> None:
+        """
+        测试输出被抑制异常的汇总。
+
+        测试预期：限流间隔过后再次输出日志时附带被抑制次数。
+
+        参数：
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot_plugin_styledstr.exception import TokenError
+        from nonebot_plugin_styledstr.reporter import ErrorReporter
+
+        reporter = ErrorReporter(interval=0.05)
+        for _ in range(5):
+            reporter.report(TokenError('typo'), ('test', 'typo'))
+        time.sleep(0.06)
+        reporter.report(TokenError('typo'), ('test', 'typo'))
+
+        assert 'Suppressed 4 repeated occurrences' in caplog.text
+        assert caplog.text.count('Token "typo"') == 3
+
+    def test_flush(self, caplog) -> None:
+        """
+        测试立即输出被抑制异常的汇总。
+
+        测试预期：仅输出存在被抑制次数的异常汇总。
+
+        参数：
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot_plugin_styledstr.exception import TokenError
+        from nonebot_plugin_styledstr.reporter import ErrorReporter
+
+        reporter = ErrorReporter()
+        for _ in range(3):
+            reporter.report(TokenError('typo'), ('test', 'typo'))
+        reporter.report(TokenError('once'), ('test', 'once'))
+
+        assert reporter.flush() == [('test', 'typo')]
+        assert reporter.flush() == []
+        assert 'Suppressed 2 repeated occurrences' in caplog.text
+
+    def test_disable_rate_limit(self) -> None:
+        """
+        测试限流间隔为 `0`。
+
+        测试预期：每次均输出日志。
+        """
+        from nonebot_plugin_styledstr.exception import TokenError
+        from nonebot_plugin_styledstr.reporter import ErrorReporter
+
+        reporter = ErrorReporter(interval=0)
+        assert all(
+            reporter.report(TokenError('typo'), ('test', 'typo'))
+            for _ in range(3))
+
+    def test_summarize_periodically(self, caplog) -> None:
+        """
+        测试定期输出被抑制异常的汇总。
+
+        测试预期：重复异常不再出现时，汇总仍在限流间隔后输出；停止后台线程
+        后不再输出汇总。
+
+        参数：
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot_plugin_styledstr.exception import TokenError
+        from nonebot_plugin_styledstr.reporter import ErrorReporter
+
+        reporter = ErrorReporter(interval=0.05)
+        assert not reporter.running
+        for _ in range(3):
+            reporter.report(TokenError('typo'), ('test', 'typo'))
+        assert reporter.running
+
+        deadline = time.monotonic() + 5
+        while 'Suppressed 2 repeated occurrences' not in caplog.text:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        reporter.stop()
+        assert not reporter.running
+
+    def test_share_between_parsers(self, tmp_path: Path, caplog) -> None:
+        """
+        测试共享同一风格预设存储的解析器。
+
+        测试预期：同一异常仅输出一次日志，任一解析器均可立即输出汇总。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        (tmp_path / 'default.yaml').write_text('test: pass\n')
+        config = {'styledstr_respath': tmp_path, 'styledstr_preset': 'default'}
+        init = require('nonebot_plugin_styledstr').init
+        first, second = init(config), init(config)
+
+        for parser in (first, second, first):
+            assert parser.parse('typo') == ''
+
+        assert caplog.text.count('Token "typo"') == 1
+        assert second.flush() == [('default', 'typo')]
+        assert 'Suppressed 2 repeated occurrences' in caplog.text
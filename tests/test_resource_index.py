@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+
+assets_path = Path(__file__).parent / 'assets'
+
+
+@pytest.mark.usefixtures('setup')
+class TestResourceIndex(object):
+    """测试资源目录索引"""
+
+    @pytest.mark.parametrize('path, expected', [
+        (assets_path / 'test_load_same_preset' / 'load_json_yaml', '.json'),
+        (assets_path / 'test_load_same_preset' / 'load_json_yml', '.json'),
+        (assets_path / 'test_load_same_preset' / 'load_yaml_yml', '.yaml'),
+        (assets_path / 'test_load_same_preset' / 'load_json_yaml_yml', '.json')
+    ])
+    def test_lookup_with_priority(self, path: Path, expected: str) -> None:
+        """
+        测试按优先级查找同名预设文件。
+
+        测试预期：按照 `.json` > `.yaml` > `.yml` 的优先级返回预设文件。
+
+        参数：
+        - `path: pathlib.Path`：测试路径。
+        - `expected: str`：预期预设文件的后缀名。
+        """
+        from nonebot_plugin_styledstr.index import ResourceIndex
+
+        index = ResourceIndex(path)
+        assert index.lookup('LOAD').suffix == expected
+
+    def test_refresh_on_directory_change(self, tmp_path: Path) -> None:
+        """
+        测试资源目录变化时重建索引。
+
+        测试预期：目录未变化时不重建索引，新增文件后可查找到对应预设。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.index import ResourceIndex
+
+        index = ResourceIndex(tmp_path)
+        assert index.lookup('added') is None
+        assert not index.refresh()
+
+        (tmp_path / 'Added.yml').write_text('test: added\n')
+        (tmp_path / 'ignored.txt').write_text('test: ignored\n')
+        index.refresh(force=True)
+
+        assert index.lookup('added') == tmp_path / 'Added.yml'
+        assert index.names() == ['added']
+
+    def test_missing_respath(self, tmp_path: Path) -> None:
+        """
+        测试资源目录不存在时的查找。
+
+        测试预期：返回 `None`。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.index import ResourceIndex
+
+        assert ResourceIndex(tmp_path / 'missing').lookup('test') is None
+
+    def test_resolve_when_scanning(self, tmp_path: Path, monkeypatch) -> None:
+        """
+        测试通过符号链接访问的资源目录。
+
+        测试预期：扫描时即解析预设文件的路径，之后按名称加载已缓存的风格预设
+        时不再解析路径。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `monkeypatch`：模拟对象固件。
+        """
+        from nonebot_plugin_styledstr.index import ResourceIndex
+        from nonebot_plugin_styledstr.store import PresetStore
+
+        real = tmp_path / 'real'
+        real.mkdir()
+        (real / 'linked.yaml').write_text('test: pass\n')
+        respath = tmp_path / 'link'
+        respath.symlink_to(real, target_is_directory=True)
+
+        expected = (real / 'linked.yaml').resolve()
+        assert ResourceIndex(respath).lookup('linked') == expected
+
+        store = PresetStore(respath)
+        assert store.load('linked').lookup('test').text == 'pass'
+
+        calls = []
+        resolve = Path.resolve
+
+        def record(self: Path, *args, **kwargs) -> Path:
+            calls.append(self)
+            return resolve(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, 'resolve', record)
+        assert store.load('linked').lookup('test').text == 'pass'
+        assert calls == []
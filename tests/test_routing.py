@@ -0,0 +1,54 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.usefixtures('setup')
+class TestRouting(object):
+    """测试根据会话路由风格预设"""
+
+    @pytest.fixture()
+    def parser(self, tmp_path: Path):
+        from nonebot import require
+
+        (tmp_path / 'default.yaml').write_text('name: default\n')
+        (tmp_path / 'vip.yaml').write_text('name: vip\n')
+
+        config = {'styledstr_respath': tmp_path, 'styledstr_preset': 'default'}
+        return require('nonebot_plugin_styledstr').init(config)
+
+    @pytest.mark.parametrize('session, expected', [
+        (10001, 'vip'),
+        (10002, 'default'),
+    ])
+    def test_parse_for_session(self, parser, session: int,
+                               expected: str) -> None:
+        """
+        测试根据会话获取字符串。
+
+        测试预期：使用路由函数返回的风格预设，未返回时使用默认风格预设。
+
+        参数：
+        - `session: int`：会话标识。
+        - `expected: str`：预期字符串。
+        """
+        parser.set_router({10001: 'vip'}.get)
+        assert parser.parse_for(session, 'name') == expected
+
+    def test_parse_without_router(self, parser) -> None:
+        """
+        测试未设置路由函数。
+
+        测试预期：使用默认风格预设。
+        """
+        assert parser.parse_for(10001, 'name') == 'default'
+
+    def test_aparse_for_session(self, parser) -> None:
+        """
+        测试异步根据会话获取字符串。
+
+        测试预期：使用路由函数返回的风格预设。
+        """
+        parser.set_router(lambda session: 'vip')
+        assert asyncio.run(parser.aparse_for(10001, 'name')) == 'vip'
@@ -0,0 +1,238 @@
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture()
+def respath(tmp_path: Path) -> Path:
+    directory = tmp_path / 'sharded'
+    directory.mkdir()
+    (directory / 'help.yaml').write_text('prompt: 请输入帮助内容\n')
+    (directory / 'shop.yaml').write_text('items: [apple, banana]\n')
+    (directory / 'greeting.json').write_text('"你好，$name$"')
+    return tmp_path
+
+
+@pytest.mark.usefixtures('setup')
+class TestShardedPreset(object):
+    """测试以目录形式存储的风格预设"""
+
+    def test_load_shard_on_demand(self, respath: Path) -> None:
+        """
+        测试按需读取分片。
+
+        测试预期：仅读取被查找的字符串标签所在的分片。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot_plugin_styledstr.preset import ShardedPreset, load_file
+
+        loaded = load_file(respath / 'sharded')
+        assert isinstance(loaded, ShardedPreset)
+        assert len(loaded) == 0
+
+        assert loaded.lookup('help.prompt').text == '请输入帮助内容'
+        assert len(loaded) == 1
+        assert loaded.lookup('shop.items').text in {'apple', 'banana'}
+        assert len(loaded) == 2
+
+    @pytest.mark.parametrize('token, placeholders, expected', [
+        ('help.prompt', {}, '请输入帮助内容'),
+        ('greeting', {
+            'name': 'Bot'
+        }, '你好，Bot'),
+        ('help.missing', {}, ''),
+        ('missing.token', {}, ''),
+    ])
+    def test_parse_sharded_preset(self, respath: Path, token: str,
+                                  placeholders: dict, expected: str) -> None:
+        """
+        测试解析以目录形式存储的风格预设。
+
+        测试预期：解析结果与单个预设文件一致。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `token: str`：字符串标签。
+        - `placeholders: dict`：占位符。
+        - `expected: str`：预期字符串。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'sharded'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse(token, **placeholders) == expected
+
+    def test_reload_changed_shard(self, respath: Path) -> None:
+        """
+        测试分片文件被原地修改。
+
+        测试预期：仅重新读取发生变化的分片。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'sharded'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        assert parser.parse('help.prompt') == '请输入帮助内容'
+
+        shard = respath / 'sharded' / 'help.yaml'
+        shard.write_text('prompt: changed\n')
+        stat = shard.stat()
+        os.utime(shard,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert parser.parse('help.prompt') == 'changed'
+
+    def test_aparse_load_shard_in_executor(self, respath: Path, monkeypatch,
+                                           caplog) -> None:
+        """
+        测试异步解析以目录形式存储的风格预设。
+
+        测试预期：分片在线程池中读取，不在事件循环所在的线程中读取；无法读取
+        的分片在查找时报告且仅读取一次。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `monkeypatch`：模拟对象固件。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+        from nonebot_plugin_styledstr import preset
+
+        (respath / 'sharded' / 'broken.yaml').write_text('items: [unclosed\n')
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'sharded'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        read = preset._read
+        threads = []
+
+        def record(path: Path):
+            threads.append(threading.current_thread())
+            return read(path)
+
+        monkeypatch.setattr(preset, '_read', record)
+
+        async def main():
+            return await asyncio.gather(
+                parser.aparse('help.prompt'),
+                parser.aparse_many(['shop.items', 'greeting']),
+                parser.aparse('broken.items'))
+
+        results = asyncio.run(main())
+
+        assert results[0] == '请输入帮助内容'
+        assert results[1][0] in {'apple', 'banana'}
+        assert results[2] == ''
+        assert 'Failed to load preset shard broken.yaml' in caplog.text
+        assert len(threads) == 4
+        assert threading.main_thread() not in threads
+
+    def test_file_before_directory(self, respath: Path) -> None:
+        """
+        测试同名的预设文件与预设目录。
+
+        测试预期：优先使用预设文件。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot import require
+
+        (respath / 'sharded.yaml').write_text('help:\n  prompt: file\n')
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'sharded'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse('help.prompt') == 'file'
+
+    def test_inherit_sharded_preset(self, respath: Path) -> None:
+        """
+        测试继承以目录形式存储的风格预设。
+
+        测试预期：覆盖预设中不存在的字符串标签从分片中获取。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot import require
+
+        (respath / 'derived.yaml').write_text('__base__: sharded\n'
+                                              'help:\n  prompt: derived\n')
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'derived'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.parse('help.prompt') == 'derived'
+        assert parser.parse('greeting', name='Bot') == '你好，Bot'
+
+    def test_check_only_looked_up_shard(self, respath: Path,
+                                        monkeypatch) -> None:
+        """
+        测试解析已缓存的以目录形式存储的风格预设。
+
+        测试预期：仅检查字符串标签所在的分片文件，文件系统调用次数与已读取的
+        分片数量无关。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `monkeypatch`：模拟对象固件。
+        """
+        from nonebot import require
+
+        directory = respath / 'sharded'
+        for i in range(30):
+            (directory / f'extra{i}.yaml').write_text(f'value: {i}\n')
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'sharded'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        for i in range(30):
+            assert parser.parse(f'extra{i}.value') == str(i)
+
+        calls = []
+        stat = os.stat
+
+        def record(path, *args, **kwargs):
+            calls.append(Path(path).name)
+            return stat(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, 'stat', record)
+        assert parser.parse('extra0.value') == '0'
+        monkeypatch.undo()
+
+        assert len(calls) == 3
+        assert set(calls) == {respath.name, 'sharded', 'extra0.yaml'}
+
+    def test_drop_affected_merged_views(self, respath: Path, caplog) -> None:
+        """
+        测试继承链中以目录形式存储的风格预设的分片被修改。
+
+        测试预期：仅重新合并继承链中包含该风格预设的合并结果。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        (respath / 'derived.yaml').write_text('__base__: sharded\n')
+        (respath / 'plain.yaml').write_text('help:\n  prompt: plain\n')
+        (respath / 'other.yaml').write_text('__base__: plain\n')
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'derived'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        assert parser.parse('help.prompt') == '请输入帮助内容'
+        assert parser.parse('help.prompt', preset='other') == 'plain'
+
+        shard = respath / 'sharded' / 'help.yaml'
+        shard.write_text('prompt: changed\n')
+        stat = shard.stat()
+        os.utime(shard,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert parser.parse('help.prompt') == 'changed'
+        assert parser.parse('help.prompt', preset='other') == 'plain'
+        assert caplog.text.count('derived.yaml -> sharded merged') == 2
+        assert caplog.text.count('other.yaml -> plain.yaml merged') == 1
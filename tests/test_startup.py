@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROBE = '''
+import sys
+import nonebot
+nonebot.init(log_level='WARNING')
+nonebot.load_plugin('nonebot_plugin_styledstr')
+lazy = ('yaml', 'toml', 'sqlite3')
+print('loaded:', *(name for name in lazy if name in sys.modules))
+'''
+
+
+@pytest.mark.usefixtures('setup')
+class TestStartup(object):
+    """测试插件导入与解析器对象创建"""
+
+    def test_lazy_import(self) -> None:
+        """
+        测试导入插件。
+
+        测试预期：导入插件时不导入 yaml、toml 与 sqlite3。
+        """
+        output = subprocess.run([sys.executable, '-c', PROBE],
+                                check=True,
+                                capture_output=True,
+                                cwd=Path(__file__).parents[1],
+                                text=True).stdout
+
+        assert output.strip().splitlines()[-1] == 'loaded:'
+
+    def test_cache_config(self) -> None:
+        """
+        测试获取插件配置。
+
+        测试预期：未覆盖配置时复用缓存的插件配置，覆盖的配置项经过校验。
+        """
+        from nonebot_plugin_styledstr.config import get_config
+
+        assert get_config() is get_config()
+
+        config = get_config({'styledstr_respath': '.', 'unrelated': 1})
+        assert config.styledstr_respath == Path('.')
+        assert config.styledstr_preset == get_config().styledstr_preset
+
+    def test_invalid_override(self) -> None:
+        """
+        测试覆盖配置项的值无效。
+
+        测试预期：抛出 `pydantic.ValidationError`。
+        """
+        from nonebot_plugin_styledstr.config import get_config
+        from pydantic import ValidationError
+
+        with pytest.raises(ValidationError):
+            get_config({'styledstr_cache_size': 'many'})
@@ -0,0 +1,72 @@
+import gc
+import weakref
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.usefixtures('setup')
+class TestPresetStore(object):
+    """测试进程级共享风格预设存储"""
+
+    def test_share_between_parsers(self, tmp_path: Path) -> None:
+        """
+        测试配置相同的解析器共享风格预设。
+
+        测试预期：预设文件仅加载一次，另一解析器直接读取缓存。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot import require
+
+        (tmp_path / 'shared.yaml').write_text('test: shared\n')
+        config = {'styledstr_respath': tmp_path, 'styledstr_preset': 'shared'}
+        init = require('nonebot_plugin_styledstr').init
+
+        first = init({**config, 'styledstr_metrics': True})
+        second = init({**config, 'styledstr_metrics': True})
+
+        assert first.parse('test') == 'shared'
+        assert second.parse('test') == 'shared'
+        assert first.stats()['counters']['preset_loads'] == 1
+        assert second.stats()['counters']['preset_loads'] == 0
+        assert second.stats()['counters']['cache_hits'] == 1
+
+    def test_separate_by_config(self, tmp_path: Path) -> None:
+        """
+        测试配置不同的解析器不共享存储。
+
+        测试预期：资源目录或基础风格预设配置不同时获取不同的存储。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.store import PresetStore
+
+        other = tmp_path / 'other'
+        other.mkdir()
+
+        store = PresetStore.acquire(tmp_path)
+        assert PresetStore.acquire(tmp_path) is store
+        assert PresetStore.acquire(other) is not store
+        assert PresetStore.acquire(tmp_path, {'a': 'b'}) is not store
+
+    def test_release_unused_store(self, tmp_path: Path) -> None:
+        """
+        测试不再被引用的存储被释放。
+
+        测试预期：存储不再被引用后随之释放。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.store import PresetStore
+
+        store = PresetStore.acquire(tmp_path)
+        released = weakref.ref(store)
+        del store
+        gc.collect()
+
+        assert released() is None
+        assert PresetStore.acquire(tmp_path) is not None
@@ -0,0 +1,182 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+contents = {
+    'help': {
+        'commands': {
+            'start': '开始：$name$',
+            'stop': '停止',
+            'empty': []
+        },
+        'commands-extra': '不在层级下',
+        'footer': '更多帮助请联系管理员'
+    },
+    'shop': {
+        'items': ['apple', 'banana']
+    }
+}
+
+
+@pytest.fixture()
+def respath(tmp_path: Path) -> Path:
+    (tmp_path / 'default.yaml').write_text('help:\n'
+                                           '  commands:\n'
+                                           '    start: 开始：$name$\n'
+                                           '    stop: 停止\n'
+                                           '    empty: []\n'
+                                           '  commands-extra: 不在层级下\n'
+                                           '  footer: 更多帮助请联系管理员\n'
+                                           'shop:\n'
+                                           '  items: [apple, banana]\n')
+    return tmp_path
+
+
+@pytest.mark.usefixtures('setup')
+class TestSubtree(object):
+    """测试按字符串标签层级查找与解析"""
+
+    @pytest.mark.parametrize('prefix, expected', [
+        ('help.commands', ['help.commands.start', 'help.commands.stop']),
+        ('help.commands.stop', ['help.commands.stop']),
+        ('help.command', []),
+        ('shop', ['shop.items']),
+        ('', [
+            'help.commands-extra', 'help.commands.start', 'help.commands.stop',
+            'help.footer', 'shop.items'
+        ]),
+    ])
+    def test_search(self, tmp_path: Path, prefix: str, expected: list) -> None:
+        """
+        测试在各类风格预设中查找字符串标签层级。
+
+        测试预期：编译后的风格预设、风格预设包与风格预设数据库返回相同的有效
+        字符串标签，不包括无效字符串标签与名称相近的其他层级。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        - `prefix: str`：字符串标签层级。
+        - `expected: list`：预期字符串标签。
+        """
+        from nonebot_plugin_styledstr.bundle import Bundle, build_bundle
+        from nonebot_plugin_styledstr.database import Database, build_database
+        from nonebot_plugin_styledstr.preset import Preset
+
+        respath = tmp_path / 'presets'
+        respath.mkdir()
+        (respath / 'default.json').write_text(json.dumps(contents))
+        build_bundle(respath, tmp_path / 'presets.bundle')
+        build_database(respath, tmp_path / 'presets.db')
+        bundle = Bundle(tmp_path / 'presets.bundle')
+        database = Database(tmp_path / 'presets.db')
+
+        assert Preset(contents).search(prefix) == expected
+        assert bundle.get('default').search(prefix) == expected
+        assert database.get('default').search(prefix) == expected
+
+        bundle.close()
+        database.close()
+
+    def test_search_sharded_preset(self, tmp_path: Path) -> None:
+        """
+        测试在以目录形式存储的风格预设中查找字符串标签层级。
+
+        测试预期：仅读取字符串标签层级所在的分片。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时目录。
+        """
+        from nonebot_plugin_styledstr.preset import load_file
+
+        directory = tmp_path / 'sharded'
+        directory.mkdir()
+        (directory / 'help.yaml').write_text('commands:\n  start: 开始\n')
+        (directory / 'shop.yaml').write_text('items: [apple, banana]\n')
+
+        loaded = load_file(directory)
+
+        assert loaded.search('help.commands') == ['help.commands.start']
+        assert len(loaded) == 1
+        assert loaded.search('missing') == []
+        assert loaded.search() == ['help.commands.start', 'shop.items']
+
+    def test_parse_subtree(self, respath: Path) -> None:
+        """
+        测试列出并解析字符串标签层级下的字符串标签。
+
+        测试预期：按字典序返回层级下的有效字符串标签及其解析结果，占位符对所
+        有字符串标签生效。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'default'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        expected = {
+            'help.commands.start': '开始：Bot',
+            'help.commands.stop': '停止'
+        }
+
+        assert parser.tokens('help.commands') == list(expected)
+        assert parser.parse_subtree('help.commands', name='Bot') == expected
+        assert asyncio.run(parser.aparse_subtree('help.commands',
+                                                 name='Bot')) == expected
+
+    def test_aparse_subtree_shared_awaitable(self, respath: Path) -> None:
+        """
+        测试以可等待对象作为替换内容异步解析字符串标签层级。
+
+        测试预期：同一协程对象对层级下的全部字符串标签仅被等待一次，协程函数
+        仅被调用一次。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot import require
+
+        (respath / 'shared.yaml').write_text('menu:\n'
+                                             '  greet: 你好，$name$\n'
+                                             '  bye: 再见，$name$\n'
+                                             '  title: 菜单\n')
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'shared'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        calls = []
+
+        async def fetch() -> str:
+            calls.append(None)
+            return 'Bot'
+
+        expected = {
+            'menu.bye': '再见，Bot',
+            'menu.greet': '你好，Bot',
+            'menu.title': '菜单'
+        }
+
+        assert asyncio.run(parser.aparse_subtree('menu',
+                                                 name=fetch())) == expected
+        assert asyncio.run(parser.aparse_subtree('menu',
+                                                 name=fetch)) == expected
+        assert len(calls) == 2
+
+    def test_missing_preset(self, respath: Path, caplog) -> None:
+        """
+        测试在不存在的风格预设中查找字符串标签层级。
+
+        测试预期：返回空结果并输出日志。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath, 'styledstr_preset': 'default'}
+        parser = require('nonebot_plugin_styledstr').init(config)
+
+        assert parser.tokens('help', preset='missing') == []
+        assert parser.parse_subtree('help', preset='missing') == {}
+        assert 'Cannot find any valid file for preset "missing"' in caplog.text
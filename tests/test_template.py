@@ -0,0 +1,116 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+
+@pytest.mark.usefixtures('setup')
+class TestTemplate(object):
+    """测试预编译字符串模板"""
+
+    @pytest.mark.parametrize('text, names', [
+        ('plain text', set()),
+        ('$Subject$ $ACTION$ $object$.', {'subject', 'action', 'object'}),
+        ('US$ 1.00 approx. equals CA$ $VALUE$', {'value'}),
+        ('$token$ $preset$ $contents$', set()),
+        ('$_invalid$ $1invalid$ $valid$', {'valid'}),
+    ])
+    def test_compile_names(self, text: str, names: set) -> None:
+        """
+        测试编译模板时收集占位符名称。
+
+        测试预期：模板中的有效占位符名称与 `names` 一致。
+
+        参数：
+        - `text: str`：字符串内容。
+        - `names: set`：预期的占位符名称。
+        """
+        from nonebot_plugin_styledstr.template import Template
+
+        template = Template(text)
+        assert template.names == names
+        assert template.render({})[0] == text
+
+    @pytest.mark.parametrize('text, placeholders, expected', [
+        ('$a$$B$', {
+            'a': 1,
+            'b': 2
+        }, '12'),
+        ('Can you $CAN$ $can$?', {
+            'can': 'can'
+        }, 'Can you can can?'),
+        ('$kept$ and $empty$', {
+            'empty': ''
+        }, '$kept$ and $empty$'),
+        ('$price:.2f$', {
+            'price': 1.5
+        }, '1.50'),
+        ('$count:d$ / $missing:d$', {
+            'count': 0,
+            'missing': None
+        }, '0 / $missing:d$'),
+        ('$invalid:d$', {
+            'invalid': 'text'
+        }, '$invalid:d$'),
+        ('$lazy$', {
+            'lazy': lambda: 'value'
+        }, 'value'),
+    ])
+    def test_render(self, text: str, placeholders: Dict[str, Any],
+                    expected: str) -> None:
+        """
+        测试渲染模板。
+
+        测试预期：渲染结果与 `expected` 一致。
+
+        参数：
+        - `text: str`：字符串内容。
+        - `placeholders: Dict[str, Any]`：占位符名称及替换内容。
+        - `expected: str`：预期渲染结果。
+        """
+        from nonebot_plugin_styledstr.template import Template
+
+        assert Template(text).render(placeholders)[0] == expected
+
+    def test_lazy_value(self) -> None:
+        """
+        测试可调用的替换内容。
+
+        测试预期：仅在模板中存在对应占位符时调用，且每次渲染最多调用一次。
+        """
+        from nonebot_plugin_styledstr.template import Template
+
+        calls = []
+
+        def value() -> str:
+            calls.append(None)
+            return 'lazy'
+
+        template = Template('$used$ $USED$')
+        assert template.render({'used': value, 'unused': value})[0] == \
+            'lazy lazy'
+        assert len(calls) == 1
+
+    def test_resolve_awaitable(self) -> None:
+        """
+        测试等待可等待的替换内容。
+
+        测试预期：仅等待模板中使用的替换内容，其余替换内容保持不变。
+        """
+        from nonebot_plugin_styledstr.template import Template
+
+        async def fetch() -> str:
+            return 'awaited'
+
+        async def unused() -> str:
+            raise AssertionError
+
+        template = Template('$name$ $plain$')
+        resolved = asyncio.run(
+            template.resolve({
+                'name': fetch,
+                'plain': 'text',
+                'other': unused
+            }))
+
+        assert template.render(resolved)[0] == 'awaited text'
@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture()
+def respath(tmp_path: Path) -> Path:
+    (tmp_path / 'default.yaml').write_text('help:\n'
+                                           '  prompt: 你好，$name$\n'
+                                           '  empty: []\n'
+                                           '  reserved: $token$\n'
+                                           '  invalid: $1st$\n')
+    (tmp_path / 'vip.yaml').write_text('__base__: default\n'
+                                       'help:\n  prompt: VIP\n')
+    (tmp_path / 'broken.yaml').write_text('help: [unclosed\n')
+    return tmp_path
+
+
+@pytest.mark.usefixtures('setup')
+class TestWarmup(object):
+    """测试风格预设预热与校验"""
+
+    def test_preload_all_presets(self, respath: Path) -> None:
+        """
+        测试预热资源目录下的全部风格预设。
+
+        测试预期：预热后解析字符串标签时不再加载预设文件。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        """
+        from nonebot import require
+
+        config = {
+            'styledstr_respath': respath,
+            'styledstr_preset': 'default',
+            'styledstr_metrics': True
+        }
+        parser = require('nonebot_plugin_styledstr').init(config)
+        report = parser.warm_up(workers=2)
+
+        assert set(report.timings) == {'broken', 'default', 'vip'}
+        loads = parser.stats()['counters']['preset_loads']
+
+        assert parser.parse('help.prompt', name='Bot') == '你好，Bot'
+        assert parser.parse('help.prompt', preset='vip') == 'VIP'
+        assert parser.stats()['counters']['preset_loads'] == loads
+
+    def test_report_problems(self, respath: Path, caplog) -> None:
+        """
+        测试预热时校验风格预设。
+
+        测试预期：汇总报告无效的字符串标签、占位符与无法读取的预设文件。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        from nonebot import require
+
+        config = {'styledstr_respath': respath}
+        parser = require('nonebot_plugin_styledstr').init(config)
+        problems = parser.warm_up().problems
+
+        default = [problem for name, problem in problems if name == 'default']
+        assert len(default) == 3
+        assert any('"help.empty"' in problem for problem in default)
+        assert any('$token$' in problem for problem in default)
+        assert any('$1st$' in problem for problem in default)
+        assert any(name == 'broken' for name, _ in problems)
+        assert 'Preset warm-up finished: 3 presets loaded' in caplog.text
+        assert 'Problems found while warming up presets' in caplog.text
+
+    def test_warm_up_after_startup(self, respath: Path, caplog) -> None:
+        """
+        测试在驱动器启动后创建解析器对象。
+
+        测试预期：不再注册不会被调用的启动钩子，而是立即于线程池中预热。
+
+        参数：
+        - `respath: pathlib.Path`：临时资源目录。
+        - `caplog`：捕捉日志输出固件。
+        """
+        import asyncio
+
+        import nonebot
+        from nonebot import require
+
+        config = {
+            'styledstr_respath': respath,
+            'styledstr_preset': 'default',
+            'styledstr_warmup': True,
+            'styledstr_metrics': True
+        }
+        hooks = nonebot.get_driver().server_app.router.on_startup
+        registered = len(hooks)
+
+        async def create() -> Any:
+            parser = require('nonebot_plugin_styledstr').init(config)
+            for _ in range(200):
+                if 'Preset warm-up finished' in caplog.text:
+                    break
+                await asyncio.sleep(0.01)
+            return parser
+
+        parser = asyncio.run(create())
+        assert 'Preset warm-up finished: 3 presets loaded' in caplog.text
+        assert len(hooks) == registered
+
+        loads = parser.stats()['counters']['preset_loads']
+        assert parser.parse('help.prompt', preset='vip') == 'VIP'
+        assert parser.stats()['counters']['preset_loads'] == loads
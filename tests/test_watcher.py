@@ -0,0 +1,171 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+
+def touch(path: Path, contents: str) -> None:
+    """写入文件并推后修改时间，确保文件状态签名发生变化。"""
+    path.write_text(contents)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.usefixtures('setup')
+class TestPresetWatcher(object):
+    """测试风格预设热重载"""
+
+    @pytest.fixture()
+    def watched(self, tmp_path: Path):
+        from nonebot_plugin_styledstr.cache import PresetCache
+        from nonebot_plugin_styledstr.index import ResourceIndex
+        from nonebot_plugin_styledstr.preset import load_file
+        from nonebot_plugin_styledstr.watcher import PresetWatcher
+
+        preset_file = (tmp_path / 'watched.yaml').resolve()
+        preset_file.write_text('test: before\n')
+
+        cache = PresetCache()
+        cache.put(preset_file, cache.signature(preset_file),
+                  load_file(preset_file))
+        watcher = PresetWatcher(cache, ResourceIndex(tmp_path))
+
+        return preset_file, cache, watcher
+
+    def test_reload_changed_file(self, watched) -> None:
+        """
+        测试重新加载被修改的预设文件。
+
+        测试预期：缓存内容被替换为新版本。
+        """
+        preset_file, cache, watcher = watched
+
+        touch(preset_file, 'test: after\n')
+        watcher.poll()
+
+        assert cache.peek(preset_file)[1].lookup('test').text == 'after'
+
+    def test_keep_last_valid_version(self, watched, caplog) -> None:
+        """
+        测试重新加载格式错误的预设文件。
+
+        测试预期：保留最后一个有效版本并输出日志，且不重复尝试加载。
+        """
+        preset_file, cache, watcher = watched
+
+        touch(preset_file, 'test: [unclosed\n')
+        watcher.poll()
+        watcher.poll()
+
+        assert cache.peek(preset_file)[1].lookup('test').text == 'before'
+        assert caplog.text.count('Failed to reload preset file') == 1
+
+    def test_remove_deleted_file(self, watched) -> None:
+        """
+        测试预设文件被删除。
+
+        测试预期：移除对应缓存。
+        """
+        preset_file, cache, watcher = watched
+
+        preset_file.unlink()
+        watcher.poll()
+
+        assert preset_file not in cache
+
+    def test_start_and_stop(self, watched) -> None:
+        """
+        测试启动与停止后台监视线程。
+
+        测试预期：线程状态与调用一致。
+        """
+        _, _, watcher = watched
+
+        watcher.start()
+        assert watcher.running
+        watcher.stop()
+        assert not watcher.running
+
+    def test_refresh_merged_sharded_preset(self, tmp_path: Path) -> None:
+        """
+        测试启用热重载时，继承链中以目录形式存储的风格预设的分片被修改。
+
+        测试预期：继承链合并结果被移除，解析结果随分片内容更新。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时资源目录。
+        """
+        from nonebot_plugin_styledstr.store import PresetStore
+
+        directory = tmp_path / 'sharded'
+        directory.mkdir()
+        (directory / 'help.yaml').write_text('prompt: before\n')
+        (tmp_path / 'derived.yaml').write_text('footer: derived\n')
+
+        store = PresetStore(tmp_path, bases={'derived': 'sharded'})
+        store.watch(0.01)
+        assert store.load('derived').lookup('help.prompt').text == 'before'
+
+        touch(directory / 'help.yaml', 'prompt: after\n')
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            loaded = store.load('derived')
+            if loaded.lookup('help.prompt').text == 'after':
+                break
+            time.sleep(0.01)
+
+        assert loaded.lookup('help.prompt').text == 'after'
+        assert loaded.lookup('footer').text == 'derived'
+
+    def test_watched_parse_without_syscalls(self, tmp_path: Path,
+                                            monkeypatch) -> None:
+        """
+        测试启用热重载时解析已缓存的风格预设。
+
+        测试预期：解析时不访问文件系统，包括以目录形式存储的风格预设与继承
+        链。
+
+        参数：
+        - `tmp_path: pathlib.Path`：临时资源目录。
+        - `monkeypatch`：模拟对象固件。
+        """
+        from nonebot import require
+
+        directory = tmp_path / 'sharded'
+        directory.mkdir()
+        (directory / 'help.yaml').write_text('prompt: sharded\n')
+        (tmp_path / 'default.yaml').write_text('test: pass\n')
+        (tmp_path / 'derived.yaml').write_text('__base__: sharded\n')
+
+        config = {
+            'styledstr_respath': tmp_path,
+            'styledstr_preset': 'default',
+            'styledstr_watch': True,
+            'styledstr_watch_interval': 60.0
+        }
+        parser = require('nonebot_plugin_styledstr').init(config)
+        cases = [('test', 'default', 'pass'),
+                 ('help.prompt', 'sharded', 'sharded'),
+                 ('help.prompt', 'derived', 'sharded')]
+        for token, preset, expected in cases:
+            assert parser.parse(token, preset=preset) == expected
+
+        calls = []
+        stat, lstat = os.stat, os.lstat
+
+        def record_stat(path, *args, **kwargs):
+            calls.append(path)
+            return stat(path, *args, **kwargs)
+
+        def record_lstat(path, *args, **kwargs):
+            calls.append(path)
+            return lstat(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, 'stat', record_stat)
+        monkeypatch.setattr(os, 'lstat', record_lstat)
+        for token, preset, expected in cases:
+            assert parser.parse(token, preset=preset) == expected
+        monkeypatch.undo()
+
+        assert calls == []